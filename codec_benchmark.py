@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON Kodlayıcı Karşılaştırması
+==============================
+Gerçek ESP32 durum çerçeveleri (simülatördeki `state`) üzerinde kurulu
+JSON kütüphanelerini (orjson / ujson / json) karşılaştırır.
+
+Kullanım:
+    python codec_benchmark.py            # 3 ve 12 kümeslik çerçeveler
+    python codec_benchmark.py -n 50000   # tekrar sayısı
+"""
+
+import argparse
+import copy
+import timeit
+
+from core import codec
+import esp32_simulator
+
+
+def build_frames():
+    """Simülatörün ürettiği gerçek çerçeveler (tek cihaz ve 4 cihazlık havuz)"""
+    esp32_simulator.simulate_sensor_changes()
+    single = copy.deepcopy(esp32_simulator.state)
+
+    pool = copy.deepcopy(single)
+    pool["kumesler"] = []
+    for device in range(4):
+        for kumes in single["kumesler"]:
+            pool["kumesler"].append(dict(kumes, id=device * 3 + kumes["id"]))
+    return {"3 kümes": single, "12 kümes": pool}
+
+
+def bench(backend: codec.Codec, frame: dict, number: int) -> dict:
+    """Tek kütüphane için işlem başına mikro saniye"""
+    raw_bytes = backend.dumpb(frame)
+    raw_str = raw_bytes.decode("utf-8")
+    cases = {
+        "loads(bytes)": lambda: backend.loads(raw_bytes),
+        "loads(str)": lambda: backend.loads(raw_str),
+        "dumpb": lambda: backend.dumpb(frame),
+        "dumps": lambda: backend.dumps(frame),
+    }
+    results = {}
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=number, repeat=3))
+        results[name] = best / number * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON kodlayıcı karşılaştırması")
+    parser.add_argument("-n", "--number", type=int, default=20000, help="tekrar sayısı")
+    args = parser.parse_args()
+
+    backends = codec.available_backends()
+    print("=" * 70)
+    print("⚡ JSON KODLAYICI KARŞILAŞTIRMASI")
+    print("=" * 70)
+    print(f"   Kurulu     : {', '.join(backends)}")
+    print(f"   Aktif      : {codec.BACKEND}")
+    print(f"   Tekrar     : {args.number}")
+
+    for label, frame in build_frames().items():
+        size = len(codec.dumpb(frame))
+        print(f"\n📦 {label} ({size} bayt)")
+        print(f"   {'kütüphane':<10}" + "".join(f"{c:>15}" for c in
+              ("loads(bytes)", "loads(str)", "dumpb", "dumps")))
+
+        measured = {name: bench(backend, frame, args.number) for name, backend in backends.items()}
+        for name, results in measured.items():
+            print(f"   {name:<10}" + "".join(f"{v:>12.2f} µs" for v in results.values()))
+
+        baseline = measured["json"]
+        for name, results in measured.items():
+            if name == "json":
+                continue
+            speedup = "".join(f"{baseline[k] / results[k]:>14.1f}x" for k in results)
+            print(f"   {name + ' hız':<10}{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 from datetime import datetime
 
+# Alarm seviyeleri
+SEVERITY_CRITICAL = "kritik"   # Cihazın bildirdiği alarm
+SEVERITY_WARNING = "uyari"     # Uygulamanın tespit ettiği (ör. bayat veri)
+# Bayat veri uyarısının mesajı (eklerken ve veri geri gelince silerken aynı anahtar)
+STALE_DATA_MESSAGE = "Sensör verisi güncellenmiyor"
+SEVERITY_LABELS = {
+    SEVERITY_CRITICAL: "Kritik",
+    SEVERITY_WARNING: "Uyarı",
+}
+
+
 class AlarmManager(QObject):
     """
     Bu sınıf sistemdeki aktif alarmları yönetir.
@@ -11,6 +22,10 @@ class AlarmManager(QObject):
     alarmAdded = pyqtSignal()
     alarmCleared = pyqtSignal(int)  # ← DEĞİŞTİ: artık kumes_id gönderiyor
     alarmCountChanged = pyqtSignal(int)
+    # Satır bazlı değişiklikler (tablo modeli için)
+    alarmInserted = pyqtSignal(int)   # Eklenen satır
+    alarmRemoved = pyqtSignal(int)    # Silinen satır (silinmeden önceki index)
+    alarmsReset = pyqtSignal()        # Liste tamamen değişti
 
     def __init__(self, db_manager):
         super().__init__()
@@ -26,8 +41,8 @@ class AlarmManager(QObject):
         """Aktif alarm sayısını döndürür"""
         return len(self.active_alarms)
 
-    def add_alarm(self, kumes_id, mesaj):
-        """Yeni bir alarm oluşturur ve listeye ekler"""
+    def add_alarm(self, kumes_id, mesaj, seviye=SEVERITY_CRITICAL):
+        """Yeni bir alarm oluşturur, listeye ekler ve geçmişe kaydeder"""
         # Aynı kümes için aynı mesajlı mükerrer alarmı önle
         for alarm in self.active_alarms:
             if alarm.get('kumes_id') == kumes_id and alarm.get('mesaj') == mesaj:
@@ -37,12 +52,20 @@ class AlarmManager(QObject):
             "kumes_id": kumes_id,
             "id": kumes_id,
             "mesaj": mesaj,
+            "seviye": seviye,
             "zaman": datetime.now(),
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         self.active_alarms.append(alarm_data)
         
+        if self.db is not None:
+            try:
+                self.db.save_alarm(kumes_id, mesaj, seviye)
+            except Exception as e:
+                print(f"⚠️ Alarm geçmişe kaydedilemedi: {e}")
+        
         # Sinyalleri gönder
+        self.alarmInserted.emit(len(self.active_alarms) - 1)
         self.alarmAdded.emit()
         self.alarmCountChanged.emit(len(self.active_alarms))
         return True
@@ -52,6 +75,7 @@ class AlarmManager(QObject):
         if 0 <= index < len(self.active_alarms):
             removed_alarm = self.active_alarms.pop(index)
             kumes_id = removed_alarm.get('kumes_id')
+            self.alarmRemoved.emit(index)
             
             # Signal gönder
             if kumes_id is not None:
@@ -61,6 +85,23 @@ class AlarmManager(QObject):
             return True
         return False
 
+    def remove_alarm(self, kumes_id: int, mesaj: str) -> bool:
+        """
+        Kümesin belirli mesajlı alarmını siler (ör. bayat veri uyarısı)
+
+        `alarmCleared` yalnızca kümesin başka alarmı kalmadıysa yayılır;
+        böylece cihazın bildirdiği alarm görünümü bozulmaz.
+        """
+        for index, alarm in enumerate(self.active_alarms):
+            if alarm.get('kumes_id') == kumes_id and alarm.get('mesaj') == mesaj:
+                del self.active_alarms[index]
+                self.alarmRemoved.emit(index)
+                if not self.has_active_alarm(kumes_id):
+                    self.alarmCleared.emit(kumes_id)
+                self.alarmCountChanged.emit(len(self.active_alarms))
+                return True
+        return False
+
     def clear_all(self):
         """Tüm aktif alarmları temizler"""
         if not self.active_alarms:
@@ -70,6 +111,7 @@ class AlarmManager(QObject):
         cleared_kumes_ids = set(alarm['kumes_id'] for alarm in self.active_alarms)
         
         self.active_alarms.clear()
+        self.alarmsReset.emit()
         
         # Her temizlenen kümes için signal gönder
         for kumes_id in cleared_kumes_ids:
@@ -101,12 +143,14 @@ class AlarmManager(QObject):
         
         # Kümesin alarmlarını bul ve sil
         to_remove = [
-            alarm for alarm in self.active_alarms 
+            index for index, alarm in enumerate(self.active_alarms)
             if alarm.get('kumes_id') == kumes_id
         ]
         
-        for alarm in to_remove:
-            self.active_alarms.remove(alarm)
+        # Sondan başa: önceki indexler kaymaz
+        for index in reversed(to_remove):
+            del self.active_alarms[index]
+            self.alarmRemoved.emit(index)
             had_alarm = True
         
         # Signal gönder
@@ -0,0 +1,105 @@
+# core/codec.py
+"""
+JSON kodlayıcı katmanı
+
+Kurulu olan en hızlı kütüphane seçilir: orjson → ujson → json (standart).
+`KUMES_JSON_BACKEND` ortam değişkeni ile belirli bir kütüphane zorlanabilir.
+
+    from core import codec
+    data = codec.loads(raw)        # str veya bytes kabul eder
+    raw = codec.dumpb(data)        # bytes (soket / dosya için)
+    text = codec.dumps(data)       # str (tarayıcıya metin çerçevesi vb.)
+
+Tüm kütüphanelerde çıktı aynı biçimdedir: boşluksuz, UTF-8 (ASCII kaçışsız).
+"""
+import json
+import os
+from collections import namedtuple
+from typing import Dict, Optional
+
+Codec = namedtuple("Codec", ["name", "dumps", "dumpb", "loads"])
+
+# Tüm kütüphanelerin parse hataları ValueError'dan türer
+DecodeError = ValueError
+
+_ORDER = ("orjson", "ujson", "json")
+
+
+def _load_json() -> Codec:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    encode = encoder.encode
+    return Codec(
+        name="json",
+        dumps=encode,
+        dumpb=lambda obj: encode(obj).encode("utf-8"),
+        loads=json.loads,
+    )
+
+
+def _load_orjson() -> Codec:
+    import orjson
+    option = orjson.OPT_NON_STR_KEYS
+    return Codec(
+        name="orjson",
+        dumps=lambda obj: orjson.dumps(obj, option=option).decode("utf-8"),
+        dumpb=lambda obj: orjson.dumps(obj, option=option),
+        loads=orjson.loads,
+    )
+
+
+def _load_ujson() -> Codec:
+    import ujson
+    return Codec(
+        name="ujson",
+        dumps=lambda obj: ujson.dumps(obj, ensure_ascii=False),
+        dumpb=lambda obj: ujson.dumps(obj, ensure_ascii=False).encode("utf-8"),
+        loads=ujson.loads,
+    )
+
+
+_LOADERS = {"orjson": _load_orjson, "ujson": _load_ujson, "json": _load_json}
+
+
+def load_backend(name: str) -> Optional[Codec]:
+    """İsmi verilen kütüphaneyi yükler, kurulu değilse None"""
+    try:
+        return _LOADERS[name]()
+    except ImportError:
+        return None
+
+
+def available_backends() -> Dict[str, Codec]:
+    """Kurulu tüm kütüphaneler (hız sırasıyla)"""
+    backends = {}
+    for name in _ORDER:
+        backend = load_backend(name)
+        if backend:
+            backends[name] = backend
+    return backends
+
+
+def _select() -> Codec:
+    preferred = os.environ.get("KUMES_JSON_BACKEND")
+    if preferred in _LOADERS:
+        backend = load_backend(preferred)
+        if backend:
+            return backend
+        print(f"⚠️ {preferred} kurulu değil, otomatik seçim yapılıyor")
+    for name in _ORDER:
+        backend = load_backend(name)
+        if backend:
+            return backend
+    return _load_json()
+
+
+_active = _select()
+
+BACKEND = _active.name
+dumps = _active.dumps
+dumpb = _active.dumpb
+loads = _active.loads
+
+__all__ = [
+    'Codec', 'DecodeError', 'BACKEND', 'dumps', 'dumpb', 'loads',
+    'load_backend', 'available_backends',
+]
@@ -0,0 +1,130 @@
+# core/command_queue.py
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import threading
+import time
+from .config import ACTUATOR_MIN_SPACING, OUTBOUND_MAX_RATE
+
+
+def actuator_key(payload: dict) -> str:
+    """
+    Komutun hangi aktüatöre ait olduğunu belirten anahtar
+
+    Aynı anahtara sahip komutlar birleştirilir (son gelen kazanır).
+    Tekrarlanamaz komutlar (yem) her zaman kendine özgü anahtar alır.
+    """
+    action = payload.get("action", "")
+    kumes = payload.get("kumes")
+
+    if action in ("fan_on", "fan_off"):
+        return f"fan:{kumes or '*'}"
+    if action in ("led_on", "led_off"):
+        return f"led:{kumes or '*'}"
+    if action in ("door_open", "door_close"):
+        return f"door:{kumes or '*'}"
+    if action in ("pump_on", "pump_off"):
+        return "pump"
+    if action == "kapi_kontrol":
+        return "kapi"
+    if action == "set_auto_mode":
+        return "auto"
+    if action == "get_status":
+        return f"status:{kumes or '*'}"
+    if action == "yem_ver":
+        return f"once:{payload.get('cid', id(payload))}"
+    return f"{action}:{kumes or '*'}"
+
+
+class CommandQueue:
+    """
+    Aktüatör anahtarlı, birleştirici giden komut kuyruğu
+
+    - Aynı aktüatöre gelen ara komutlar (FAN1:1, FAN1:0, FAN1:1...) tek
+      komuta iner, sadece en son istenen durum gönderilir.
+    - Her aktüatör için iki komut arasında minimum süre bırakılır (röleleri
+      korumak için).
+    - Toplam mesaj hızı saniyede OUTBOUND_MAX_RATE ile sınırlanır.
+
+    `put` herhangi bir thread'den çağrılır ve hemen döner; `on_put`
+    bildirimiyle uyanan ağ görevi `take_ready` ile gönderilmeye hazır
+    komutları toplu olarak alır.
+    """
+
+    def __init__(self, spacing: Dict[str, float] = None, max_rate: float = OUTBOUND_MAX_RATE,
+                 on_put: Optional[Callable[[], None]] = None):
+        self.spacing = dict(ACTUATOR_MIN_SPACING if spacing is None else spacing)
+        self.max_rate = max_rate
+        self._on_put = on_put
+
+        self._slots: "OrderedDict[str, dict]" = OrderedDict()
+        self._last_sent: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Token bucket (global hız sınırı)
+        self._tokens = float(max_rate)
+        self._refill_at = time.monotonic()
+
+    def put(self, key: str, payload: dict) -> Optional[dict]:
+        """
+        Komutu kuyruğa ekler
+
+        Returns:
+            dict: Yerine geçilen (artık gönderilmeyecek) eski komut, yoksa None
+        """
+        with self._lock:
+            replaced = self._slots.get(key)
+            self._slots[key] = payload
+        if self._on_put:
+            self._on_put()
+        return replaced
+
+    def pending(self) -> int:
+        """Kuyrukta bekleyen komut sayısı"""
+        with self._lock:
+            return len(self._slots)
+
+    def clear(self) -> List[dict]:
+        """Kuyruğu boşaltır ve gönderilmemiş komutları döndürür"""
+        with self._lock:
+            dropped = list(self._slots.values())
+            self._slots.clear()
+        return dropped
+
+    def take_ready(self):
+        """
+        Beklemeden hazır komutları alır
+
+        Returns:
+            tuple: (komut listesi, sonraki hazır olmaya kadar saniye veya None)
+        """
+        with self._lock:
+            return self._take_ready(time.monotonic())
+
+    def _spacing_for(self, key: str) -> float:
+        return self.spacing.get(key.split(":", 1)[0], 0.0)
+
+    def _take_ready(self, now: float):
+        """Hazır komutları kuyruktan alır; hiçbiri hazır değilse bekleme süresini verir"""
+        # Token'ları doldur
+        self._tokens = min(self.max_rate, self._tokens + (now - self._refill_at) * self.max_rate)
+        self._refill_at = now
+
+        batch = []
+        wait = None
+        for key in list(self._slots):
+            if self._tokens < 1.0:
+                wait = (1.0 - self._tokens) / self.max_rate
+                break
+
+            ready_at = self._last_sent.get(key, 0.0) + self._spacing_for(key)
+            if now < ready_at:
+                delay = ready_at - now
+                wait = delay if wait is None else min(wait, delay)
+                continue
+
+            batch.append(self._slots.pop(key))
+            if self._spacing_for(key) > 0:
+                self._last_sent[key] = now
+            self._tokens -= 1.0
+
+        return batch, wait
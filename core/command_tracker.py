@@ -0,0 +1,267 @@
+# core/command_tracker.py
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import itertools
+import secrets
+import threading
+import time
+from .config import (
+    COMMAND_ACK_TIMEOUT, COMMAND_MAX_RETRIES, COMMAND_RETRY_BACKOFF,
+    NON_IDEMPOTENT_ACTIONS
+)
+
+
+@dataclass
+class CommandResult:
+    """Bir komutun nihai sonucu"""
+    cid: str
+    action: str
+    success: bool
+    reason: str          # "ack", "state", "rejected", "timeout", "cancelled", "superseded"
+    rtt_ms: float        # Son gönderimden onaya kadar geçen süre
+    attempts: int
+    message: str = ""
+
+
+@dataclass
+class PendingCommand:
+    """Onay bekleyen komut kaydı"""
+    cid: str
+    key: str
+    payload: dict
+    expect: Optional[Callable[[dict], bool]]
+    max_retries: int
+    timeout: float
+    future: Future = field(default_factory=Future)
+    attempts: int = 0
+    sent_at: float = 0.0
+    deadline: float = 0.0
+
+
+def _expected_state(payload: dict) -> Optional[Callable[[dict], bool]]:
+    """
+    Komutun cihaz durumuna yansıyıp yansımadığını kontrol eden fonksiyonu döndürür
+
+    ESP32 ack göndermese bile bir sonraki durum çerçevesinde değişiklik
+    görülürse komut onaylanmış sayılır.
+    """
+    action = payload.get("action", "")
+    kumes = payload.get("kumes")
+
+    if action == "get_status":
+        return lambda data: "kumesler" in data
+
+    if action in ("pump_on", "pump_off"):
+        value = action == "pump_on"
+        return lambda data: "pompa" in data and bool(data["pompa"]) == value
+
+    fields = {
+        "fan_on": ("fan", True), "fan_off": ("fan", False),
+        "led_on": ("led", True), "led_off": ("led", False),
+        "door_open": ("kapi", True), "door_close": ("kapi", False),
+    }
+    if action not in fields:
+        return None
+    key, value = fields[action]
+
+    def check(data: dict) -> bool:
+        kumesler = data.get("kumesler")
+        if not kumesler:
+            return False
+        targets = [k for k in kumesler if kumes is None or k.get("id") == kumes]
+        return bool(targets) and all(bool(k.get(key)) == value for k in targets)
+
+    return check
+
+
+class CommandTracker(QObject):
+    """
+    Korelasyon kimlikli komut takibi
+
+    Her komut bir `cid` ile etiketlenir ve son tarihli bekleyen tabloya
+    yazılır. Cihazdan gelen ack (`{"cid": ..., "status": ...}`) ya da durum
+    çerçevesindeki beklenen değişiklik komutu tamamlar. Süre dolarsa komut
+    artan bekleme ile yeniden gönderilir; tekrarlanamaz komutlar (yem vb.)
+    tekrar gönderilmez.
+    """
+
+    commandCompleted = pyqtSignal(object)  # CommandResult
+    _armTimer = pyqtSignal()               # Timer'ı sahibi olan thread'de başlatır
+
+    def __init__(self, resend: Callable[[dict], bool],
+                 timeout: float = COMMAND_ACK_TIMEOUT,
+                 max_retries: int = COMMAND_MAX_RETRIES,
+                 backoff: float = COMMAND_RETRY_BACKOFF):
+        super().__init__()
+        self._resend = resend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._pending: Dict[str, PendingCommand] = {}
+        self._lock = threading.Lock()
+        self._prefix = secrets.token_hex(2)
+        self._counter = itertools.count(1)
+
+        self._timer = QTimer()
+        self._timer.setInterval(100)
+        self._timer.timeout.connect(self._check_deadlines)
+        self._armTimer.connect(self._ensure_timer)
+
+    def new_cid(self) -> str:
+        """Oturum içinde benzersiz kısa korelasyon kimliği üretir"""
+        return f"{self._prefix}-{next(self._counter):x}"
+
+    def register(self, payload: dict, key: str = "") -> Future:
+        """
+        Gönderilecek komutu bekleyen tabloya ekler
+
+        Args:
+            payload: `cid` alanı atanmış komut sözlüğü
+            key: Aktüatör anahtarı (aynı anahtarlı eski komutlar geçersiz olur)
+
+        Returns:
+            Future: CommandResult ile tamamlanır
+        """
+        action = payload.get("action", "")
+        retries = 0 if action in NON_IDEMPOTENT_ACTIONS else self.max_retries
+        pending = PendingCommand(
+            cid=payload["cid"],
+            key=key,
+            payload=payload,
+            expect=_expected_state(payload),
+            max_retries=retries,
+            timeout=self.timeout,
+        )
+        with self._lock:
+            self._pending[pending.cid] = pending
+
+        # register ağ thread'inden de çağrılabilir (ör. bağlantı sonrası resync)
+        self._armTimer.emit()
+        return pending.future
+
+    def _ensure_timer(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def mark_sent(self, cid: str):
+        """Komutun (yeniden) sokete yazıldığı anı kaydeder (ağ thread'inden)"""
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending.get(cid)
+            if pending:
+                pending.attempts += 1
+                pending.sent_at = now
+                pending.deadline = now + pending.timeout * (self.backoff ** (pending.attempts - 1))
+
+    def cancel(self, cid: str, message: str = "", reason: str = "cancelled"):
+        """Komutu sonuç beklemeden iptal eder"""
+        with self._lock:
+            pending = self._pending.pop(cid, None)
+        if pending:
+            self._finish(pending, False, reason, message)
+
+    def supersede(self, key: str):
+        """
+        Aynı aktüatöre ait bekleyen komutları geçersiz kılar
+
+        Yeni bir komut geldiğinde eski komutun tekrar gönderilip son durumu
+        ezmesini önler.
+        """
+        if not key:
+            return
+        with self._lock:
+            old = [p for p in self._pending.values() if p.key == key]
+            for pending in old:
+                del self._pending[pending.cid]
+        for pending in old:
+            self._finish(pending, False, "superseded", "Daha yeni komut gönderildi")
+
+    def cancel_all(self, message: str = ""):
+        """Tüm bekleyen komutları iptal eder (bağlantı kapanışı vb.)"""
+        with self._lock:
+            pendings = list(self._pending.values())
+            self._pending.clear()
+        for pending in pendings:
+            self._finish(pending, False, "cancelled", message)
+
+    def pending_count(self) -> int:
+        """Onay bekleyen komut sayısı"""
+        with self._lock:
+            return len(self._pending)
+
+    def match(self, data: dict):
+        """
+        Gelen mesajı bekleyen komutlarla eşleştirir (herhangi bir thread'den)
+
+        Args:
+            data: Cihazdan gelen, parse edilmiş mesaj
+        """
+        done: List[tuple] = []
+        with self._lock:
+            if not self._pending:
+                return
+
+            # 1) Doğrudan ack
+            cid = data.get("cid")
+            if cid in self._pending:
+                pending = self._pending.pop(cid)
+                ok = data.get("status", "success") != "error"
+                done.append((pending, ok, "ack" if ok else "rejected", data.get("message", "")))
+
+            # 2) Durum çerçevesinde gözlenen değişiklik
+            if "kumesler" in data or "pompa" in data:
+                for pending in list(self._pending.values()):
+                    if pending.sent_at and pending.expect and pending.expect(data):
+                        del self._pending[pending.cid]
+                        done.append((pending, True, "state", ""))
+
+        for pending, ok, reason, message in done:
+            self._finish(pending, ok, reason, message)
+
+    def _check_deadlines(self):
+        """Süresi dolan komutları yeniden gönderir veya başarısız sayar"""
+        now = time.monotonic()
+        retry: List[PendingCommand] = []
+        expired: List[PendingCommand] = []
+
+        with self._lock:
+            for pending in list(self._pending.values()):
+                if not pending.sent_at or now < pending.deadline:
+                    continue
+                if pending.attempts <= pending.max_retries:
+                    pending.sent_at = 0.0  # Tekrar gönderilene kadar süre işlemez
+                    retry.append(pending)
+                else:
+                    del self._pending[pending.cid]
+                    expired.append(pending)
+            empty = not self._pending
+
+        for pending in expired:
+            self._finish(pending, False, "timeout", "Cihazdan yanıt alınamadı")
+
+        for pending in retry:
+            print(f"↻ Komut tekrar gönderiliyor ({pending.attempts}/{pending.max_retries}): {pending.cid}")
+            if not self._resend(pending.payload):
+                self.cancel(pending.cid, "Tekrar gönderilemedi")
+
+        if empty and not retry:
+            self._timer.stop()
+
+    def _finish(self, pending: PendingCommand, success: bool, reason: str, message: str):
+        """Sonucu future ve sinyal üzerinden bildirir"""
+        rtt_ms = (time.monotonic() - pending.sent_at) * 1000 if pending.sent_at else 0.0
+        result = CommandResult(
+            cid=pending.cid,
+            action=pending.payload.get("action", ""),
+            success=success,
+            reason=reason,
+            rtt_ms=rtt_ms,
+            attempts=pending.attempts,
+            message=message,
+        )
+        if not pending.future.done():
+            pending.future.set_result(result)
+        self.commandCompleted.emit(result)
@@ -0,0 +1,179 @@
+# core/commands.py
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+from . import codec
+
+
+@dataclass(frozen=True)
+class Command(ABC):
+    """
+    Tipli ESP32 komutlarının tabanı
+
+    Komutlar değiştirilemez (frozen) ve hash'lenebilir olduğu için aynı
+    komutun sözlük karşılığı bir kez üretilip önbellekte tutulur.
+    """
+
+    @abstractmethod
+    def _build(self) -> dict:
+        """Komutun sözlük karşılığı (alt sınıflar tanımlar)"""
+
+    def payload(self) -> dict:
+        """Gönderilebilir komut sözlüğü (her çağrıda yeni kopya)"""
+        return dict(_payload_items(self))
+
+
+@lru_cache(maxsize=256)
+def _payload_items(command: Command) -> Tuple[tuple, ...]:
+    return tuple(command._build().items())
+
+
+@dataclass(frozen=True)
+class FanCommand(Command):
+    kumes: Optional[int] = None  # None: tüm kümesler
+    on: bool = True
+
+    def _build(self) -> dict:
+        return _with_kumes("fan_on" if self.on else "fan_off", self.kumes)
+
+
+@dataclass(frozen=True)
+class LedCommand(Command):
+    kumes: Optional[int] = None
+    on: bool = True
+
+    def _build(self) -> dict:
+        return _with_kumes("led_on" if self.on else "led_off", self.kumes)
+
+
+@dataclass(frozen=True)
+class DoorCommand(Command):
+    kumes: int
+    open: bool = True
+
+    def _build(self) -> dict:
+        return _with_kumes("door_open" if self.open else "door_close", self.kumes)
+
+
+@dataclass(frozen=True)
+class PumpCommand(Command):
+    on: bool = True
+
+    def _build(self) -> dict:
+        return {"action": "pump_on" if self.on else "pump_off"}
+
+
+@dataclass(frozen=True)
+class ServoDoorCommand(Command):
+    """Servo kapı açısı (0-90 derece)"""
+    derece: int
+
+    def _build(self) -> dict:
+        return {"action": "kapi_kontrol", "derece": self.derece}
+
+
+@dataclass(frozen=True)
+class FeedCommand(Command):
+    miktar: int
+
+    def _build(self) -> dict:
+        return {"action": "yem_ver", "miktar": self.miktar}
+
+
+@dataclass(frozen=True)
+class AutoModeCommand(Command):
+    value: bool = True
+
+    def _build(self) -> dict:
+        return {"action": "set_auto_mode", "value": self.value}
+
+
+@dataclass(frozen=True)
+class StatusCommand(Command):
+    kumes: Optional[int] = None
+
+    def _build(self) -> dict:
+        return _with_kumes("get_status", self.kumes)
+
+
+@dataclass(frozen=True)
+class RateCommand(Command):
+    hz: float = 1.0  # Cihazın saniyede göndereceği durum çerçevesi
+
+    def _build(self) -> dict:
+        return {"action": "set_rate", "hz": self.hz}
+
+
+def _with_kumes(action: str, kumes: Optional[int]) -> dict:
+    if kumes is None:
+        return {"action": action}
+    return {"action": action, "kumes": kumes}
+
+
+@lru_cache(maxsize=128)
+def parse_legacy(command: str) -> Optional[Command]:
+    """
+    Eski format komutları tipli komuta çevirir (sonuç önbelleklenir)
+
+    Eski → Yeni:
+    FAN1:1  → FanCommand(kumes=1, on=True)
+    LED:0   → LedCommand(on=False)
+    LED2:1  → LedCommand(kumes=2, on=True)
+    POMPA:1 → PumpCommand(on=True)
+    KAPI:45 → ServoDoorCommand(derece=45)
+    YEM:5   → FeedCommand(miktar=5)
+    AUTO:1  → AutoModeCommand(value=True)
+    STATUS  → StatusCommand()
+    """
+    command = command.strip().upper()
+
+    if command == "STATUS":
+        return StatusCommand()
+
+    name, sep, value = command.partition(":")
+    if not sep:
+        return None
+
+    try:
+        if name == "AUTO":
+            return AutoModeCommand(value == "1")
+        if name == "POMPA":
+            return PumpCommand(value == "1")
+        if name == "YEM":
+            return FeedCommand(int(value))
+        if name == "KAPI":
+            return ServoDoorCommand(int(value))
+        if name.startswith("FAN"):
+            return FanCommand(int(name[3:]) if name[3:] else None, value == "1")
+        if name.startswith("LED"):
+            return LedCommand(int(name[3:]) if name[3:] else None, value == "1")
+    except ValueError:
+        return None
+
+    return None  # Bilinmeyen komut
+
+
+@lru_cache(maxsize=256)
+def _encoded_body(items: Tuple[tuple, ...]) -> bytes:
+    """Komut gövdesinin kapanış parantezi olmadan JSON hali"""
+    return codec.dumpb({k: v for k, _, v in items})[:-1]
+
+
+def encode_payload(payload: dict) -> bytes:
+    """
+    Komut sözlüğünü JSON'a (UTF-8 bytes) çevirir
+
+    Gövde (cid hariç) önbellekten gelir; sık gönderilen komutlarda yalnızca
+    korelasyon kimliği eklenir.
+    """
+    cid = payload.get("cid")
+    # Tip de anahtara girer: True ile 1 aynı hash'e sahip ama farklı kodlanır
+    items = tuple((k, type(v), v) for k, v in payload.items() if k != "cid")
+    if cid is None or not items:
+        return codec.dumpb(payload)
+    try:
+        body = _encoded_body(items)
+    except TypeError:  # Hash'lenemeyen değer (liste vb.) - önbelleksiz
+        return codec.dumpb(payload)
+    return body + b',"cid":' + codec.dumpb(cid) + b"}"
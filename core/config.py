@@ -15,10 +15,8 @@ TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 # =============================================================================
 DB_NAME = "kumes_verileri.db"
 DB_PATH = os.path.join(os.getcwd(), DB_NAME)
-BACKUP_DIR = os.path.join(os.getcwd(), "backups")
-
-if not os.path.exists(BACKUP_DIR):
-    os.makedirs(BACKUP_DIR)
+OFFLINE_QUEUE_PATH = os.path.join(os.getcwd(), "komut_kuyrugu.db")
+BACKUP_DIR = os.path.join(os.getcwd(), "backups")  # İlk yedeklemede oluşturulur
 
 # =============================================================================
 # 3. RENK VE GÖRSEL TASARIM
@@ -47,6 +45,89 @@ class WSCommands:
     FAN_ON  = "FAN:1"
     FAN_OFF = "FAN:0"
 
+# Komut onay (ack) takibi
+COMMAND_ACK_TIMEOUT   = 1.5   # Saniye - ilk denemenin onay süresi
+COMMAND_MAX_RETRIES   = 2     # Süre dolunca en fazla kaç kez tekrar gönderilir
+COMMAND_RETRY_BACKOFF = 2.0   # Her denemede onay süresi bu katsayıyla uzar
+NON_IDEMPOTENT_ACTIONS = {"yem_ver"}  # Tekrar gönderilmesi tehlikeli komutlar
+
+# Giden komut kuyruğu (birleştirme ve hız sınırı)
+ACTUATOR_MIN_SPACING = {  # Saniye - aynı aktüatöre iki komut arası minimum süre
+    "fan": 1.0, "led": 0.5, "door": 1.0, "pump": 1.0, "kapi": 0.2, "auto": 0.5
+}
+OUTBOUND_MAX_RATE = 10  # Saniyedeki en fazla mesaj (tüm aktüatörler)
+
+# Yeniden bağlanma (üstel geri çekilme)
+RECONNECT_BASE_DELAY = 0.5   # Saniye - ilk bekleme
+RECONNECT_MAX_DELAY  = 30.0  # Saniye - bekleme üst sınırı
+RECONNECT_FACTOR     = 2.0   # Her başarısız denemede çarpan
+RECONNECT_JITTER     = 0.3   # Beklemeye eklenen ±oran
+SHUTDOWN_TIMEOUT     = 1.5   # Saniye - kapanışta bağlantıların kapanması için toplam süre
+
+# Bağlantı yokken saklanan (durable) komutlar
+DURABLE_ACTIONS = {  # Kopmada kaybolmaması gereken komutlar
+    "yem_ver", "pump_on", "pump_off", "kapi_kontrol", "door_open", "door_close"
+}
+OFFLINE_COMMAND_TTL = 15 * 60  # Saniye - bu süreden eski komutlar gönderilmez
+
+# WebSocket sıkıştırma (permessage-deflate) - köprü ve tüm sunucular
+WS_DEFLATE = {
+    "enabled": True,
+    "server_no_context_takeover": False,  # True: her mesaj bağımsız (az bellek, düşük oran)
+    "client_no_context_takeover": False,
+    "server_max_window_bits": 12,         # 9-15, küçük pencere = az bellek
+    "client_max_window_bits": 12,
+    "level": 6,                           # zlib seviyesi (1 hızlı - 9 en iyi oran)
+    "mem_level": 5,
+}
+
+# Canlılık kontrolü - gelen veri canlılık sayılır, ping yalnızca sessizlikte atılır
+# (cihaz bazında DEVICE_ENDPOINTS içinde "keepalive": {...} ile değiştirilebilir)
+KEEPALIVE = {
+    "idle": 10.0,    # Saniye - bu kadar veri gelmezse ping atılır
+    "timeout": 5.0,  # Saniye - pong bekleme süresi, dolarsa bağlantı kapatılır
+}
+
+# Bağlantı kalitesi ölçümü
+LINK_STATS_INTERVAL = 1.0   # Saniye - bağlantı istatistiği yayın aralığı
+
+# Veri bekçisi (RealTimeDataUpdater) - yalnızca bayat kaynaklar sorgulanır
+WATCHDOG_STALE_PERIODS = 3     # Beklenen gönderim aralığının kaç katında bayat sayılır
+WATCHDOG_MIN_STALE     = 5.0   # Saniye - bayat eşiğinin alt sınırı
+WATCHDOG_MAX_POLLS     = 3     # Cevapsız get_status sonrası yeniden bağlanılır
+
+# Telemetri gönderim hızı (Hz) - pencere görünürlüğüne göre cihazla anlaşılır
+TELEMETRY_RATES = {
+    "minimized": 0.2,  # Pencere simge durumunda / tepside
+    "normal": 1.0,     # Genel görünüm
+    "alarm": 2.0,      # Aktif alarm varken (görünür pencerede)
+    "detail": 5.0,     # Detay grafiği açık
+}
+TELEMETRY_RATE_DEBOUNCE_MS = 300  # Hızlı görünürlük değişimlerinde tek komut
+
+# Arayüz çizimi: gelen çerçeveler en fazla bu hızda (kare/sn) ekrana yansır
+RENDER_FPS = 20
+
+# Alarm geçmişi tablosu: kaydırdıkça yüklenen sayfa boyutu
+ALARM_HISTORY_PAGE_SIZE = 500
+
+# Geçmiş grafiği: piksel başına bir min/max kovası, sabit kova sayılı parçalar
+HISTORY_BUCKET_WIDTHS = (  # Saniye - seçilebilen kova genişlikleri (60'ın katları özetten okunur)
+    1, 2, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200, 21600, 43200, 86400
+)
+HISTORY_TILE_BUCKETS = 512     # Bir sorgu / önbellek parçasındaki kova sayısı
+HISTORY_CACHE_TILES  = 256     # Bellekte tutulan en fazla parça (LRU)
+HISTORY_LIVE_REFRESH = 30.0    # Saniye - şimdiki zamanı içeren parça bu sürede yenilenir
+SENSOR_SAVE_INTERVAL = 10.0    # Saniye - kümes başına geçmişe en fazla bu aralıkta bir satır yazılır
+
+# Çoklu cihaz (ESP32) havuzu
+# Her kontrolcü kendi kümeslerini 1..n olarak raporlar; "kumesler" listesi
+# bu yerel numaraları uygulamadaki kümes numaralarına eşler. İsteğe bağlı
+# "keepalive" anahtarı KEEPALIVE ayarlarını o cihaz için değiştirir.
+DEVICE_ENDPOINTS = [
+    {"name": "esp32-1", "ip": DEFAULT_ESP_IP, "port": WS_PORT, "kumesler": [1, 2, 3]},
+]
+
 SENSOR_LIMITS = {
     "temp": (15, 35),
     "hum":  (40, 70)
@@ -97,10 +178,20 @@ KUMES_BILGILERI = {
 # 5. EXPORT (__all__)
 # =============================================================================
 __all__ = [ 
-    'APP_TITLE', 'DEFAULT_ESP_IP', 'WS_PORT', 'DB_NAME', 'DB_PATH', 'BACKUP_DIR',
+    'APP_TITLE', 'DEFAULT_ESP_IP', 'WS_PORT', 'DB_NAME', 'DB_PATH', 'OFFLINE_QUEUE_PATH', 'BACKUP_DIR',
     'KUMLER_COUNT', 'DEFAULT_KUMES_NAMES', 'TIMESTAMP_FORMAT',
     'Colors', 'CARD_BORDER_COLOR', 'ALARM_COLOR', 'SUCCESS_COLOR', 'WARNING_COLOR', 'NORMAL_COLOR',
-    'WSCommands', 'SENSOR_LIMITS', 'Themes', 'THEME_COLORS', 'GraphSettings',
+    'WSCommands', 'COMMAND_ACK_TIMEOUT', 'COMMAND_MAX_RETRIES', 'COMMAND_RETRY_BACKOFF',
+    'NON_IDEMPOTENT_ACTIONS', 'ACTUATOR_MIN_SPACING', 'OUTBOUND_MAX_RATE',
+    'RECONNECT_BASE_DELAY', 'RECONNECT_MAX_DELAY', 'RECONNECT_FACTOR', 'RECONNECT_JITTER',
+    'SHUTDOWN_TIMEOUT',
+    'DURABLE_ACTIONS', 'OFFLINE_COMMAND_TTL', 'WS_DEFLATE', 'DEVICE_ENDPOINTS',
+    'KEEPALIVE', 'LINK_STATS_INTERVAL',
+    'WATCHDOG_STALE_PERIODS', 'WATCHDOG_MIN_STALE', 'WATCHDOG_MAX_POLLS',
+    'TELEMETRY_RATES', 'TELEMETRY_RATE_DEBOUNCE_MS', 'RENDER_FPS',
+    'ALARM_HISTORY_PAGE_SIZE', 'HISTORY_BUCKET_WIDTHS', 'HISTORY_TILE_BUCKETS',
+    'HISTORY_CACHE_TILES', 'HISTORY_LIVE_REFRESH', 'SENSOR_SAVE_INTERVAL',
+    'SENSOR_LIMITS', 'Themes', 'THEME_COLORS', 'GraphSettings',
     'ENABLE_SYSTEM_TRAY', 'TRAY_TOOLTIP_TEMPLATE', 'NOTIFICATION_DURATION',
     'ENABLE_SOUND_ALERTS', 'SOUND_CRITICAL', 'SOUND_WARNING', 'SOUND_INFO',
     'ENABLE_RESPONSIVE_LAYOUT', 'MINIMUM_CARD_WIDTH', 'MAXIMUM_CARD_WIDTH',
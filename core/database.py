@@ -3,20 +3,37 @@ import sqlite3
 import os
 import shutil
 import threading
+import time
 from datetime import datetime
-import pandas as pd
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from .config import DB_PATH, BACKUP_DIR, TIMESTAMP_FORMAT
 
+if TYPE_CHECKING:
+    import pandas as pd  # Yalnızca tip için; pandas dışa aktarımda yüklenir
+
+# Geçmiş grafiğinde sorgulanabilen sensör sütunları (SQL'e yalnızca bunlar girer)
+SENSOR_METRICS = ("sicaklik", "nem", "su_seviyesi", "isik_seviyesi")
+_METRIC_KEYS = {"sicaklik": "sicaklik", "nem": "nem", "su_seviyesi": "su", "isik_seviyesi": "isik"}
+
+# Dakikalık özet: bu genişlikten (sn) itibaren ham tablo yerine özet okunur
+ROLLUP_SECONDS = 60
+
+# Kova: (kova no, örnek sayısı, en küçük, en büyük, ortalama)
+Bucket = Tuple[int, int, float, float, float]
+
 class DatabaseManager:
     """Tüm veritabanı işlemlerinden sorumlu singleton-like sınıf"""
 
-    def __init__(self):
-        db_dir = os.path.dirname(DB_PATH)
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
-        os.makedirs(BACKUP_DIR, exist_ok=True)
         self._lock = threading.Lock()
-        self.conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # WAL: geçmiş grafiğinin okuyucu bağlantısı kayıtları bekletmez
+        self.conn.execute("PRAGMA journal_mode=WAL")
         self._create_tables()
 
     def _create_tables(self):
@@ -51,20 +68,69 @@ class DatabaseManager:
                 timestamp TEXT DEFAULT (datetime('now','localtime')),
                 kumes_id INTEGER,
                 mesaj TEXT,
-                cozuldu INTEGER DEFAULT 0
+                cozuldu INTEGER DEFAULT 0,
+                seviye TEXT DEFAULT 'kritik'
             )
         ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_kumes_veriler_kumes_zaman
+            ON kumes_veriler (kumes_id, timestamp)
+        ''')
+        # Dakikalık min/max/toplam özeti (uzun aralıklı grafikler ham tabloyu taramaz)
+        rollup_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sensor_ozet_dakika'"
+        ).fetchone()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sensor_ozet_dakika (
+                kumes_id INTEGER,
+                metrik TEXT,
+                dakika INTEGER,
+                adet INTEGER,
+                en_az REAL,
+                en_cok REAL,
+                toplam REAL,
+                PRIMARY KEY (kumes_id, metrik, dakika)
+            ) WITHOUT ROWID
+        ''')
+        if not rollup_exists:
+            self._backfill_rollup(cursor)
+        # Eski veritabanları: seviye sütunu sonradan eklendi
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(alarm_gecmisi)")]
+        if 'seviye' not in columns:
+            cursor.execute("ALTER TABLE alarm_gecmisi ADD COLUMN seviye TEXT DEFAULT 'kritik'")
         self.conn.commit()
 
+    def _backfill_rollup(self, cursor):
+        """Özet tablosu ilk kez kurulurken mevcut ham verileri özetler"""
+        inserted = 0
+        for metric in SENSOR_METRICS:
+            cursor.execute(f'''
+                INSERT INTO sensor_ozet_dakika
+                SELECT kumes_id, ?, CAST(strftime('%s', timestamp, 'utc') AS INTEGER) / 60 * 60 AS dakika,
+                       COUNT({metric}), MIN({metric}), MAX({metric}), SUM({metric})
+                FROM kumes_veriler
+                WHERE {metric} IS NOT NULL AND kumes_id IS NOT NULL
+                GROUP BY kumes_id, dakika
+            ''', (metric,))
+            inserted += max(cursor.rowcount, 0)
+        if inserted:
+            print("📈 Sensör özet tablosu mevcut verilerden oluşturuldu")
+
     def save_sensor_data(self, kumes_data: dict):
+        self.save_sensor_batch([kumes_data])
+
+    def save_sensor_batch(self, kumesler: List[dict]):
+        """Birden çok kümes örneğini tek işlemde yazar (özet tablosuyla birlikte)"""
+        if not kumesler:
+            return
         with self._lock:
             cursor = self.conn.cursor()
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT INTO kumes_veriler (
                     kumes_id, sicaklik, nem, su_seviyesi, isik_seviyesi,
                     fan_durumu, led_durumu, alarm, alarm_mesaj
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            ''', [(
                 kumes_data.get('id'),
                 kumes_data.get('sicaklik'),
                 kumes_data.get('nem'),
@@ -74,9 +140,31 @@ class DatabaseManager:
                 int(kumes_data.get('led', False)),
                 int(kumes_data.get('alarm', False)),
                 kumes_data.get('mesaj', '')
-            ))
+            ) for kumes_data in kumesler])
+            for kumes_data in kumesler:
+                self._update_rollup(cursor, kumes_data)
             self.conn.commit()
 
+    @staticmethod
+    def _update_rollup(cursor, kumes_data: dict):
+        """Örneği dakikalık özete ekler (aynı işlem içinde)"""
+        minute = int(time.time()) // ROLLUP_SECONDS * ROLLUP_SECONDS
+        rows = []
+        for metric, key in _METRIC_KEYS.items():
+            value = kumes_data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rows.append((kumes_data.get('id'), metric, minute, value, value, value))
+        if rows:
+            cursor.executemany('''
+                INSERT INTO sensor_ozet_dakika (kumes_id, metrik, dakika, adet, en_az, en_cok, toplam)
+                VALUES (?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT (kumes_id, metrik, dakika) DO UPDATE SET
+                    adet = adet + 1,
+                    en_az = MIN(en_az, excluded.en_az),
+                    en_cok = MAX(en_cok, excluded.en_cok),
+                    toplam = toplam + excluded.toplam
+            ''', rows)
+
     def save_command(self, command: str, source: str = "UI", result: str = "Gönderildi"):
         with self._lock:
             cursor = self.conn.cursor()
@@ -86,24 +174,118 @@ class DatabaseManager:
             ''', (command, source, result))
             self.conn.commit()
 
-    def save_alarm(self, kumes_id: int, message: str):
+    def save_alarm(self, kumes_id: int, message: str, severity: str = "kritik"):
         with self._lock:
             cursor = self.conn.cursor()
             cursor.execute('''
-                INSERT INTO alarm_gecmisi (kumes_id, mesaj)
-                VALUES (?, ?)
-            ''', (kumes_id, message))
+                INSERT INTO alarm_gecmisi (kumes_id, mesaj, seviye)
+                VALUES (?, ?, ?)
+            ''', (kumes_id, message, severity))
             self.conn.commit()
 
-    def get_all_sensor_data(self) -> pd.DataFrame:
+    def get_alarm_history(self, before_id: Optional[int] = None, limit: int = 500,
+                          kumes_id: Optional[int] = None,
+                          severity: Optional[str] = None) -> List[dict]:
+        """
+        Alarm geçmişinden bir sayfa (en yeniden eskiye)
+
+        Sayfalama id üzerinden yapılır (OFFSET yok): sonraki sayfa için son
+        satırın id'si `before_id` olarak verilir; sorgu maliyeti tablo
+        büyüdükçe artmaz.
+        """
+        query = "SELECT id, timestamp, kumes_id, mesaj, cozuldu, seviye FROM alarm_gecmisi"
+        conditions, params = [], []
+        if before_id is not None:
+            conditions.append("id < ?")
+            params.append(before_id)
+        if kumes_id is not None:
+            conditions.append("kumes_id = ?")
+            params.append(kumes_id)
+        if severity is not None:
+            conditions.append("seviye = ?")
+            params.append(severity)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            cursor = self.conn.execute(query, params)
+            names = [col[0] for col in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def get_all_sensor_data(self) -> "pd.DataFrame":
+        import pandas as pd  # Ağır modül: açılışta değil, ilk dışa aktarımda yüklenir
         with self._lock:
             return pd.read_sql_query("SELECT * FROM kumes_veriler ORDER BY timestamp DESC", self.conn)
 
     def backup(self) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(BACKUP_DIR, exist_ok=True)
         backup_path = os.path.join(BACKUP_DIR, f"kumes_{timestamp}.db")
-        shutil.copy(DB_PATH, backup_path)
+        with self._lock:
+            # WAL'daki son yazımlar ana dosyaya aktarılmadan kopya eksik kalır
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        shutil.copy(self.db_path, backup_path)
         return backup_path
 
     def close(self):
-        self.conn.close()
\ No newline at end of file
+        self.conn.close()
+
+
+class SensorHistoryReader:
+    """
+    Geçmiş grafiği için salt okunur, kovalanmış (downsampled) sensör sorguları
+
+    Kendi bağlantısını açar; arka plan iş parçacığında oluşturulup orada
+    kullanılmalıdır. Her kova için en küçük / en büyük / ortalama döner;
+    kova genişliği ROLLUP_SECONDS'ın katıysa dakikalık özet tablosu, değilse
+    ham tablo okunur.
+
+    Kullanım:
+        reader = SensorHistoryReader()
+        buckets = reader.buckets(1, "sicaklik", start=t0, width=300, count=512)
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self.conn = sqlite3.connect(uri, uri=True)
+
+    def buckets(self, kumes_id: int, metric: str, start: int, width: int,
+                count: int) -> List[Bucket]:
+        """
+        [start, start + width * count) aralığının kovaları (zaman: epoch sn)
+
+        Veri olmayan kovalar listede yer almaz.
+        """
+        if metric not in SENSOR_METRICS:
+            raise ValueError(f"Bilinmeyen metrik: {metric}")
+        end = start + width * count
+
+        if width % ROLLUP_SECONDS == 0:
+            query = '''
+                SELECT (dakika - ?) / ? AS kova, SUM(adet), MIN(en_az), MAX(en_cok),
+                       SUM(toplam) / SUM(adet)
+                FROM sensor_ozet_dakika
+                WHERE kumes_id = ? AND metrik = ? AND dakika >= ? AND dakika < ?
+                GROUP BY kova
+            '''
+            params = (start, width, kumes_id, metric, start, end)
+        else:
+            # Zaman damgası yerel saat metnidir; aralık metin olarak süzülür (indeks)
+            query = f'''
+                SELECT (CAST(strftime('%s', timestamp, 'utc') AS INTEGER) - ?) / ? AS kova,
+                       COUNT({metric}), MIN({metric}), MAX({metric}), AVG({metric})
+                FROM kumes_veriler
+                WHERE kumes_id = ? AND timestamp >= ? AND timestamp < ?
+                      AND {metric} IS NOT NULL
+                GROUP BY kova
+            '''
+            params = (start, width, kumes_id,
+                      datetime.fromtimestamp(start).strftime(TIMESTAMP_FORMAT),
+                      datetime.fromtimestamp(end).strftime(TIMESTAMP_FORMAT))
+
+        return [row for row in self.conn.execute(query, params) if 0 <= row[0] < count]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,411 @@
+# core/device_pool.py
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Future, wait
+import os
+import threading
+from .config import DEVICE_ENDPOINTS, WS_PORT, OFFLINE_QUEUE_PATH, SHUTDOWN_TIMEOUT
+from .websocket_bridge import WebSocketBridge
+from .network_loop import NetworkLoop, get_network_loop
+from .commands import Command
+from . import codec
+
+
+# Kümes belirtilmeden gönderildiğinde tüm cihazlara giden komutlar
+BROADCAST_ACTIONS = {
+    "get_status", "led_on", "led_off", "fan_on", "fan_off", "set_auto_mode", "reset_alarms",
+    "set_rate"
+}
+
+
+def _gather(futures: List[Future], combine: Callable[[list], object]) -> Future:
+    """Cihaz bazındaki Future'lar bitince `combine(sonuçlar)` ile tamamlanan tek Future"""
+    gathered: Future = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            gathered.set_result(combine([f.result() for f in futures]))
+        except Exception as e:
+            gathered.set_exception(e)
+
+    if not futures:
+        gathered.set_result(combine([]))
+    for future in futures:
+        future.add_done_callback(on_done)
+    return gathered
+
+
+def _overall_result(results: list):
+    """Toplu komutun sonucu: ilk başarısız cihazın sonucu, yoksa sonuncusu"""
+    return next((r for r in results if not r.success), results[-1] if results else None)
+
+
+@dataclass
+class DeviceEndpoint:
+    """Tek bir ESP32 kontrolcüsünün adresi ve sahip olduğu kümesler"""
+    name: str
+    ip: str
+    port: int = WS_PORT
+    kumesler: List[int] = field(default_factory=list)  # yerel 1..n → uygulama kümes no
+    keepalive: Optional[dict] = None  # KEEPALIVE'ı bu cihaz için değiştirir (idle, timeout)
+
+    def to_global(self, local_id: int) -> int:
+        """Cihazın raporladığı kümes numarasını uygulama numarasına çevirir"""
+        if self.kumesler and 1 <= local_id <= len(self.kumesler):
+            return self.kumesler[local_id - 1]
+        return local_id
+
+    def to_local(self, kumes_id: int) -> int:
+        """Uygulama kümes numarasını cihazın yerel numarasına çevirir"""
+        if kumes_id in self.kumesler:
+            return self.kumesler.index(kumes_id) + 1
+        return kumes_id
+
+
+class DevicePool(QObject):
+    """
+    Birden fazla ESP32 kontrolcüsünü yöneten bağlantı havuzu
+
+    - Tüm cihaz bağlantıları paylaşılan tek asyncio döngüsünde çalışır;
+      cihaz eklemek yeni thread açmaz.
+    - Kümesler cihazlara eşlenir, komutlar sahibi olan cihaza yönlendirilir.
+    - Cihazların durum çerçeveleri tek bir anlık görüntüde birleştirilir ve
+      `dataReceived` ile tek cihazlı köprüdeki formatta yayılır.
+
+    WebSocketBridge ile aynı arayüzü sunar; UI tarafı farkı bilmez.
+    """
+
+    # Sinyaller (WebSocketBridge ile uyumlu)
+    dataReceived = pyqtSignal(str)          # Birleştirilmiş JSON string
+    frameReceived = pyqtSignal(object)      # Birleştirilmiş durum (dict)
+    connectionChanged = pyqtSignal(bool)    # En az bir cihaz bağlı mı
+    errorOccurred = pyqtSignal(str)
+    messageToUI = pyqtSignal(str)
+    commandCompleted = pyqtSignal(object)   # CommandResult
+    deviceConnectionChanged = pyqtSignal(str, bool)  # cihaz adı, bağlı mı
+    linkStatsUpdated = pyqtSignal(dict)     # get_link_stats() çıktısı (cihaz adı → istatistik)
+    addressChanged = pyqtSignal(str, int)   # Ana cihazın adres değişikliği tamamlandı
+    disconnected = pyqtSignal()             # disconnect_async tamamlandı (tüm cihazlar durdu)
+
+    def __init__(self, endpoints: Optional[List[Union[DeviceEndpoint, dict]]] = None,
+                 loop: Optional[NetworkLoop] = None):
+        super().__init__()
+        self._net = loop or get_network_loop()
+        self._running = False
+
+        self.endpoints: Dict[str, DeviceEndpoint] = {}
+        self.bridges: Dict[str, WebSocketBridge] = {}
+        self._owner: Dict[int, str] = {}       # kümes no → cihaz adı
+        self._snapshots: Dict[str, dict] = {}  # cihaz adı → son durum
+        self._any_connected = False
+
+        # Aynı olay turunda gelen çerçeveler tek birleştirilmiş yayına iner
+        self._merge_timer = QTimer(self)
+        self._merge_timer.setSingleShot(True)
+        self._merge_timer.setInterval(0)
+        self._merge_timer.timeout.connect(self._emit_merged)
+
+        # Cihazların istatistik yayınları da tek yayında toplanır
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setSingleShot(True)
+        self._stats_timer.setInterval(0)
+        self._stats_timer.timeout.connect(lambda: self.linkStatsUpdated.emit(self.get_link_stats()))
+
+        for endpoint in (DEVICE_ENDPOINTS if endpoints is None else endpoints):
+            self.add_device(endpoint)
+
+    # ------------------------------------------------------------------
+    # Cihaz yönetimi
+    # ------------------------------------------------------------------
+    def add_device(self, endpoint: Union[DeviceEndpoint, dict]) -> WebSocketBridge:
+        """Havuza yeni cihaz ekler (havuz çalışıyorsa hemen bağlanır)"""
+        if isinstance(endpoint, dict):
+            endpoint = DeviceEndpoint(**endpoint)
+        if endpoint.name in self.bridges:
+            raise ValueError(f"Cihaz zaten tanımlı: {endpoint.name}")
+
+        base, ext = os.path.splitext(OFFLINE_QUEUE_PATH)
+        bridge = WebSocketBridge(
+            endpoint.ip, endpoint.port,
+            loop=self._net,
+            offline_path=f"{base}_{endpoint.name}{ext}",
+            keepalive=endpoint.keepalive
+        )
+        name = endpoint.name
+        bridge.frameReceived.connect(lambda data, n=name: self._on_device_frame(n, data))
+        bridge.connectionChanged.connect(lambda ok, n=name: self._on_device_connection(n, ok))
+        bridge.errorOccurred.connect(lambda msg, n=name: self.errorOccurred.emit(f"[{n}] {msg}"))
+        bridge.messageToUI.connect(lambda msg, n=name: self.messageToUI.emit(f"[{n}] {msg}"))
+        bridge.commandCompleted.connect(self.commandCompleted)
+        bridge.linkStatsUpdated.connect(lambda stats: self._stats_timer.start())
+        bridge.addressChanged.connect(self.addressChanged)
+
+        self.endpoints[name] = endpoint
+        self.bridges[name] = bridge
+        for kumes_id in endpoint.kumesler:
+            self._owner[kumes_id] = name
+
+        if self._running:
+            bridge.connect()
+        return bridge
+
+    def remove_device(self, name: str):
+        """Cihazı havuzdan çıkarır ve bağlantısını kapatır"""
+        bridge = self.bridges.pop(name, None)
+        endpoint = self.endpoints.pop(name, None)
+        if bridge:
+            bridge.disconnect()
+        if endpoint:
+            self._owner = {k: n for k, n in self._owner.items() if n != name}
+        self._snapshots.pop(name, None)
+        self._merge_timer.start()
+        self._update_any_connected()
+
+    def device_for(self, kumes_id: int) -> Optional[str]:
+        """Kümesin bağlı olduğu cihazın adı"""
+        return self._owner.get(kumes_id)
+
+    @property
+    def primary(self) -> Optional[str]:
+        """Kümese ait olmayan komutların (pompa, yem, kapı) gideceği cihaz"""
+        return next(iter(self.bridges), None)
+
+    # Tek cihazlı köprüyle uyumluluk (ayarlar sekmesi ana cihazı düzenler)
+    @property
+    def ip(self) -> str:
+        return self.bridges[self.primary].ip if self.primary else ""
+
+    @ip.setter
+    def ip(self, value: str):
+        if self.primary:
+            self.bridges[self.primary].ip = value
+            self.endpoints[self.primary].ip = value
+
+    @property
+    def port(self) -> int:
+        return self.bridges[self.primary].port if self.primary else WS_PORT
+
+    @port.setter
+    def port(self, value: int):
+        if self.primary:
+            self.bridges[self.primary].port = value
+            self.endpoints[self.primary].port = value
+
+    # ------------------------------------------------------------------
+    # Bağlantı
+    # ------------------------------------------------------------------
+    def connect(self):
+        """Tüm cihazlara bağlanır"""
+        self._running = True
+        for bridge in self.bridges.values():
+            bridge.connect()
+
+    def disconnect(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """Tüm cihaz bağlantılarını aynı anda kapatır (toplam en fazla `timeout` sn)"""
+        self._running = False
+        futures = [bridge.disconnect_async() for bridge in self.bridges.values()]
+        _, pending = wait(futures, timeout=timeout)
+        if pending:
+            print(f"⚠ {len(pending)} cihaz bağlantısı {timeout:.1f} sn içinde kapanmadı")
+        else:
+            print("✓ Tüm cihaz bağlantıları kapatıldı")
+
+    def disconnect_async(self) -> Future:
+        """
+        Tüm cihazları beklemeden durdurur (UI thread'ini bloklamaz)
+
+        Returns:
+            Future: Tüm görevler durunca tamamlanır; ayrıca `disconnected` yayılır
+        """
+        self._running = False
+        future = _gather([bridge.disconnect_async() for bridge in self.bridges.values()],
+                         lambda results: None)
+        future.add_done_callback(lambda _: self.disconnected.emit())
+        return future
+
+    def reconnect(self, name: Optional[str] = None) -> Future:
+        """
+        Cihaza (verilmezse tüm cihazlara) aynı adresle yeniden bağlanır
+
+        Çağrı beklemeden döner; dönen Future tüm yeni görevler başlayınca tamamlanır.
+        """
+        names = list(self.bridges) if name is None else [name]
+        return _gather([self.bridges[n].reconnect() for n in names if n in self.bridges],
+                       lambda results: None)
+
+    def update_ip(self, new_ip: str, new_port: Optional[int] = None) -> Optional[Future]:
+        """Ana cihazın adresini değiştirir ve yeniden bağlanır (beklemeden döner)"""
+        if not self.primary:
+            return None
+        self.endpoints[self.primary].ip = new_ip
+        if new_port is not None:
+            self.endpoints[self.primary].port = new_port
+        return self.bridges[self.primary].update_ip(new_ip, new_port)
+
+    def is_connected(self) -> bool:
+        """En az bir cihaz bağlıysa True"""
+        return any(bridge.is_connected() for bridge in self.bridges.values())
+
+    def get_connection_info(self) -> dict:
+        """Havuz ve cihaz bazında bağlantı bilgileri"""
+        return {
+            "ip": self.ip,
+            "port": self.port,
+            "connected": self.is_connected(),
+            "running": self._running,
+            "devices": {name: bridge.get_connection_info() for name, bridge in self.bridges.items()}
+        }
+
+    def get_link_stats(self) -> dict:
+        """Cihaz bazında bağlantı kalitesi (kümes yaşları uygulama numarasıyla)"""
+        stats = {}
+        for name, bridge in self.bridges.items():
+            endpoint = self.endpoints[name]
+            device = bridge.get_link_stats()
+            device["kumes_age"] = {endpoint.to_global(k): age for k, age in device["kumes_age"].items()}
+            stats[name] = device
+        return stats
+
+    def _on_device_connection(self, name: str, connected: bool):
+        self.deviceConnectionChanged.emit(name, connected)
+        if not connected:
+            # Kopan cihazın kümeleri birleştirilmiş görüntüde eski kalmasın
+            self._snapshots.pop(name, None)
+            self._merge_timer.start()
+        self._update_any_connected()
+
+    def _update_any_connected(self):
+        any_connected = self.is_connected()
+        if any_connected != self._any_connected:
+            self._any_connected = any_connected
+            self.connectionChanged.emit(any_connected)
+
+    # ------------------------------------------------------------------
+    # Komut yönlendirme
+    # ------------------------------------------------------------------
+    def send_command(self, command: Union[Command, str, dict], durable: Optional[bool] = None) -> bool:
+        """
+        Komutu ilgili cihaz(lar)a gönderir
+
+        - `kumes` alanı olan komutlar kümesin sahibine, yerel numarayla gider.
+        - Kümes belirtilmemiş toplu komutlar (LED, fan, durum) tüm cihazlara gider.
+        - Diğerleri (pompa, yem, kapı servosu) ana cihaza gider.
+
+        Returns:
+            bool: En az bir cihaz komutu kabul ettiyse True
+        """
+        if not self.primary:
+            print("Havuzda cihaz yok! Komut gönderilemedi.")
+            return False
+
+        payload = self.bridges[self.primary]._to_payload(command)
+        if payload is None:
+            return False
+
+        accepted = False
+        for name, routed in self._route(payload):
+            accepted = self.bridges[name].send_command(routed, durable) or accepted
+        return accepted
+
+    def send_tracked(self, command: Union[Command, str, dict], durable: Optional[bool] = None) -> Optional[Future]:
+        """
+        Komutu ilgili cihaz(lar)a takipli gönderir (yönlendirme `send_command` ile aynı)
+
+        Her cihazın sonucu ayrıca `commandCompleted` ile yayılır.
+
+        Returns:
+            Future: Tüm cihazlar bitince CommandResult ile tamamlanır (biri başarısızsa
+            onun sonucu); hiçbir cihaz kabul etmediyse None
+        """
+        if not self.primary:
+            print("Havuzda cihaz yok! Komut gönderilemedi.")
+            return None
+
+        payload = self.bridges[self.primary]._to_payload(command)
+        if payload is None:
+            return None
+
+        futures = [self.bridges[name].send_tracked(routed, durable)
+                   for name, routed in self._route(payload)]
+        futures = [future for future in futures if future is not None]
+        if not futures:
+            return None
+        if len(futures) == 1:
+            return futures[0]
+        return _gather(futures, _overall_result)
+
+    def send_json(self, data: dict) -> bool:
+        """Dictionary komutu ilgili cihaza gönderir"""
+        return self.send_command(data)
+
+    def _route(self, payload: dict) -> List[Tuple[str, dict]]:
+        """Komutu (cihaz adı, yerel komut) çiftlerine ayırır"""
+        kumes_id = payload.get("kumes")
+        if kumes_id is not None:
+            name = self._owner.get(kumes_id)
+            if name is None:
+                print(f"❌ Kümes {kumes_id} hiçbir cihaza atanmamış")
+                return []
+            local = dict(payload, kumes=self.endpoints[name].to_local(kumes_id))
+            return [(name, local)]
+
+        if payload.get("action") in BROADCAST_ACTIONS:
+            return [(name, dict(payload)) for name in self.bridges]
+        return [(self.primary, payload)]
+
+    # ------------------------------------------------------------------
+    # Veri birleştirme
+    # ------------------------------------------------------------------
+    def _on_device_frame(self, name: str, data):
+        """Cihazdan gelen çerçeveyi uygulama numaralarına çevirip saklar"""
+        if not isinstance(data, dict):
+            return
+        endpoint = self.endpoints.get(name)
+        if endpoint is None:
+            return
+
+        if "kumesler" in data:
+            frame = dict(data)
+            frame["kumesler"] = [
+                dict(k, id=endpoint.to_global(k.get("id", 0))) for k in data["kumesler"]
+            ]
+            self._snapshots[name] = frame
+            self._merge_timer.start()
+            return
+
+        # Ack ve bilgi mesajları cihaz etiketiyle olduğu gibi iletilir
+        message = dict(data, cihaz=name)
+        if isinstance(message.get("kumes"), int):
+            message["kumes"] = endpoint.to_global(message["kumes"])
+        self.frameReceived.emit(message)
+        if self.receivers(self.dataReceived) > 0:
+            self.dataReceived.emit(codec.dumps(message))
+
+    def merged_snapshot(self) -> dict:
+        """Tüm cihazların son durumlarını tek görüntüde birleştirir"""
+        merged: dict = {}
+        kumesler: List[dict] = []
+        # Ortak alanlarda (pompa, depo vb.) ana cihaz öncelikli
+        for name in reversed(list(self.bridges)):
+            snapshot = self._snapshots.get(name)
+            if not snapshot:
+                continue
+            merged.update({k: v for k, v in snapshot.items() if k != "kumesler"})
+            kumesler.extend(snapshot["kumesler"])
+        merged["kumesler"] = sorted(kumesler, key=lambda k: k.get("id", 0))
+        merged["cihazlar"] = {name: bridge.is_connected() for name, bridge in self.bridges.items()}
+        return merged
+
+    def _emit_merged(self):
+        # Son cihaz da koptuysa boş kümes listesi yayılır
+        merged = self.merged_snapshot()
+        self.frameReceived.emit(merged)
+        if self.receivers(self.dataReceived) > 0:
+            self.dataReceived.emit(codec.dumps(merged))
@@ -0,0 +1,65 @@
+# core/keepalive.py
+"""
+Veri trafiğine dayalı bağlantı canlılık kontrolü
+
+websockets'in yerleşik keepalive'ı trafikten bağımsız olarak her
+`ping_interval` saniyede ping atar. Cihaz zaten birkaç saniyede bir durum
+gönderiyorsa bu pingler gereksiz radyo uyanması demektir; yoğun Wi-Fi'da
+geciken bir pong da bağlantıyı yanlışlıkla koparır.
+
+Burada gelen her mesaj canlılık kanıtı sayılır; ping yalnızca `idle`
+saniye hiç veri gelmezse atılır ve `timeout` içinde pong gelmezse bağlantı
+kapatılır. Bağlantılar `ping_interval=None` ile açılıp bu görev
+yanına eklenir.
+"""
+import asyncio
+import time
+from typing import Callable, Optional
+
+from websockets.exceptions import ConnectionClosed
+
+from .config import KEEPALIVE
+
+# websockets.connect / serve için yerleşik keepalive kapalı
+NO_BUILTIN_PING = {"ping_interval": None, "ping_timeout": None}
+
+
+def keepalive_settings(overrides: Optional[dict] = None) -> dict:
+    """Varsayılan KEEPALIVE ayarları + cihaza özel değerler"""
+    return dict(KEEPALIVE, **(overrides or {}))
+
+
+async def idle_keepalive(ws, idle_for: Callable[[], Optional[float]],
+                         idle: float, timeout: float,
+                         on_rtt: Optional[Callable[[float], None]] = None):
+    """
+    Bağlantı sessiz kaldıkça ping atar, pong gelmezse bağlantıyı kapatır
+
+    Args:
+        ws: websockets bağlantısı
+        idle_for: Son gelen mesajdan bu yana saniye (None: hiç mesaj yok)
+        idle: Ping atmadan önce beklenecek sessizlik (sn)
+        timeout: Pong için bekleme süresi (sn)
+        on_rtt: Ölçülen gidiş-dönüş süresi (sn) ile çağrılır
+    """
+    last_ping = time.monotonic()
+    while True:
+        quiet = idle_for()
+        since_ping = time.monotonic() - last_ping
+        quiet = since_ping if quiet is None else min(quiet, since_ping)
+        if quiet < idle:
+            await asyncio.sleep(idle - quiet)
+            continue
+
+        last_ping = time.monotonic()
+        try:
+            pong = await ws.ping()
+            rtt = await asyncio.wait_for(pong, timeout)
+        except ConnectionClosed:
+            return
+        except asyncio.TimeoutError:
+            print(f"⚠ {idle:.0f} sn veri yok ve ping {timeout:.0f} sn içinde cevaplanmadı - bağlantı kapatılıyor")
+            await ws.close(code=1011, reason="keepalive ping timeout")
+            return
+        if on_rtt:
+            on_rtt(rtt)
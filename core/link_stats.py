@@ -0,0 +1,150 @@
+# core/link_stats.py
+"""
+WebSocket bağlantı kalitesi ölçümü
+
+Bağlı olmak verinin güncel olduğu anlamına gelmez: ESP32 ping'lere cevap
+verirken sensör döngüsü takılabilir. Bu modül ping RTT, jitter, bant
+genişliği ve kümes başına son güncelleme yaşını tutar; köprü bu değerleri
+periyodik olarak yayınlar. Güncellenmeyen kümesleri veri bekçisi
+(RealTimeDataUpdater) bu yaşlardan tespit eder.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Ping RTT histogram aralıkları (ms, üst sınır)
+RTT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+
+
+class LinkStats:
+    """
+    Tek bir bağlantının kalite ölçümleri
+
+    - Ping RTT: son değer, min/ortalama/maks, p95 ve histogram
+    - Mesaj arası süre ve jitter (RFC 3550 tarzı yumuşatılmış sapma)
+    - Saniyedeki bayt / mesaj (gelen ve giden, kayan pencere)
+    - Kümes bazında son güncellemeden bu yana geçen süre
+
+    Ağ thread'inden yazılır, UI thread'inden okunur.
+    """
+
+    def __init__(self, window: float = 10.0):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._rtts: deque = deque(maxlen=200)
+            self._histogram = [0] * len(RTT_BUCKETS_MS)
+            self._last_arrival: Optional[float] = None
+            self._last_interval: Optional[float] = None
+            self._interval_sum = 0.0
+            self._interval_count = 0
+            self.jitter = 0.0  # saniye
+            self._inbound: deque = deque()   # (zaman, bayt)
+            self._outbound: deque = deque()
+            self._kumes_seen: Dict[int, float] = {}
+            self._since: Optional[float] = None  # İlk ölçüm (pencere dolana kadar oran için)
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+    def record_rtt(self, rtt: float):
+        """Ping-pong gidiş dönüş süresi (saniye)"""
+        ms = rtt * 1000
+        with self._lock:
+            self._rtts.append(ms)
+            for i, limit in enumerate(RTT_BUCKETS_MS):
+                if ms <= limit:
+                    self._histogram[i] += 1
+                    break
+
+    def record_inbound(self, nbytes: int, now: Optional[float] = None):
+        """Gelen mesaj (boyut + varış zamanı)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._last_arrival is not None:
+                interval = now - self._last_arrival
+                self._interval_sum += interval
+                self._interval_count += 1
+                if self._last_interval is not None:
+                    # J += (|D| - J) / 16
+                    self.jitter += (abs(interval - self._last_interval) - self.jitter) / 16
+                self._last_interval = interval
+            self._last_arrival = now
+            if self._since is None:
+                self._since = now
+            self._inbound.append((now, nbytes))
+            self._trim(self._inbound, now)
+
+    def record_outbound(self, nbytes: int, now: Optional[float] = None):
+        """Giden mesaj"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._outbound.append((now, nbytes))
+            self._trim(self._outbound, now)
+
+    def touch_kumes(self, kumes_ids, now: Optional[float] = None):
+        """Durum çerçevesinde gelen kümeslerin güncellenme zamanını kaydeder"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for kumes_id in kumes_ids:
+                self._kumes_seen[kumes_id] = now
+
+    def _trim(self, samples: deque, now: float):
+        limit = now - self.window
+        while samples and samples[0][0] < limit:
+            samples.popleft()
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+    def last_message_age(self, now: Optional[float] = None) -> Optional[float]:
+        """Son gelen mesajdan bu yana saniye (hiç mesaj yoksa None)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return (now - self._last_arrival) if self._last_arrival else None
+
+    def kumes_ages(self, now: Optional[float] = None) -> Dict[int, float]:
+        """Kümes → son güncellemeden bu yana saniye"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return {k: now - t for k, t in self._kumes_seen.items()}
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        """Tüm ölçümlerin anlık görüntüsü"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._trim(self._inbound, now)
+            self._trim(self._outbound, now)
+            rtts = sorted(self._rtts)
+            span = min(self.window, max(1.0, now - self._since)) if self._since else self.window
+
+            rtt = {"last_ms": None, "min_ms": None, "avg_ms": None, "max_ms": None, "p95_ms": None}
+            if rtts:
+                rtt = {
+                    "last_ms": self._rtts[-1],
+                    "min_ms": rtts[0],
+                    "avg_ms": sum(rtts) / len(rtts),
+                    "max_ms": rtts[-1],
+                    "p95_ms": rtts[min(len(rtts) - 1, int(len(rtts) * 0.95))],
+                }
+            rtt["histogram"] = {
+                ("inf" if limit == float("inf") else f"<={limit:g}"): count
+                for limit, count in zip(RTT_BUCKETS_MS, self._histogram)
+            }
+
+            return {
+                "rtt": rtt,
+                "interarrival_ms": (self._interval_sum / self._interval_count * 1000)
+                if self._interval_count else None,
+                "jitter_ms": self.jitter * 1000,
+                "in_msgs_per_sec": len(self._inbound) / span,
+                "in_bytes_per_sec": sum(n for _, n in self._inbound) / span,
+                "out_msgs_per_sec": len(self._outbound) / span,
+                "out_bytes_per_sec": sum(n for _, n in self._outbound) / span,
+                "last_message_age": (now - self._last_arrival) if self._last_arrival else None,
+                "kumes_age": {k: now - t for k, t in self._kumes_seen.items()},
+            }
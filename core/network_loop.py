@@ -0,0 +1,73 @@
+# core/network_loop.py
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Coroutine, Optional
+
+
+class NetworkLoop:
+    """
+    Tüm ağ bağlantılarının paylaştığı tek asyncio döngüsü
+
+    Döngü tek bir arka plan thread'inde çalışır. Cihaz sayısı arttıkça
+    yeni thread açılmaz; her bağlantı bu döngüde bir görev (task) olur.
+    UI thread'inden `submit` / `call_soon` ile güvenle iş gönderilir.
+    """
+
+    def __init__(self, name: str = "ag-dongusu"):
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Döngü thread'ini (gerekirse) başlatır"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def in_loop(self) -> bool:
+        """Çağrı döngü thread'inden mi yapılıyor"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Coroutine'i döngüde çalıştırır (herhangi bir thread'den)
+
+        Returns:
+            Future: Coroutine sonucu ile tamamlanır
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback: Callable, *args):
+        """Fonksiyonu döngü thread'inde çağırır (herhangi bir thread'den)"""
+        self.start()
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float = 2.0):
+        """Döngüyü durdurur ve thread'in bitmesini bekler"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if not self.in_loop():
+            self._thread.join(timeout=timeout)
+
+
+_shared_loop: Optional[NetworkLoop] = None
+_shared_lock = threading.Lock()
+
+
+def get_network_loop() -> NetworkLoop:
+    """Uygulama genelinde paylaşılan ağ döngüsünü döndürür"""
+    global _shared_loop
+    with _shared_lock:
+        if _shared_loop is None:
+            _shared_loop = NetworkLoop()
+        return _shared_loop
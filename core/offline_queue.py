@@ -0,0 +1,114 @@
+# core/offline_queue.py
+import sqlite3
+import json
+import os
+import threading
+import time
+from typing import List, NamedTuple, Optional
+from .config import OFFLINE_QUEUE_PATH, OFFLINE_COMMAND_TTL
+from .command_queue import actuator_key
+from . import codec
+
+
+def dedup_key(payload: dict) -> str:
+    """
+    Kuyrukta tekrarı önleyen anahtar
+
+    Durum komutlarında aktüatör başına son komut tutulur; yem gibi
+    tekrarlanamaz komutlarda ise aynı içerik yalnızca bir kez saklanır.
+    """
+    key = actuator_key(payload)
+    if key.startswith("once:"):
+        body = {k: v for k, v in payload.items() if k != "cid"}
+        key = "once:" + json.dumps(body, sort_keys=True)
+    return key
+
+
+class OfflineCommand(NamedTuple):
+    """Kuyruktan çıkan komut ve ilk saklandığı andaki zamanları"""
+    payload: dict
+    created: float
+    expires: float
+
+
+class OfflineCommandStore:
+    """
+    Bağlantı yokken dayanıklı (durable) komutları saklayan SQLite kuyruğu
+
+    Yem, pompa ve kapı komutları Wi-Fi kopmalarında kaybolmasın diye diske
+    yazılır; bağlantı geri geldiğinde sırayla, süresi dolmamış olanlar
+    yeniden gönderilir.
+    """
+
+    def __init__(self, path: str = OFFLINE_QUEUE_PATH, ttl: float = OFFLINE_COMMAND_TTL):
+        db_dir = os.path.dirname(path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS bekleyen_komutlar (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                anahtar TEXT UNIQUE,
+                komut TEXT,
+                olusturma REAL,
+                son_gecerlilik REAL
+            )
+        ''')
+        self.conn.commit()
+
+    def push(self, payload: dict, ttl: float = None,
+             created: Optional[float] = None, expires: Optional[float] = None):
+        """
+        Komutu kuyruğun sonuna ekler
+
+        Aynı anahtarlı eski kayıt silinir; böylece en yeni komut kalır ve
+        sıralamada en sona geçer. Yeniden gönderilip tekrar saklanan komut
+        ilk `created` / `expires` değerleriyle verilir; böylece TTL komutun
+        toplam yaşını sınırlar.
+        """
+        body = {k: v for k, v in payload.items() if k != "cid"}
+        now = time.time() if created is None else created
+        if expires is None:
+            expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('DELETE FROM bekleyen_komutlar WHERE anahtar = ?', (dedup_key(body),))
+            cursor.execute('''
+                INSERT INTO bekleyen_komutlar (anahtar, komut, olusturma, son_gecerlilik)
+                VALUES (?, ?, ?, ?)
+            ''', (dedup_key(body), codec.dumps(body), now, expires))
+            self.conn.commit()
+
+    def pop_all(self) -> List[OfflineCommand]:
+        """
+        Süresi dolmamış komutları eklenme sırasıyla döndürür ve kuyruğu boşaltır
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('DELETE FROM bekleyen_komutlar WHERE son_gecerlilik < ?', (time.time(),))
+            expired = cursor.rowcount
+            cursor.execute('SELECT komut, olusturma, son_gecerlilik FROM bekleyen_komutlar ORDER BY id')
+            rows = cursor.fetchall()
+            cursor.execute('DELETE FROM bekleyen_komutlar')
+            self.conn.commit()
+
+        if expired > 0:
+            print(f"⌛ Süresi dolan {expired} bekleyen komut atıldı")
+        return [OfflineCommand(codec.loads(komut), olusturma, son_gecerlilik)
+                for komut, olusturma, son_gecerlilik in rows]
+
+    def count(self) -> int:
+        """Kuyruktaki komut sayısı"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM bekleyen_komutlar')
+            return cursor.fetchone()[0]
+
+    def close(self):
+        self.conn.close()
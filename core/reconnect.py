@@ -0,0 +1,54 @@
+# core/reconnect.py
+import random
+from .config import (
+    RECONNECT_BASE_DELAY, RECONNECT_MAX_DELAY, RECONNECT_FACTOR, RECONNECT_JITTER
+)
+
+
+class ConnectionState:
+    """Bağlantı durum makinesinin durumları"""
+    IDLE = "idle"              # Hiç başlatılmadı / durduruldu
+    CONNECTING = "connecting"  # Soket açılıyor
+    CONNECTED = "connected"    # Bağlı, veri akıyor
+    BACKOFF = "backoff"        # Kopma sonrası bekleme
+    STOPPED = "stopped"        # Kullanıcı tarafından kapatıldı
+
+
+class ReconnectBackoff:
+    """
+    Üstel geri çekilme (exponential backoff) hesaplayıcı
+
+    - Temiz kapanıştan (kod 1000/1001) sonra ilk deneme beklemeden yapılır.
+    - Her başarısız denemede bekleme FACTOR katına çıkar, MAX_DELAY ile sınırlanır.
+    - Jitter, birden fazla istemcinin aynı anda cihaza yüklenmesini önler.
+    - Başarılı bağlantıda sayaç sıfırlanır; kısa kopmalar hızlı toparlanır.
+    """
+
+    def __init__(self, base: float = RECONNECT_BASE_DELAY, cap: float = RECONNECT_MAX_DELAY,
+                 factor: float = RECONNECT_FACTOR, jitter: float = RECONNECT_JITTER):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.jitter = jitter
+        self.attempts = 0
+
+    def reset(self):
+        """Başarılı bağlantı sonrası sayacı sıfırlar"""
+        self.attempts = 0
+
+    def next_delay(self, clean_close: bool = False) -> float:
+        """
+        Bir sonraki denemeden önce beklenecek süre (saniye)
+
+        Args:
+            clean_close: Önceki bağlantı karşı taraftan temiz kapatıldı mı
+        """
+        attempt = self.attempts
+        self.attempts += 1
+
+        if clean_close and attempt == 0:
+            return 0.0
+
+        delay = min(self.cap, self.base * (self.factor ** attempt))
+        spread = delay * self.jitter
+        return max(0.0, delay + random.uniform(-spread, spread))
@@ -0,0 +1,77 @@
+# core/startup_timeline.py
+"""
+Açılış zaman çizelgesi
+
+Uygulama açılırken önemli noktalar işaretlenir (import, veritabanı, arayüz,
+ilk boyama, ilk veri çerçevesi) ve ilk çerçeve geldiğinde tek bir rapor
+yazdırılır. Böylece ilk boyamaya kadar geçen süre ve ileride oluşabilecek
+gerilemeler ölçülebilir.
+
+    from core.startup_timeline import timeline   # Ana modülde ilk import
+    ...
+    timeline.mark("import")
+"""
+import time
+from typing import List, Optional, Tuple
+
+
+class StartupTimeline:
+    """
+    İşaret adı → modül yüklendiğinden bu yana geçen süre
+
+    `report_after` içindeki tüm noktalar işaretlenince rapor kendiliğinden
+    yazdırılır (ilk boyama ve ilk çerçeve hangi sırayla gelirse gelsin).
+    """
+
+    def __init__(self, report_after: Tuple[str, ...] = ("first_paint", "first_frame")):
+        # Qt burada import edilmez: ölçüm ana modülün import'larından önce başlar
+        self.origin = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.report_after = report_after
+        self.reported = False
+        self._paint_watcher = None
+
+    def mark(self, name: str) -> Optional[float]:
+        """Noktayı işaretler (aynı ad ikinci kez yok sayılır); geçen süre (sn)"""
+        if self.has(name):
+            return None
+        elapsed = time.perf_counter() - self.origin
+        self.marks.append((name, elapsed))
+        if not self.reported and all(self.has(n) for n in self.report_after):
+            self.report()
+        return elapsed
+
+    def has(self, name: str) -> bool:
+        return any(mark == name for mark, _ in self.marks)
+
+    def watch_first_paint(self, widget, name: str = "first_paint"):
+        """Widget'ın ilk boyama olayında `name` işaretlenir"""
+        from PyQt6.QtCore import QEvent, QObject
+        timeline = self
+
+        class _PaintWatcher(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    timeline.mark(name)
+                    obj.removeEventFilter(self)
+                return False
+
+        self._paint_watcher = _PaintWatcher(widget)
+        widget.installEventFilter(self._paint_watcher)
+
+    def report(self, force: bool = False):
+        """Zaman çizelgesini bir kez yazdırır"""
+        if self.reported and not force:
+            return
+        self.reported = True
+
+        print("\n⏱️ AÇILIŞ ZAMAN ÇİZELGESİ")
+        previous = 0.0
+        for name, elapsed in self.marks:
+            print(f"   {name:<14} {elapsed * 1000:8.0f} ms   (+{(elapsed - previous) * 1000:.0f} ms)")
+            previous = elapsed
+        print()
+
+
+# Uygulama genelinde tek çizelge
+timeline = StartupTimeline()
@@ -0,0 +1,161 @@
+# core/subscriptions.py
+"""
+PWA istemcileri için abonelik filtreleri
+
+Her istemci hangi kümesleri, hangi ölçümleri ve en fazla hangi sıklıkta
+istediğini bir `subscribe` mesajıyla bildirir:
+
+    {"type": "subscribe", "kumesler": [2], "metrics": ["sicaklik", "nem"], "max_rate": 1}
+
+Sunucu her çerçeveyi abonelik başına süzer (projeksiyon). Aynı aboneliğe
+sahip istemciler aynı kodlanmış metni paylaşır; böylece JSON kodlama
+maliyeti istemci sayısıyla değil, farklı abonelik sayısıyla büyür.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from . import codec
+
+# Ölçüm filtresinden bağımsız her zaman gönderilen alanlar
+ALWAYS_FIELDS = ("sistem", "zaman")
+KUMES_KEY_FIELDS = ("id",)
+
+
+@dataclass(frozen=True)
+class Subscription:
+    """İstemcinin istediği veri alt kümesi (None = hepsi)"""
+    kumesler: Optional[FrozenSet[int]] = None
+    metrics: Optional[FrozenSet[str]] = None
+    max_rate: Optional[float] = None  # Saniyedeki en fazla çerçeve
+
+    @classmethod
+    def from_message(cls, data: dict) -> "Subscription":
+        """`subscribe` mesajından abonelik oluşturur (hatalı alanlar yok sayılır)"""
+        kumesler = data.get("kumesler")
+        metrics = data.get("metrics")
+        max_rate = data.get("max_rate")
+        return cls(
+            kumesler=frozenset(int(k) for k in kumesler) if isinstance(kumesler, list) else None,
+            metrics=frozenset(str(m) for m in metrics) if isinstance(metrics, list) else None,
+            max_rate=float(max_rate) if isinstance(max_rate, (int, float)) and max_rate > 0 else None,
+        )
+
+    @property
+    def filter_key(self) -> Tuple:
+        """Projeksiyonu belirleyen kısım (hız sınırı hariç)"""
+        return (self.kumesler, self.metrics)
+
+    def to_dict(self) -> dict:
+        """İstemciye onay olarak dönülecek hali"""
+        return {
+            "kumesler": sorted(self.kumesler) if self.kumesler is not None else None,
+            "metrics": sorted(self.metrics) if self.metrics is not None else None,
+            "max_rate": self.max_rate,
+        }
+
+
+FULL = Subscription()
+
+
+def project(frame: dict, subscription: Subscription) -> dict:
+    """Durum çerçevesini aboneliğe göre süzer"""
+    if subscription.filter_key == FULL.filter_key:
+        return frame
+
+    kumesler, metrics = subscription.kumesler, subscription.metrics
+    result = {}
+    for key, value in frame.items():
+        if key == "kumesler":
+            continue
+        if metrics is None or key in metrics or key in ALWAYS_FIELDS:
+            result[key] = value
+
+    if isinstance(frame.get("kumesler"), list):
+        selected = []
+        for kumes in frame["kumesler"]:
+            if kumesler is not None and kumes.get("id") not in kumesler:
+                continue
+            if metrics is None:
+                selected.append(kumes)
+            else:
+                selected.append({k: v for k, v in kumes.items()
+                                 if k in metrics or k in KUMES_KEY_FIELDS})
+        result["kumesler"] = selected
+    return result
+
+
+class SubscriptionHub:
+    """
+    İstemci → abonelik eşlemesi ve çerçeve dağıtımı
+
+    asyncio sunucusundan da, thread'li (flask-sock) sunucudan da kullanılabilir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subs: Dict[Hashable, Subscription] = {}
+        self._last_sent: Dict[Hashable, float] = {}
+        self.encodes = 0   # Toplam kodlama sayısı
+        self.sends = 0     # Toplam gönderim sayısı
+
+    def subscribe(self, client: Hashable, subscription: Subscription):
+        with self._lock:
+            self._subs[client] = subscription
+            self._last_sent.pop(client, None)
+
+    def remove(self, client: Hashable):
+        with self._lock:
+            self._subs.pop(client, None)
+            self._last_sent.pop(client, None)
+
+    def get(self, client: Hashable) -> Subscription:
+        return self._subs.get(client, FULL)
+
+    def project_for(self, client: Hashable, frame: dict) -> str:
+        """Tek istemciye (ilk veri, STATUS yanıtı) süzülmüş çerçeve"""
+        return codec.dumps(project(frame, self.get(client)))
+
+    def _due(self, client: Hashable, subscription: Subscription, now: float) -> bool:
+        if subscription.max_rate is None:
+            return True
+        last = self._last_sent.get(client)
+        return last is None or now - last >= 1.0 / subscription.max_rate
+
+    def fanout(self, frame: dict, clients, now: Optional[float] = None) -> List[Tuple[str, List[Any]]]:
+        """
+        Çerçeveyi zamanı gelen istemciler için gruplar
+
+        Returns:
+            [(kodlanmış metin, [istemciler])] - her farklı projeksiyon bir kez kodlanır
+        """
+        now = time.monotonic() if now is None else now
+        groups: Dict[Tuple, List[Any]] = {}
+        with self._lock:
+            for client in clients:
+                subscription = self.get(client)
+                if not self._due(client, subscription, now):
+                    continue
+                self._last_sent[client] = now
+                groups.setdefault(subscription.filter_key, []).append((client, subscription))
+
+        batches = []
+        for members in groups.values():
+            payload = codec.dumps(project(frame, members[0][1]))
+            with self._lock:
+                self.encodes += 1
+                self.sends += len(members)
+            batches.append((payload, [client for client, _ in members]))
+        return batches
+
+    def stats(self) -> dict:
+        """Abonelik ve kodlama sayıları"""
+        with self._lock:
+            subs = list(self._subs.values())
+        return {
+            "clients": len(subs),
+            "distinct": len({s.filter_key for s in subs}),
+            "encodes": self.encodes,
+            "sends": self.sends,
+        }
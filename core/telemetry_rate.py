@@ -0,0 +1,114 @@
+# core/telemetry_rate.py
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from typing import Optional
+
+from .config import TELEMETRY_RATES, TELEMETRY_RATE_DEBOUNCE_MS
+from .commands import RateCommand
+
+
+class TelemetryRateController(QObject):
+    """
+    Cihazın durum gönderim hızını arayüzün görünürlüğüne göre ayarlar
+
+    - Pencere simge durumunda / tepside: TELEMETRY_RATES["minimized"]
+    - Detay grafiği açık: TELEMETRY_RATES["detail"]
+    - Aktif alarm varken: TELEMETRY_RATES["alarm"]
+    - Diğer durumlarda: TELEMETRY_RATES["normal"]
+
+    Hız değiştiğinde cihaza `set_rate` komutu gider; hız ancak cihaz komutu
+    onaylayınca uygulanmış sayılır. Ret / zaman aşımında bir sonraki
+    değişiklikte tekrar gönderilir. Kopup yeniden bağlanınca cihaz varsayılana
+    döndüğü için son hız tekrar gönderilir.
+    """
+
+    rateChanged = pyqtSignal(float)  # Yeni hız (Hz)
+
+    def __init__(self, ws_bridge, rates: Optional[dict] = None, parent=None):
+        super().__init__(parent)
+        self.ws = ws_bridge
+        self.rates = dict(TELEMETRY_RATES, **(rates or {}))
+
+        self.window_visible = True
+        self.detail_open = False
+        self.alarm_active = False
+        self.rate = self.rates["normal"]
+        self._sent_rate: Optional[float] = None     # Cihazın onayladığı son hız
+        self._pending_rate: Optional[float] = None  # Gönderilmiş, onayı beklenen hız
+
+        # Görünürlük değişimleri (küçült → geri yükle) tek komuta iner
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(TELEMETRY_RATE_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._apply)
+
+        self.ws.connectionChanged.connect(self._on_connection_changed)
+        self.ws.commandCompleted.connect(self._on_command_completed)
+
+    # ------------------------------------------------------------------
+    # Arayüz durumları
+    # ------------------------------------------------------------------
+    def set_window_visible(self, visible: bool):
+        """Ana pencere görünür mü (simge durumu / tepsi = False)"""
+        self._update("window_visible", visible)
+
+    def set_detail_open(self, is_open: bool):
+        """Detay grafiği ekranda mı"""
+        self._update("detail_open", is_open)
+
+    def set_alarm_active(self, active: bool):
+        """Aktif alarm var mı (alarmCountChanged ile bağlanabilir)"""
+        self._update("alarm_active", bool(active))
+
+    def _update(self, name: str, value: bool):
+        if getattr(self, name) == value:
+            return
+        setattr(self, name, value)
+        self._debounce.start()
+
+    def desired_rate(self) -> float:
+        """Mevcut arayüz durumuna göre istenen hız (Hz)"""
+        if not self.window_visible:
+            return self.rates["minimized"]
+        if self.detail_open:
+            return self.rates["detail"]
+        if self.alarm_active:
+            return self.rates["alarm"]
+        return self.rates["normal"]
+
+    # ------------------------------------------------------------------
+    # Cihazla anlaşma
+    # ------------------------------------------------------------------
+    def _apply(self):
+        rate = self.desired_rate()
+        if rate != self.rate:
+            self.rate = rate
+            print(f"📶 Telemetri hızı: {rate:g} Hz")
+            self.rateChanged.emit(rate)
+        self._send()
+
+    def _send(self):
+        if self.rate in (self._sent_rate, self._pending_rate) or not self.ws.is_connected():
+            return
+        # Havuzda her cihazın sonucu ayrıca commandCompleted ile gelir
+        if self.ws.send_tracked(RateCommand(self.rate)) is not None:
+            self._pending_rate = self.rate
+
+    def _on_command_completed(self, result):
+        """set_rate onayı / reddi (CommandResult)"""
+        if result.action != "set_rate" or result.reason == "superseded":
+            return
+        if result.success:
+            if self._pending_rate is not None:
+                self._sent_rate = self._pending_rate
+                self._pending_rate = None
+        else:
+            print(f"⚠️ Telemetri hızı uygulanamadı ({result.reason}): {self.rate:g} Hz")
+            self._sent_rate = None
+            self._pending_rate = None
+
+    def _on_connection_changed(self, connected: bool):
+        # Yeni bağlantıda cihaz varsayılan hızla başlar
+        self._sent_rate = None
+        self._pending_rate = None
+        if connected:
+            self._send()
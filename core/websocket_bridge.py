@@ -1,41 +1,106 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
-import websocket
+from PyQt6.QtCore import QObject, pyqtSignal
+import asyncio
+import websockets
+from websockets.exceptions import ConnectionClosed
 import threading
-import time
-import json
-from typing import Optional
-from .config import DEFAULT_ESP_IP, WS_PORT
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, Optional, Tuple, Union
+from .config import (DEFAULT_ESP_IP, WS_PORT, DURABLE_ACTIONS, OFFLINE_QUEUE_PATH,
+                     LINK_STATS_INTERVAL, SHUTDOWN_TIMEOUT)
+from .command_tracker import CommandTracker, CommandResult
+from .command_queue import CommandQueue, actuator_key
+from .reconnect import ConnectionState, ReconnectBackoff
+from .offline_queue import OfflineCommandStore
+from .commands import Command, parse_legacy, encode_payload
+from . import codec
+from .ws_compression import CompressionStats, client_options
+from .link_stats import LinkStats
+from .keepalive import NO_BUILTIN_PING, idle_keepalive, keepalive_settings
+from .network_loop import NetworkLoop, get_network_loop
 
 
 class WebSocketBridge(QObject):
-    """ESP32 ile gerçek zamanlı haberleşme köprüsü"""
+    """
+    ESP32 ile gerçek zamanlı haberleşme köprüsü
+
+    Bağlantı, paylaşılan asyncio ağ döngüsünde (NetworkLoop) bir görev
+    olarak çalışır; cihaz başına thread açılmaz. Sinyaller ağ thread'inden
+    yayılır ve Qt tarafından UI thread'ine kuyruklanır.
+    """
 
     # Sinyaller
     dataReceived = pyqtSignal(str)          # Ham JSON string
+    frameReceived = pyqtSignal(object)      # Parse edilmiş mesaj (tekrar parse etmemek için)
     connectionChanged = pyqtSignal(bool)    # Bağlantı durumu
     errorOccurred = pyqtSignal(str)         # Hata mesajı
     messageToUI = pyqtSignal(str)           # UI'a bilgi mesajı
+    commandCompleted = pyqtSignal(object)   # CommandResult (ack/timeout + RTT)
+    connectionStateChanged = pyqtSignal(str)  # ConnectionState değeri
+    linkStatsUpdated = pyqtSignal(dict)     # get_link_stats() çıktısı (LINK_STATS_INTERVAL'da bir)
+    disconnected = pyqtSignal()             # disconnect_async tamamlandı (görev durdu)
+    addressChanged = pyqtSignal(str, int)   # update_ip tamamlandı, yeni adrese bağlanılıyor
 
-    def __init__(self, ip: str = DEFAULT_ESP_IP, port: int = WS_PORT):
+    def __init__(self, ip: str = DEFAULT_ESP_IP, port: int = WS_PORT,
+                 loop: Optional[NetworkLoop] = None, offline_path: str = OFFLINE_QUEUE_PATH,
+                 keepalive: Optional[dict] = None):
         super().__init__()
         self.ip = ip
         self.port = port
-        self.ws: Optional[websocket.WebSocketApp] = None
+        self.ws = None  # websockets ClientConnection (bağlıyken)
         self.connected = False
         self._running = False
-        self._reconnect_timer: Optional[QTimer] = None
-        self._connection_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()  # Thread-safe işlemler için
 
+        # Paylaşılan ağ döngüsü ve bu bağlantının görevi
+        self._net = loop or get_network_loop()
+        self._task: Optional[Future] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        # Yeniden bağlanma durum makinesi
+        self.state = ConnectionState.IDLE
+        self._backoff = ReconnectBackoff()
+        self._wake = asyncio.Event()  # Beklemeyi erken bitirmek için (döngüde)
+        self._clean_close = False
+
+        # permessage-deflate oran / CPU ölçümü (WS_DEFLATE ayarlarıyla)
+        self.compression = CompressionStats()
+        self.deflate_active = False  # Karşı taraf deflate'i kabul etti mi
+
+        # Bağlantı kalitesi (RTT, jitter, bant genişliği, kümes veri yaşı)
+        self.link_stats = LinkStats()  # Bayat veri tespiti: RealTimeDataUpdater
+        
+        # Canlılık: veri geliyorsa ping atılmaz (KEEPALIVE + cihaza özel ayar)
+        self.keepalive = keepalive_settings(keepalive)
+
+        # Komut onay takibi (cid -> bekleyen komut)
+        self.tracker = CommandTracker(resend=self._resend_payload)
+        self.tracker.commandCompleted.connect(self._on_command_completed)
+        self.tracker.commandCompleted.connect(self.commandCompleted)
+
+        # Giden komut kuyruğu - UI çağrıları bekletmez, ağ döngüsü gönderir
+        self._outbox_ready = asyncio.Event()
+        self.outbox = CommandQueue(on_put=self._notify_sender)
+
+        # Bağlantı yokken dayanıklı komutlar diske yazılır, bağlanınca gönderilir
+        self.offline = OfflineCommandStore(offline_path)
+        # Dayanıklı cid -> bekleyen kuyruktan geldiyse ilk (olusturma, son_gecerlilik)
+        self._durable_cids: Dict[str, Optional[Tuple[float, float]]] = {}
+        self.tracker.commandCompleted.connect(
+            lambda result: self._durable_cids.pop(result.cid, None))
+
     def connect(self):
-        """Güncel IP ve Port üzerinden bağlantı kurar"""
+        """
+        Güncel IP ve Port üzerinden bağlantı kurar
+        
+        Bağlantı görevi tek sefer oluşturulur ve kopmalarda yeniden
+        kullanılır; görev beklemedeyse hemen yeni deneme yapılır.
+        """
         with self._lock:
             if self.connected:
                 print("Zaten bağlı, yeni bağlantı açılmıyor.")
                 return
 
             self._running = True
-            url = f"ws://{self.ip}:{self.port}"
             
             # DEBUG ÇIKTISI
             print("\n" + "=" * 70)
@@ -43,229 +108,383 @@ class WebSocketBridge(QObject):
             print("=" * 70)
             print(f"   IP Adresi    : {self.ip}")
             print(f"   Port         : {self.port}")
-            print(f"   WebSocket URL: {url}")
-            print(f"   Running      : {self._running}")
-            print(f"   Connected    : {self.connected}")
+            print(f"   WebSocket URL: {self._url()}")
+            print(f"   Durum        : {self.state}")
             print("=" * 70 + "\n")
-            
-            try:
-                self.ws = websocket.WebSocketApp(
-                    url,
-                    on_open=self._on_open,
-                    on_message=self._on_message,
-                    on_error=self._on_error,
-                    on_close=self._on_close
-                )
-
-                # Bağlantı thread'ini başlat
-                self._connection_thread = threading.Thread(
-                    target=self._run_websocket,
-                    daemon=True
-                )
-                self._connection_thread.start()
-                
-            except Exception as e:
-                self.errorOccurred.emit(f"Bağlantı başlatma hatası: {str(e)}")
-                print(f"WebSocket başlatma hatası: {e}")
-
-    def _run_websocket(self):
-        """WebSocket'i ayrı thread'de çalıştırır"""
+
+            # Görev beklemedeyse uyandır, yoksa başlat
+            if self._task and not self._task.done():
+                self._net.call_soon(self._wake.set)
+                return
+
+            self._task = self._net.submit(self._run_loop())
+
+    def _url(self) -> str:
+        return f"ws://{self.ip}:{self.port}"
+
+    def _set_state(self, state: str):
+        """Durum makinesini günceller ve değişikliği bildirir"""
+        if state == self.state:
+            return
+        self.state = state
+        self.connectionStateChanged.emit(state)
+
+    def _notify_sender(self):
+        """Kuyruğa komut eklendiğini gönderici göreve bildirir (her thread'den)"""
+        if self._net.in_loop():
+            self._outbox_ready.set()
+        else:
+            self._net.call_soon(self._outbox_ready.set)
+
+    async def _run_loop(self):
+        """
+        Bağlantı durum makinesi (ağ döngüsünde tek, kalıcı görev)
+        
+        CONNECTING → CONNECTED → (kopma) → BACKOFF → CONNECTING ...
+        """
+        self._loop_task = asyncio.current_task()
+        # Bağlantı koptuğunda da veri yaşı artmaya devam eder; izleme görev boyunca sürer
+        monitor = asyncio.create_task(self._stats_loop())
+        try:
+            while self._running:
+                self._wake.clear()
+                self._set_state(ConnectionState.CONNECTING)
+                self._clean_close = False
+                await self._connect_once()
+
+                if not self._running:
+                    break
+
+                delay = self._backoff.next_delay(self._clean_close)
+                self._set_state(ConnectionState.BACKOFF)
+                print(f"↻ {delay:.1f} saniye sonra yeniden bağlanılacak "
+                      f"({self._backoff.attempts}. deneme)")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            monitor.cancel()
+            self._loop_task = None
+            self._set_state(ConnectionState.STOPPED)
+
+    async def _stats_loop(self):
+        """İstatistik yayınlar (RTT keepalive pinginden gelir)"""
+        while True:
+            await asyncio.sleep(LINK_STATS_INTERVAL)
+            if self.receivers(self.linkStatsUpdated) > 0:
+                self.linkStatsUpdated.emit(self.get_link_stats())
+
+    async def _connect_once(self):
+        """Tek bağlantı denemesi: aç, mesajları oku, kapanınca dön"""
+        close_code, close_msg = None, ""
         try:
-            # ping_interval ve ping_timeout ile bağlantı sağlığını kontrol et
-            self.ws.run_forever(
-                ping_interval=5,
-                ping_timeout=3,
-                skip_utf8_validation=True  # Performans için
-            )
+            # Yerleşik sabit aralıklı ping yerine veri trafiğine dayalı canlılık kontrolü
+            async with websockets.connect(
+                self._url(),
+                open_timeout=5,
+                close_timeout=1,
+                **NO_BUILTIN_PING,
+                **client_options(self.compression)
+            ) as ws:
+                self.ws = ws
+                self.deflate_active = bool(ws.protocol.extensions)
+                self._on_open()
+                sender = asyncio.create_task(self._sender_loop(ws))
+                keepalive = asyncio.create_task(idle_keepalive(
+                    ws, self.link_stats.last_message_age,
+                    self.keepalive["idle"], self.keepalive["timeout"],
+                    on_rtt=self.link_stats.record_rtt))
+                try:
+                    while True:
+                        # Ham bytes alınır; str'ye çevirmeden doğrudan parse edilir
+                        self._on_message(await ws.recv(decode=False))
+                finally:
+                    sender.cancel()
+                    keepalive.cancel()
+                    close_code, close_msg = ws.close_code, ws.close_reason
+        except ConnectionClosed as e:
+            close_code = e.rcvd.code if e.rcvd else None
+            close_msg = e.rcvd.reason if e.rcvd else ""
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"WebSocket run_forever hatası: {e}")
-            self.errorOccurred.emit(f"Bağlantı hatası: {str(e)}")
+            self._on_error(e)
+        finally:
+            self.ws = None
+            self._on_close(close_code, close_msg)
+
+    async def _sender_loop(self, ws):
+        """Kuyruktaki hazır komutları toplu halde sokete yazar"""
+        while True:
+            self._outbox_ready.clear()
+            batch, wait = self.outbox.take_ready()
+            for payload in batch:
+                cid = payload.get("cid", "")
+                self.tracker.mark_sent(cid)
+                if not await self._send_payload(ws, payload):
+                    self._park_unsent(payload)
+            if batch:
+                continue
+            try:
+                await asyncio.wait_for(self._outbox_ready.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
 
-    def _on_open(self, ws):
+    def _on_open(self):
         """Bağlantı başarıyla açıldığında"""
         with self._lock:
             self.connected = True
         
+        self._backoff.reset()
+        self._set_state(ConnectionState.CONNECTED)
         self.connectionChanged.emit(True)
         self.messageToUI.emit(f"ESP32'ye bağlandı ({self.ip}:{self.port})")
         print(f"✓ WebSocket bağlantısı açıldı: {self.ip}:{self.port}")
+        
+        # Kopma sırasında kaçırılan durumu hemen iste
+        self.send_command({"action": "get_status"})
+        
+        # Bağlantı yokken saklanan komutları sırayla gönder
+        buffered = self.offline.pop_all()
+        if buffered:
+            print(f"📤 Bekleyen {len(buffered)} komut yeniden gönderiliyor")
+            self.messageToUI.emit(f"Bağlantı yokken verilen {len(buffered)} komut gönderiliyor")
+        for entry in buffered:
+            self.send_tracked(entry.payload, durable=True,
+                              origin=(entry.created, entry.expires))
 
-    def _on_message(self, ws, message):
+    def _on_message(self, message: bytes):
         """Mesaj alındığında"""
+        self.link_stats.record_inbound(len(message))
+        try:
+            # JSON olarak parse et ve doğrula (bytes doğrudan kabul edilir)
+            data = codec.loads(message)
+        except codec.DecodeError as e:
+            print(f"Geçersiz JSON alındı: {message[:100]!r}... Hata: {e}")
+            self.errorOccurred.emit("Geçersiz veri formatı alındı")
+            return
+
         try:
-            # Bytes'ı string'e çevir
-            if isinstance(message, bytes):
-                message = message.decode('utf-8')
+            # Kümes bazında son güncelleme zamanı
+            if isinstance(data, dict) and isinstance(data.get("kumesler"), list):
+                self.link_stats.touch_kumes(
+                    k["id"] for k in data["kumesler"] if isinstance(k, dict) and "id" in k)
 
-            # JSON olarak parse et ve doğrula
-            data = json.loads(message)
+            # Bekleyen komutların ack / durum eşleşmesi
+            if isinstance(data, dict):
+                self.tracker.match(data)
 
             # Session manager'a yönlendir
             if hasattr(self, 'session_manager') and self.session_manager:
                 self.session_manager.handle_message(data)
 
-            self.dataReceived.emit(message)
-        except json.JSONDecodeError as e:
-            print(f"Geçersiz JSON alındı: {message[:100]}... Hata: {e}")
-            self.errorOccurred.emit(f"Geçersiz veri formatı alındı")
+            self.frameReceived.emit(data)
+            # Ham metin yalnızca dinleyen varsa üretilir
+            if self.receivers(self.dataReceived) > 0:
+                self.dataReceived.emit(message.decode("utf-8"))
         except Exception as e:
             print(f"Mesaj işleme hatası: {e}")
 
-    def _on_error(self, ws, error):
+    def _on_error(self, error):
         """Hata oluştuğunda"""
         error_msg = str(error)
         self.errorOccurred.emit(error_msg)
         print(f"❌ WebSocket Hatası: {error_msg}")
 
-    def _on_close(self, ws, close_status_code, close_msg):
-        """Bağlantı kapandığında"""
+    def _on_close(self, close_status_code, close_msg):
+        """Bağlantı kapandığında (yeniden bağlanmayı durum makinesi yapar)"""
         with self._lock:
             was_connected = self.connected
             self.connected = False
         
+        # Karşı taraf temiz kapattıysa hemen tekrar denenebilir
+        self._clean_close = close_status_code in (1000, 1001)
+        
+        # Henüz gönderilmemiş komutlar: dayanıklı olanlar diske, diğerleri iptal
+        for payload in self.outbox.clear():
+            self._park_unsent(payload)
+        
         if was_connected:
             self.connectionChanged.emit(False)
         
         reason = close_msg or "Bilinmeyen sebep"
         print(f"⚠ Bağlantı kapandı: {reason} (Kod: {close_status_code})")
+
+    def send_command(self, command: Union[Command, str, dict], durable: Optional[bool] = None) -> bool:
+        """
+        ESP32'ye komut gönderir
         
-        # Otomatik yeniden bağlanma
-        if self._running:
-            print("4 saniye sonra yeniden bağlanılacak...")
-            self._schedule_reconnect(4.0)
-
-    def _schedule_reconnect(self, delay_seconds: float):
-        """Belirli bir süre sonra yeniden bağlanmayı planlar"""
-        # Threading.Timer yerine QTimer kullan (Qt thread-safe)
-        if self._reconnect_timer:
-            self._reconnect_timer.stop()
+        Komut bir korelasyon kimliği (`cid`) ile etiketlenir, onay takibine
+        alınır ve giden kuyruğa bırakılır; çağrı beklemeden döner. Sonuç
+        `commandCompleted` sinyaliyle bildirilir. Bağlantı yokken dayanıklı
+        komutlar diske yazılır ve yeniden bağlanınca gönderilir.
         
-        self._reconnect_timer = QTimer()
-        self._reconnect_timer.setSingleShot(True)
-        self._reconnect_timer.timeout.connect(self._attempt_reconnect)
-        self._reconnect_timer.start(int(delay_seconds * 1000))
-
-    def _attempt_reconnect(self):
-        """Yeniden bağlanma girişimi"""
-        if self._running and not self.connected:
-            print("Yeniden bağlanma deneniyor...")
-            self.connect()
-
-    def send_command(self, command: str) -> bool:
+        Args:
+            command: Gönderilecek komut (JSON string, dict veya eski format)
+            durable: Bağlantı yokken saklansın mı (None: DURABLE_ACTIONS'a göre)
+            
+        Returns:
+            bool: Gönderim kuyruğuna veya bekleyen kuyruğa alındıysa True
         """
-        ESP32'ye komut gönderir
+        if not self.is_connected():
+            return self._buffer_offline(command, durable)
+        return self.send_tracked(command, durable) is not None
+
+    def send_tracked(self, command: Union[Command, str, dict], durable: Optional[bool] = None,
+                     origin: Optional[Tuple[float, float]] = None) -> Optional[Future]:
+        """
+        Komutu gönderir ve sonucunu bekleyen bir Future döndürür
         
         Args:
-            command: Gönderilecek komut (JSON string veya eski format)
+            command: Gönderilecek komut (JSON string, dict veya eski format)
+            durable: Gönderilemezse diske yazılsın mı (None: DURABLE_ACTIONS'a göre)
+            origin: Bekleyen kuyruktan gelen komutun ilk (olusturma, son_gecerlilik)
+                zamanları; tekrar saklanırsa süresi uzamaz
             
         Returns:
-            bool: Başarılı ise True
+            Future: CommandResult ile tamamlanır, kuyruğa alınamadıysa None
         """
         with self._lock:
             if not self.connected or not self.ws:
                 print("Bağlantı yok! Komut gönderilemedi.")
-                return False
+                return None
 
-        try:
-            # Önce JSON olup olmadığını kontrol et
+        payload = self._to_payload(command)
+        if payload is None:
+            return None
+
+        payload["cid"] = self.tracker.new_cid()
+        key = actuator_key(payload)
+        if self._is_durable(payload, durable):
+            self._durable_cids[payload["cid"]] = origin
+
+        # Aynı aktüatöre ait eski komutlar artık geçersiz (son gelen kazanır)
+        self.tracker.supersede(key)
+        future = self.tracker.register(payload, key)
+        self.outbox.put(key, payload)
+        return future
+
+    def _is_durable(self, payload: dict, durable: Optional[bool]) -> bool:
+        if durable is None:
+            return payload.get("action") in DURABLE_ACTIONS
+        return durable
+
+    def _buffer_offline(self, command: Union[Command, str, dict], durable: Optional[bool]) -> bool:
+        """Bağlantı yokken dayanıklı komutu diske yazar"""
+        payload = self._to_payload(command)
+        if payload is None:
+            return False
+        if not self._is_durable(payload, durable):
+            print("Bağlantı yok! Komut gönderilemedi.")
+            return False
+
+        self.offline.push(payload)
+        print(f"📥 Bağlantı yok, komut bekleyen kuyruğa alındı: {payload}")
+        self.messageToUI.emit("Bağlantı yok - komut bağlantı gelince gönderilecek")
+        return True
+
+    def _park_unsent(self, payload: dict):
+        """Sokete yazılamayan komutu diske alır ya da iptal eder"""
+        cid = payload.get("cid", "")
+        if cid in self._durable_cids:
+            self._store_offline(payload)
+            self.tracker.cancel(cid, "Bağlantı koptu, bekleyen kuyruğa alındı")
+        else:
+            self.tracker.cancel(cid, "Gönderilemedi")
+
+    def _store_offline(self, payload: dict):
+        """Dayanıklı komutu diske yazar; kuyruktan geldiyse ilk süresi korunur"""
+        origin = self._durable_cids.get(payload.get("cid"))
+        if origin is None:
+            self.offline.push(payload)
+        else:
+            created, expires = origin
+            self.offline.push(payload, created=created, expires=expires)
+
+    def _to_payload(self, command: Union[Command, str, dict]) -> Optional[dict]:
+        """Komutu gönderilebilir sözlüğe çevirir (her komut en fazla bir kez parse edilir)"""
+        if isinstance(command, Command):
+            return command.payload()
+        if isinstance(command, dict):
+            return dict(command)
+
+        text = command.strip()
+        if text.startswith("{"):
             try:
-                json.loads(command)  # Validate JSON
-                is_json = True
-            except json.JSONDecodeError:
-                is_json = False
-            
-            # JSON ise direkt gönder
-            if is_json:
-                self.ws.send(command)
-                print(f"→ JSON Komut gönderildi: {command[:100]}...")
-                return True
-            
-            # Eski format ise JSON'a çevir
-            else:
-                print(f"⚠️ ESKİ FORMAT ALGILANDI: {command}")
-                converted = self._convert_old_command(command)
-                if converted:
-                    json_str = json.dumps(converted)
-                    self.ws.send(json_str)
-                    print(f"→ Dönüştürüldü ve gönderildi: {json_str}")
-                    return True
-                else:
-                    print(f"❌ Bilinmeyen komut formatı: {command}")
-                    return False
-            
+                data = codec.loads(text)
+                if isinstance(data, dict):
+                    return data
+            except codec.DecodeError:
+                pass
+            print(f"❌ Geçersiz JSON komut: {text[:100]}")
+            return None
+
+        # Eski format (FAN1:1, POMPA:0 ...) - çeviri önbellekli, uyarı her seferinde
+        print(f"⚠️ ESKİ FORMAT ALGILANDI: {text}")
+        converted = parse_legacy(text)
+        if converted is None:
+            print(f"❌ Bilinmeyen komut formatı: {command}")
+            return None
+        return converted.payload()
+
+    async def _send_payload(self, ws, payload: dict) -> bool:
+        """Sözlüğü JSON olarak soket üzerinden gönderir"""
+        try:
+            data = encode_payload(payload)
+            await ws.send(data, text=True)
+            self.link_stats.record_outbound(len(data))
+            print(f"→ JSON Komut gönderildi: {data[:100].decode('utf-8', 'replace')}")
+            return True
         except Exception as e:
             self.errorOccurred.emit(f"Komut gönderilemedi: {str(e)}")
             print(f"❌ Komut gönderme hatası: {e}")
             return False
-    
-    def _convert_old_command(self, command: str) -> dict:
-        """
-        Eski format komutları yeni JSON formatına çevirir
-        
-        Eski → Yeni:
-        FAN1:1 → {"action": "fan_on", "kumes": 1}
-        FAN1:0 → {"action": "fan_off", "kumes": 1}
-        LED:1 → {"action": "led_on"}
-        LED:0 → {"action": "led_off"}
-        STATUS → {"action": "get_status"}
+
+    def _resend_payload(self, payload: dict) -> bool:
+        """Onay süresi dolan komutu (aynı cid ile) tekrar kuyruğa alır"""
+        with self._lock:
+            if not self.connected or not self.ws:
+                if payload.get("cid") in self._durable_cids:
+                    self._store_offline(payload)
+                return False
+        self.outbox.put(actuator_key(payload), payload)
+        return True
+
+    def submit(self, message: Union[str, dict]) -> Future:
         """
-        command = command.strip().upper()
-        
-        # STATUS komutu
-        if command == "STATUS":
-            return {"action": "get_status"}
-       
-        if command.startswith("AUTO:"):
-            state = command.endswith("1")
-            return {
-                "action": "set_auto_mode",
-                "value": state
-            }
-        # FAN komutları (FAN1:1, FAN2:0, vb.)
-        if command.startswith("FAN"):
-            parts = command.split(":")
-            if len(parts) == 2:
-                fan_num = int(parts[0][3:])  # FAN1 -> 1
-                state = parts[1] == "1"
-                return {
-                    "action": "fan_on" if state else "fan_off",
-                    "kumes": fan_num
-                }
-        if command.startswith("YEM:"):
-            parts = command.split(":")
-            if len(parts) == 2:
-                try:
-                    miktar = int(parts[1])
-                    return {
-                        "action": "yem_ver",
-                        "miktar": miktar
-                    }
-                except ValueError:
-                    return None
-        if command.startswith("KAPI:"):
-            parts = command.split(":")
-            if len(parts) == 2:
-                try:
-                    derece = int(parts[1])
-                    return {
-                        "action": "kapi_kontrol",
-                        "derece": derece
-                    }
-                except ValueError:
-                    return None
-                
-        # LED komutları (LED:1, LED:0)
-        if command.startswith("LED:"):
-            state = command.endswith("1")
-            return {"action": "led_on" if state else "led_off"}
+        Mesajı takip ve birleştirme olmadan doğrudan gönderir (her thread'den)
         
-        # POMPA komutları
-        if command.startswith("POMPA:"):
-            state = command.endswith("1")
-            return {"action": "pump_on" if state else "pump_off"}
+        Oturum açma gibi cihaz komutu olmayan mesajlar içindir.
         
-        return None  # Bilinmeyen komut
+        Returns:
+            Future: Mesaj sokete yazıldıysa True ile tamamlanır
+        """
+        data = message.encode("utf-8") if isinstance(message, str) else codec.dumpb(message)
+        return self._net.submit(self._send_raw(data))
 
+    async def _send_raw(self, data: bytes) -> bool:
+        ws = self.ws
+        if ws is None:
+            print("Bağlantı yok! Mesaj gönderilemedi.")
+            return False
+        try:
+            await ws.send(data, text=True)
+            self.link_stats.record_outbound(len(data))
+            return True
+        except Exception as e:
+            print(f"❌ Mesaj gönderme hatası: {e}")
+            return False
+
+    def _on_command_completed(self, result: CommandResult):
+        """Komut sonucunu loglar"""
+        if result.success:
+            print(f"✓ Komut onaylandı [{result.cid}] {result.action} "
+                  f"({result.reason}, {result.rtt_ms:.0f} ms, {result.attempts}. deneme)")
+        else:
+            print(f"❌ Komut başarısız [{result.cid}] {result.action}: "
+                  f"{result.reason} {result.message}")
+    
     def send_json(self, data: dict) -> bool:
         """
         Dictionary'yi JSON'a çevirip gönderir
@@ -276,73 +495,125 @@ class WebSocketBridge(QObject):
         Returns:
             bool: Başarılı ise True
         """
+        return self.send_command(data)
+
+    def disconnect(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Bağlantıyı tamamen durdurur ve en fazla `timeout` saniye bekler
+        
+        Süre dolarsa görev ağ döngüsünde kapanmaya devam eder; çağıran
+        (uygulama kapanışı) bekletilmez.
+        """
+        print("Bağlantı kapatılıyor...")
         try:
-            json_str = json.dumps(data)
-            return self.send_command(json_str)
+            self.disconnect_async().result(timeout=timeout)
+            print("✓ Bağlantı kapatıldı")
+        except FutureTimeout:
+            print(f"⚠ Bağlantı {timeout:.1f} sn içinde kapanmadı, arka planda kapanıyor")
         except Exception as e:
-            self.errorOccurred.emit(f"JSON dönüştürme hatası: {str(e)}")
-            return False
+            print(f"WebSocket kapatma hatası: {e}")
 
-    def disconnect(self):
-        """Bağlantıyı tamamen durdurur"""
-        print("Bağlantı kapatılıyor...")
+    def disconnect_async(self) -> Future:
+        """
+        Bağlantıyı beklemeden durdurur (UI thread'ini bloklamaz)
         
+        Returns:
+            Future: Görev durunca tamamlanır; ayrıca `disconnected` yayılır
+        """
+        self._halt()
+        return self._net.submit(self._shutdown())
+
+    def _halt(self):
+        """Yeniden bağlanmayı kapatır, bekleyen komutları saklar / iptal eder"""
         with self._lock:
             self._running = False
         
-        # Yeniden bağlanma timer'ını durdur
-        if self._reconnect_timer:
-            self._reconnect_timer.stop()
-            self._reconnect_timer = None
-        
-        # WebSocket'i kapat
-        if self.ws:
-            try:
-                self.ws.close()
-            except Exception as e:
-                print(f"WebSocket kapatma hatası: {e}")
-        
-        # Thread'in bitmesini bekle
-        if self._connection_thread and self._connection_thread.is_alive():
-            self._connection_thread.join(timeout=2.0)
-        
+        # Kuyruktaki dayanıklı komutları sakla, diğerlerini ve onay bekleyenleri iptal et
+        for payload in self.outbox.clear():
+            self._park_unsent(payload)
+        self.tracker.cancel_all("Bağlantı kapatıldı")
+
+    async def _shutdown(self):
+        """Bağlantı görevini durdurur (ağ döngüsünde)"""
+        await self._stop_task()
         with self._lock:
             self.connected = False
-        
-        print("✓ Bağlantı kapatıldı")
+        self.disconnected.emit()
 
-    def update_ip(self, new_ip: str, new_port: Optional[int] = None):
+    async def _stop_task(self):
+        """Bağlantı görevini iptal eder ve soketin kapanmasını bekler (ağ döngüsünde)"""
+        task = self._loop_task
+        if task and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def update_ip(self, new_ip: str, new_port: Optional[int] = None) -> Future:
         """
         IP (ve opsiyonel port) değiştiğinde bağlantıyı yeniden başlatır
         
+        Kapatma ve yeniden bağlanma ağ döngüsünde yapılır; çağrı hemen
+        döner. Eski soket kapanıp yeni adrese bağlanma başladığında
+        `addressChanged` yayılır.
+        
         Args:
             new_ip: Yeni IP adresi
             new_port: Yeni port (opsiyonel)
+            
+        Returns:
+            Future: Yeni bağlantı görevi başlayınca tamamlanır
         """
         print(f"IP Güncelleniyor: {new_ip}" + (f":{new_port}" if new_port else ""))
+        self._halt()
+        return self._net.submit(self._switch_address(new_ip, new_port))
+
+    def reconnect(self) -> Future:
+        """
+        Aynı adrese yeniden bağlanır (cevap vermeyen bağlantı için)
         
-        # Önce mevcut bağlantıyı kapat
-        self.disconnect()
-        
-        # Kısa bekleme (Socket'in temiz kapanması için)
-        time.sleep(0.5)
-        
-        # Yeni ayarları uygula
-        self.ip = new_ip
-        if new_port is not None:
-            self.port = new_port
+        Çağrı beklemeden döner; `addressChanged` yayılmaz.
+        """
+        print(f"🔄 Yeniden bağlanılıyor: {self._url()}")
+        self._halt()
+        return self._net.submit(self._switch_address(self.ip, None, announce=False))
+
+    async def _switch_address(self, new_ip: str, new_port: Optional[int], announce: bool = True):
+        """Eski bağlantıyı kapatır, yeni adresle bağlantı görevini başlatır (ağ döngüsünde)"""
+        await self._stop_task()
         
-        # Yeniden bağlan
         with self._lock:
+            self.connected = False
+            self.ip = new_ip
+            if new_port is not None:
+                self.port = new_port
             self._running = True
         
-        self.connect()
+        # Yeni adreste eski geri çekilme süresi uygulanmaz
+        self._backoff.reset()
+        self.link_stats.reset()
+        self._task = self._net.submit(self._run_loop())
+        if announce:
+            print(f"✓ Yeni adrese bağlanılıyor: {self._url()}")
+            self.addressChanged.emit(self.ip, self.port)
 
     def is_connected(self) -> bool:
         """Bağlantı durumunu döndürür"""
         with self._lock:
             return self.connected
 
+    def get_compression_stats(self) -> dict:
+        """permessage-deflate oranı ve CPU süresi (giden / gelen)"""
+        return self.compression.snapshot()
+
+    def get_link_stats(self) -> dict:
+        """
+        Bağlantı kalitesi: ping RTT (son/min/ort/maks/p95 + histogram), jitter,
+        saniyedeki bayt/mesaj ve kümes başına son güncelleme yaşı
+        """
+        stats = self.link_stats.snapshot()
+        stats["connected"] = self.is_connected()
+        stats["state"] = self.state
+        return stats
+
     def get_connection_info(self) -> dict:
         """Bağlantı bilgilerini döndürür"""
         with self._lock:
@@ -350,5 +621,11 @@ class WebSocketBridge(QObject):
                 "ip": self.ip,
                 "port": self.port,
                 "connected": self.connected,
-                "running": self._running
+                "running": self._running,
+                "state": self.state,
+                "reconnect_attempts": self._backoff.attempts,
+                "deflate": self.deflate_active,
+                "keepalive": dict(self.keepalive),
+                "compression": self.compression.snapshot(),
+                "link": self.link_stats.snapshot()
             }
\ No newline at end of file
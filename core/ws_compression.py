@@ -0,0 +1,206 @@
+# core/ws_compression.py
+"""
+WebSocket permessage-deflate ayarları ve ölçümü
+
+Telemetri çerçeveleri çok tekrarlı metin olduğu için deflate ile ciddi
+oranda küçülür; karşılığında sıkıştırma/açma CPU süresi harcanır. Bu modül
+ayarları (context takeover, pencere boyutu, seviye) tek yerden uygular ve
+her bağlantı için oran + CPU istatistiği tutar. Böylece her link için
+darboğazın bant genişliği mi (mobil veri üzerinden PWA) yoksa CPU mu
+(yerel ağdaki ESP32) olduğuna karar verilebilir.
+"""
+import threading
+import time
+import zlib
+from typing import Optional
+
+from websockets.extensions.base import Extension
+from websockets.extensions.permessage_deflate import (
+    ClientPerMessageDeflateFactory, ServerPerMessageDeflateFactory
+)
+
+from .config import WS_DEFLATE
+
+
+class CompressionStats:
+    """Bir bağlantının (veya sunucunun) sıkıştırma istatistikleri"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.raw_out = self.wire_out = 0
+            self.raw_in = self.wire_in = 0
+            self.cpu_out = self.cpu_in = 0.0   # saniye (thread CPU süresi)
+            self.frames_out = self.frames_in = 0
+
+    def add_out(self, raw: int, wire: int, cpu: float):
+        with self._lock:
+            self.raw_out += raw
+            self.wire_out += wire
+            self.cpu_out += cpu
+            self.frames_out += 1
+
+    def add_in(self, raw: int, wire: int, cpu: float):
+        with self._lock:
+            self.raw_in += raw
+            self.wire_in += wire
+            self.cpu_in += cpu
+            self.frames_in += 1
+
+    def snapshot(self) -> dict:
+        """
+        Anlık istatistikler
+
+        ratio: sıkıştırılmış / ham (küçük = iyi), cpu_us_per_kb: ham KB başına
+        harcanan CPU süresi (mikro saniye)
+        """
+        with self._lock:
+            return {
+                "out": _direction(self.raw_out, self.wire_out, self.cpu_out, self.frames_out),
+                "in": _direction(self.raw_in, self.wire_in, self.cpu_in, self.frames_in),
+            }
+
+    def summary(self) -> str:
+        """Log satırı için kısa özet"""
+        snap = self.snapshot()
+        parts = []
+        for label, d in (("giden", snap["out"]), ("gelen", snap["in"])):
+            if d["frames"]:
+                parts.append(f"{label} %{d['ratio'] * 100:.0f} "
+                             f"({d['raw_bytes'] / 1024:.1f}→{d['wire_bytes'] / 1024:.1f} KB, "
+                             f"{d['cpu_ms']:.1f} ms CPU)")
+        return ", ".join(parts) if parts else "veri yok"
+
+
+def _direction(raw: int, wire: int, cpu: float, frames: int) -> dict:
+    return {
+        "frames": frames,
+        "raw_bytes": raw,
+        "wire_bytes": wire,
+        "ratio": (wire / raw) if raw else 1.0,
+        "saved_bytes": raw - wire,
+        "cpu_ms": cpu * 1000,
+        "cpu_us_per_kb": (cpu * 1e6 / (raw / 1024)) if raw else 0.0,
+    }
+
+
+class MeteredExtension(Extension):
+    """permessage-deflate uzantısını saran, bayt ve CPU süresini ölçen katman"""
+
+    def __init__(self, inner: Extension, stats: CompressionStats):
+        self.inner = inner
+        self.name = inner.name
+        self.stats = stats
+
+    def decode(self, frame, *, max_size: Optional[int] = None):
+        start = time.thread_time()
+        result = self.inner.decode(frame, max_size=max_size)
+        if frame.opcode.value <= 2:  # Kontrol çerçeveleri (ping/pong) sayılmaz
+            self.stats.add_in(len(result.data), len(frame.data), time.thread_time() - start)
+        return result
+
+    def encode(self, frame):
+        start = time.thread_time()
+        result = self.inner.encode(frame)
+        if frame.opcode.value <= 2:
+            self.stats.add_out(len(frame.data), len(result.data), time.thread_time() - start)
+        return result
+
+    def __repr__(self):
+        return f"MeteredExtension({self.inner!r})"
+
+
+class _MeteredClientFactory(ClientPerMessageDeflateFactory):
+    def __init__(self, stats: CompressionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def process_response_params(self, params, accepted_extensions):
+        extension = super().process_response_params(params, accepted_extensions)
+        return MeteredExtension(extension, self.stats)
+
+
+class _MeteredServerFactory(ServerPerMessageDeflateFactory):
+    def __init__(self, stats: CompressionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def process_request_params(self, params, accepted_extensions):
+        response_params, extension = super().process_request_params(params, accepted_extensions)
+        return response_params, MeteredExtension(extension, self.stats)
+
+
+def _compress_settings(settings: dict) -> dict:
+    return {"level": settings.get("level", 6), "memLevel": settings.get("mem_level", 5)}
+
+
+def client_options(stats: Optional[CompressionStats] = None, settings: Optional[dict] = None) -> dict:
+    """
+    `websockets.connect` için sıkıştırma parametreleri
+
+    Kullanım: websockets.connect(url, **client_options(stats))
+    """
+    settings = dict(WS_DEFLATE, **(settings or {}))
+    if not settings.get("enabled", True):
+        return {"compression": None}
+    factory = _MeteredClientFactory(
+        stats or CompressionStats(),
+        server_no_context_takeover=settings.get("server_no_context_takeover", False),
+        client_no_context_takeover=settings.get("client_no_context_takeover", False),
+        server_max_window_bits=settings.get("server_max_window_bits"),
+        client_max_window_bits=settings.get("client_max_window_bits") or True,
+        compress_settings=_compress_settings(settings),
+    )
+    return {"compression": None, "extensions": [factory]}
+
+
+def server_options(stats: Optional[CompressionStats] = None, settings: Optional[dict] = None) -> dict:
+    """
+    `websockets.serve` için sıkıştırma parametreleri
+
+    Kullanım: websockets.serve(handler, host, port, **server_options(stats))
+    """
+    settings = dict(WS_DEFLATE, **(settings or {}))
+    if not settings.get("enabled", True):
+        return {"compression": None}
+    factory = _MeteredServerFactory(
+        stats or CompressionStats(),
+        server_no_context_takeover=settings.get("server_no_context_takeover", False),
+        client_no_context_takeover=settings.get("client_no_context_takeover", False),
+        server_max_window_bits=settings.get("server_max_window_bits"),
+        client_max_window_bits=settings.get("client_max_window_bits"),
+        compress_settings=_compress_settings(settings),
+    )
+    return {"compression": None, "extensions": [factory]}
+
+
+class DeflateEstimator:
+    """
+    Sıkıştırmayı kendisi yönetmeyen sunucular (flask-sock) için tahmini ölçüm
+
+    Tek bir deflate akışıyla (context takeover açık) her çerçevenin kaç
+    bayta ineceğini ve CPU maliyetini hesaplar; gönderilen veriyi değiştirmez.
+    """
+
+    def __init__(self, stats: Optional[CompressionStats] = None, settings: Optional[dict] = None):
+        settings = dict(WS_DEFLATE, **(settings or {}))
+        self.stats = stats or CompressionStats()
+        self.no_context_takeover = settings.get("server_no_context_takeover", False)
+        self._level = settings.get("level", 6)
+        self._wbits = settings.get("server_max_window_bits") or 15
+        self._mem_level = settings.get("mem_level", 5)
+        self._compressor = self._new_compressor()
+
+    def _new_compressor(self):
+        return zlib.compressobj(self._level, zlib.DEFLATED, -self._wbits, self._mem_level)
+
+    def measure(self, data: bytes):
+        """Çerçevenin sıkıştırılmış boyutunu istatistiğe ekler"""
+        start = time.thread_time()
+        if self.no_context_takeover:
+            self._compressor = self._new_compressor()
+        wire = len(self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+        self.stats.add_out(len(data), wire, time.thread_time() - start)
@@ -0,0 +1,220 @@
+# data/frame_worker.py
+"""
+Çerçeve çözme ve fark (diff) iş parçacığı
+
+Gelen durum çerçeveleri GUI iş parçacığı yerine bir QThread'de çözülür;
+ortalamalar, çalışma süresi metni ve alarm adayları orada hesaplanır. Her
+çerçeve bir öncekiyle karşılaştırılır ve GUI'ye yalnızca değişen kısım
+(FrameChanges) gönderilir; ana iş parçacığı sadece widget'ları günceller.
+Kaydedici verilirse kümes örnekleri de burada, seyreltilerek veritabanına
+yazılır.
+
+    worker = FrameWorker(recorder=SensorRecorder(db))
+    ws.frameReceived.connect(worker.submit, Qt.ConnectionType.DirectConnection)
+    worker.changesReady.connect(apply_changes)
+    worker.start()
+"""
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core import codec
+from data.sensor_recorder import SensorRecorder
+
+# Sistem satırları (yem, pompa, çalışma süresi)
+SYSTEM_KEYS = ('yem', 'pompa', 'zaman')
+
+
+def format_uptime(seconds: int) -> str:
+    """Saniye → SS:DD:ss"""
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def _average(values: list) -> Optional[float]:
+    """Gösterilen hassasiyette (0.1) ortalama; sayı yoksa None"""
+    numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+    if not numbers:
+        return None
+    return round(sum(numbers) / len(numbers), 1)
+
+
+@dataclass
+class FrameChanges:
+    """Bir çerçevenin öncekine göre değişen kısmı (boşsa gönderilmez)"""
+    kumesler: Dict[int, dict] = field(default_factory=dict)      # Değişen kümesler (son hali)
+    detail: Optional[dict] = None                                # İzlenen kümesin örneği (her çerçeve)
+    averages: Dict[str, float] = field(default_factory=dict)     # 'temp' / 'hum' - değişenler
+    system: Dict[str, object] = field(default_factory=dict)      # SYSTEM_KEYS; 'zaman' biçimlenmiş metin
+    alarms: List[Tuple[int, str]] = field(default_factory=list)  # Yeni alarm adayları (kümes, mesaj)
+
+    def __bool__(self) -> bool:
+        return bool(self.kumesler or self.detail is not None or self.averages
+                    or self.system or self.alarms)
+
+
+class FrameDiffer:
+    """
+    Son gönderilen durumu tutar ve yeni çerçeveden değişiklik kümesi çıkarır
+
+    Qt'den bağımsızdır; FrameWorker iş parçacığında çalışır.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Durumu unutur: sonraki çerçeve tamamen 'değişmiş' sayılır"""
+        self.kumesler: Dict[int, dict] = {}
+        self.averages: Dict[str, float] = {}
+        self.system: Dict[str, object] = {}
+        self.alarming: Dict[int, str] = {}   # Alarmı bildirilmiş kümes → mesaj
+        self.watched: Optional[int] = None   # Detayda açık kümes
+
+    def rearm(self, kumes_id: int):
+        """Kümesin alarmı tekrar bildirilebilir (kullanıcı temizledi)"""
+        self.alarming.pop(kumes_id, None)
+
+    def diff(self, data: dict) -> FrameChanges:
+        changes = FrameChanges()
+
+        kumesler = data.get('kumesler')
+        if isinstance(kumesler, list):
+            temps, hums = [], []
+            for kumes in kumesler:
+                kumes_id = kumes.get('id')
+                temps.append(kumes.get('sicaklik', 0))
+                hums.append(kumes.get('nem', 0))
+
+                if self.kumesler.get(kumes_id) != kumes:
+                    kumes = dict(kumes)  # Köprünün nesnesi paylaşılmaz
+                    self.kumesler[kumes_id] = kumes
+                    changes.kumesler[kumes_id] = kumes
+                if kumes_id == self.watched:
+                    changes.detail = self.kumesler[kumes_id]
+                self._check_alarm(kumes_id, kumes, changes)
+
+            for key, values in (('temp', temps), ('hum', hums)):
+                value = _average(values)
+                if value is not None and self.averages.get(key) != value:
+                    self.averages[key] = changes.averages[key] = value
+
+        for key in SYSTEM_KEYS:
+            if key not in data:
+                continue
+            value = data[key]
+            if key == 'zaman' and isinstance(value, int):
+                value = format_uptime(value)
+            if self.system.get(key) != value:
+                self.system[key] = changes.system[key] = value
+
+        return changes
+
+    def _check_alarm(self, kumes_id: int, kumes: dict, changes: FrameChanges):
+        """Alarm yalnızca başladığında ya da mesajı değiştiğinde aday olur"""
+        if kumes.get('alarm', False):
+            mesaj = kumes.get('mesaj', 'Alarm!')
+            if self.alarming.get(kumes_id) != mesaj:
+                self.alarming[kumes_id] = mesaj
+                changes.alarms.append((kumes_id, mesaj))
+        else:
+            self.alarming.pop(kumes_id, None)
+
+
+class FrameWorker(QThread):
+    """
+    Çerçeveleri sırayla işleyen iş parçacığı
+
+    `submit()` her iş parçacığından çağrılabilir (köprünün ağ iş parçacığından
+    DirectConnection ile); yalnızca kuyruğa ekler. Çalışmıyorken gelen
+    çerçeveler atılır.
+    """
+
+    changesReady = pyqtSignal(object)  # FrameChanges
+
+    def __init__(self, recorder: Optional[SensorRecorder] = None, parent=None):
+        super().__init__(parent)
+        self.differ = FrameDiffer()
+        self.recorder = recorder
+        self._cond = threading.Condition()
+        self._frames: Deque[object] = deque()
+        self._running = False
+        self.frames_in = 0      # İşlenen çerçeve
+        self.changes_out = 0    # GUI'ye giden değişiklik kümesi
+
+    # ------------------------------------------------------------------
+    # Her iş parçacığından
+    # ------------------------------------------------------------------
+    def submit(self, frame):
+        with self._cond:
+            if not self._running:
+                return
+            self._frames.append(frame)
+            self._cond.notify()
+
+    def set_watched(self, kumes_id: Optional[int]):
+        """Detayda açık kümes: örneği değişmese de her çerçevede gönderilir"""
+        with self._cond:
+            self.differ.watched = kumes_id
+
+    def rearm(self, kumes_id: int):
+        with self._cond:
+            self.differ.rearm(kumes_id)
+
+    def reset(self):
+        """Arayüz yeniden kurulunca: sonraki çerçeve tam durum olarak gider"""
+        with self._cond:
+            self.differ.reset()
+
+    def start(self, *args):
+        with self._cond:
+            self._running = True
+        super().start(*args)
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._frames.clear()
+            self._cond.notify()
+        self.wait(2000)
+
+    # ------------------------------------------------------------------
+    # İş parçacığı
+    # ------------------------------------------------------------------
+    def run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._frames:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame = self._frames.popleft()
+
+            try:
+                data = codec.loads(frame) if isinstance(frame, (str, bytes)) else frame
+                if not isinstance(data, dict):
+                    continue
+                with self._cond:
+                    changes = self.differ.diff(data)
+            except codec.DecodeError as e:
+                print(f"❌ JSON parse hatası: {e}")
+                continue
+            except Exception as e:
+                print(f"❌ Veri işleme hatası: {e}")
+                continue
+
+            if self.recorder is not None:
+                try:
+                    self.recorder.record(data)
+                except Exception as e:
+                    print(f"❌ Sensör verisi kaydedilemedi: {e}")
+
+            self.frames_in += 1
+            if changes:
+                self.changes_out += 1
+                self.changesReady.emit(changes)
@@ -1,19 +1,48 @@
 # data/real_time_updater.py
-from PyQt6.QtCore import QObject, QTimer
+import time
+from typing import Callable, Dict, List, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from core.websocket_bridge import WebSocketBridge
+from core.commands import StatusCommand
+from core.config import WATCHDOG_STALE_PERIODS, WATCHDOG_MIN_STALE, WATCHDOG_MAX_POLLS
 
 
 class RealTimeDataUpdater(QObject):
-    """Periyodik olarak ESP32'den durum verisi ister ve bağlantıyı kontrol eder"""
+    """
+    Veri bekçisi: cihaz ve kümes bazında son güncellemeyi izler
+
+    ESP32 durumu kendisi gönderdiği için normalde sorgu yapılmaz. Bir kaynak
+    beklenen aralığın WATCHDOG_STALE_PERIODS katı boyunca susarsa:
+
+    1. Yalnızca o cihaza / kümese `get_status` gönderilir
+    2. WATCHDOG_MAX_POLLS sorgu cevapsız kalırsa cihaza yeniden bağlanılır
+
+    Son güncelleme zamanları köprülerin `link_stats` ölçümünden okunur;
+    DevicePool ile her cihaz ayrı izlenir. Uygulamadaki tek bayat veri
+    tespiti budur: kümes karosunun bayat görünümü ve uyarı alarmı
+    `kumesStale` / `kumesRecovered` sinyallerine bağlanır. Cihaz tamamen
+    susarsa kümelerinin hepsi bayat sayılır.
+    """
+
+    deviceStale = pyqtSignal(str, float)   # (cihaz adı, yaş sn) - bayatlama başladı
+    kumesStale = pyqtSignal(int, float)    # (uygulama kümes no, yaş sn)
+    kumesRecovered = pyqtSignal(int)       # Bayat kümesten yeniden veri geldi
+    reconnectRequested = pyqtSignal(str)   # Cevap alınamayan cihaz yeniden bağlanıyor
 
     def __init__(self, ws_bridge: WebSocketBridge, interval_ms: int = 5000):
         super().__init__()
         self.ws = ws_bridge
         self.interval = interval_ms
+        self.expected_period = interval_ms / 1000  # Cihazın beklenen gönderim aralığı (sn)
         self.timer = QTimer()
         self.timer.timeout.connect(self._update)
         self._update_count = 0
 
+        self._polls: Dict[Tuple[str, int], int] = {}   # (cihaz, yerel kümes | 0) → cevapsız sorgu
+        self._stale: set = set()                       # Bildirilmiş bayat kaynaklar
+        self._connected_at: Dict[str, float] = {}      # Hiç veri gelmeyen bağlantılar için
+
     def start(self):
         """Güncellemeyi başlat"""
         print(f"📡 RealTimeDataUpdater başlatıldı (Her {self.interval/1000} saniyede)")
@@ -24,27 +53,103 @@ class RealTimeDataUpdater(QObject):
         print("⏹️ RealTimeDataUpdater durduruldu")
         self.timer.stop()
 
+    @property
+    def stale_after(self) -> float:
+        """Bir kaynağın bayat sayılacağı süre (sn)"""
+        return max(WATCHDOG_MIN_STALE, WATCHDOG_STALE_PERIODS * self.expected_period)
+
+    def _sources(self) -> List[Tuple[str, WebSocketBridge, Callable[[int], int]]]:
+        """İzlenecek (cihaz adı, köprü, yerel→uygulama kümes no) üçlüleri"""
+        bridges = getattr(self.ws, "bridges", None)
+        if bridges is None:
+            return [("esp32", self.ws, lambda kumes_id: kumes_id)]
+        return [(name, bridge, self.ws.endpoints[name].to_global)
+                for name, bridge in list(bridges.items())]
+
     def _update(self):
-        """
-        Timer tetiklendiğinde çalışır
-        
-        NOT: ESP32 simülatörü zaten otomatik veri gönderiyor (her 2 saniyede)
-        Bu yüzden ekstra durum sorgulama gerekmeyebilir.
-        """
-        if self.ws.is_connected():
-            # JSON formatında durum sorgula
-            # self.ws.send_json({"action": "get_status"})
-            # print(f"📊 Durum güncellemesi istendi ({self._update_count})")
-            
-            # ESP32 simülatörü zaten otomatik veri gönderiyor
-            # Bu satırı yorum satırı yapabilirsiniz
-            self._update_count += 1
-            
-            # Her 10 güncellemede bir log (spam önleme)
-            if self._update_count % 10 == 0:
-                print(f"✓ Bağlantı aktif ({self._update_count} güncelleme)")
-        else:
+        """Timer tetiklendiğinde bayat kaynakları kontrol eder"""
+        self._update_count += 1
+        now = time.monotonic()
+        any_connected = False
+
+        for name, bridge, to_global in self._sources():
+            if not bridge.is_connected():
+                self._connected_at.pop(name, None)
+                continue
+            any_connected = True
+            self._connected_at.setdefault(name, now)
+            self._check_device(name, bridge, to_global, now)
+
+        if not any_connected:
             print("⚠️ Bağlantı yok - güncelleme atlandı")
+        elif self._update_count % 10 == 0:
+            # Her 10 güncellemede bir log (spam önleme)
+            print(f"✓ Bağlantı aktif ({self._update_count} güncelleme)")
+
+    def _check_device(self, name: str, bridge: WebSocketBridge,
+                      to_global: Callable[[int], int], now: float):
+        stats = bridge.link_stats
+        last_age = stats.last_message_age(now)
+        device_age = last_age if last_age is not None else now - self._connected_at[name]
+        limit = self.stale_after
+
+        kumes_ages = stats.kumes_ages(now)
+
+        # Cihaz tamamen sustu: kümeleri bayat, tüm durumu iste, olmazsa yeniden bağlan
+        if device_age >= limit:
+            if self._mark_stale((name, 0)):
+                print(f"⏱ {name}: {device_age:.0f} sn'dir veri yok")
+                self.deviceStale.emit(name, device_age)
+            for local_id, age in kumes_ages.items():
+                if self._mark_stale((name, local_id)):
+                    self.kumesStale.emit(to_global(local_id), age)
+            self._poll(name, bridge, 0)
+            return
+        self._mark_fresh(name, 0)
+
+        # Cihaz konuşuyor ama bazı kümeler güncellenmiyor: yalnızca onları sor
+        for local_id, age in kumes_ages.items():
+            if age < limit:
+                if self._mark_fresh(name, local_id):
+                    print(f"✓ {name}: kümes {to_global(local_id)} verisi yeniden geliyor")
+                    self.kumesRecovered.emit(to_global(local_id))
+                continue
+            if self._mark_stale((name, local_id)):
+                print(f"⏱ {name}: kümes {to_global(local_id)} {age:.0f} sn'dir güncellenmiyor")
+                self.kumesStale.emit(to_global(local_id), age)
+            self._poll(name, bridge, local_id)
+
+    def _mark_stale(self, key: Tuple[str, int]) -> bool:
+        """Kaynağı bayat işaretler; ilk kez bayatladıysa True"""
+        if key in self._stale:
+            return False
+        self._stale.add(key)
+        return True
+
+    def _mark_fresh(self, name: str, local_id: int) -> bool:
+        """Kaynağı güncel işaretler; bayattı ise True"""
+        self._polls.pop((name, local_id), None)
+        if (name, local_id) not in self._stale:
+            return False
+        self._stale.discard((name, local_id))
+        return True
+
+    def _poll(self, name: str, bridge: WebSocketBridge, local_id: int):
+        """Bayat kaynağa hedefli get_status; cevapsız kalırsa yeniden bağlanır"""
+        key = (name, local_id)
+        count = self._polls.get(key, 0)
+        if count >= WATCHDOG_MAX_POLLS and local_id == 0:
+            print(f"🔄 {name}: {count} sorgu cevapsız, yeniden bağlanılıyor")
+            self._polls = {k: v for k, v in self._polls.items() if k[0] != name}
+            self._connected_at.pop(name, None)
+            self.reconnectRequested.emit(name)
+            bridge.reconnect()
+            return
+        if count >= WATCHDOG_MAX_POLLS:
+            return  # Cihaz konuşuyor; kümesi sormaya devam etmek anlamsız
+
+        self._polls[key] = count + 1
+        bridge.send_command(StatusCommand(kumes=local_id or None))
 
     def set_interval(self, interval_ms: int):
         """Güncelleme aralığını değiştir"""
@@ -53,4 +158,13 @@ class RealTimeDataUpdater(QObject):
         self.interval = interval_ms
         if was_active:
             self.timer.start(self.interval)
-            print(f"⏱️ Güncelleme aralığı değiştirildi: {interval_ms/1000} saniye")
\ No newline at end of file
+            print(f"⏱️ Güncelleme aralığı değiştirildi: {interval_ms/1000} saniye")
+
+    def set_expected_rate(self, hz: float):
+        """
+        Cihazın anlaşılan gönderim hızı (TelemetryRateController.rateChanged)
+
+        Bayat eşiği ve kontrol aralığı bu hıza göre ayarlanır.
+        """
+        self.expected_period = 1.0 / hz
+        self.set_interval(int(min(5000, max(1000, self.expected_period * 1000))))
@@ -0,0 +1,57 @@
+# data/ring_buffer.py
+import numpy as np
+from typing import Sequence
+
+
+class RingBuffer:
+    """
+    Önceden ayrılmış, sabit boyutlu NumPy halka tamponu (çok kanallı)
+
+    Her örnek tamponda iki kez (i ve i + kapasite) yazılır; böylece son
+    `count` örnek her zaman bitişik bir dilimdir ve `view()` kopya üretmeden
+    doğrudan pyqtgraph'a verilebilir. Ekleme ve okuma maliyeti pencere
+    boyutundan bağımsızdır.
+
+    Kullanım:
+        buf = RingBuffer(300, channels=3)      # zaman, sıcaklık, nem
+        buf.append((time.time(), 24.5, 55.0))
+        curve.setData(buf.view(0), buf.view(1))
+    """
+
+    def __init__(self, capacity: int, channels: int = 1, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("Kapasite en az 1 olmalı")
+        self.capacity = capacity
+        self.channels = channels
+        # Kanal başına bitişik satır: (kanal, 2 * kapasite)
+        self._data = np.full((channels, 2 * capacity), np.nan, dtype=dtype)
+        self._pos = 0     # Sıradaki yazma indeksi (0..kapasite-1)
+        self.count = 0    # Dolu örnek sayısı
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, values: Sequence[float]):
+        """Tek örnek ekler (kanal sayısı kadar değer, eksik ölçüm için NaN)"""
+        pos = self._pos
+        self._data[:, pos] = values
+        self._data[:, pos + self.capacity] = values
+        self._pos = (pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def view(self, channel: int = 0) -> np.ndarray:
+        """Kanalın en eskiden en yeniye bitişik görünümü (kopya değil, salt okunur kabul edin)"""
+        end = self._pos + self.capacity
+        return self._data[channel, end - self.count:end]
+
+    def last(self, channel: int = 0) -> float:
+        """Kanalın son değeri (boşsa NaN)"""
+        if not self.count:
+            return float("nan")
+        return float(self._data[channel, self._pos + self.capacity - 1])
+
+    def clear(self):
+        self._data.fill(np.nan)
+        self._pos = 0
+        self.count = 0
@@ -0,0 +1,49 @@
+# data/sensor_recorder.py
+"""
+Sensör geçmişi kaydı
+
+Durum çerçevelerindeki kümes örnekleri seyreltilerek veritabanına yazılır:
+kümes başına en fazla SENSOR_SAVE_INTERVAL saniyede bir satır. Geçmiş
+grafiği bu satırları ve dakikalık özet tablosunu okur. FrameWorker iş
+parçacığında çağrılır; GUI yazmayı beklemez.
+
+    recorder = SensorRecorder(db)
+    worker = FrameWorker(recorder=recorder)
+"""
+import time
+from typing import Dict, Optional
+
+from core.config import SENSOR_SAVE_INTERVAL
+
+
+class SensorRecorder:
+    """Çerçeveden kaydı gelmiş kümesleri seçip tek işlemde yazar"""
+
+    def __init__(self, db, interval: float = SENSOR_SAVE_INTERVAL):
+        self.db = db
+        self.interval = interval
+        self._last: Dict[int, float] = {}  # Kümes → son yazma (monotonic)
+        self.rows_written = 0
+
+    def record(self, data: dict, now: Optional[float] = None) -> int:
+        """Süresi gelen kümesleri yazar; yazılan satır sayısını döndürür"""
+        kumesler = data.get('kumesler')
+        if not isinstance(kumesler, list):
+            return 0
+        now = time.monotonic() if now is None else now
+
+        due = []
+        for kumes in kumesler:
+            kumes_id = kumes.get('id') if isinstance(kumes, dict) else None
+            if kumes_id is None:
+                continue
+            last = self._last.get(kumes_id)
+            if last is not None and now - last < self.interval:
+                continue
+            self._last[kumes_id] = now
+            due.append(kumes)
+
+        if due:
+            self.db.save_sensor_batch(due)
+            self.rows_written += len(due)
+        return len(due)
@@ -9,7 +9,9 @@
 
 import asyncio
 import websockets
-import json
+from core import codec
+from core.ws_compression import CompressionStats, server_options
+from core.keepalive import NO_BUILTIN_PING, idle_keepalive
 import random
 import time
 from datetime import datetime
@@ -22,6 +24,10 @@ import threading
 SERVER_IP = "127.0.0.1"  # localhost
 SERVER_PORT = 81
 UPDATE_INTERVAL = 2  # Saniye
+RATE_LIMITS_HZ = (0.1, 10.0)  # set_rate ile istenebilecek gönderim hızı aralığı
+# İstemciden bu kadar komut gelmezse ping atılır; pong KEEPALIVE_TIMEOUT'ta gelmezse kapatılır
+KEEPALIVE_IDLE = 30.0     # Saniye
+KEEPALIVE_TIMEOUT = 10.0  # Saniye
 AUTO_MODE = True  # Otomatik mod (False yaparsanız sadece manuel)
 
 # =============================================================================
@@ -78,6 +84,9 @@ state = {
 
 # Aktif bağlantılar
 connected_clients = set()
+
+# permessage-deflate istatistikleri (tüm istemciler, WS_DEFLATE ayarlarıyla)
+compression_stats = CompressionStats()
 simulation_running = True
 
 # =============================================================================
@@ -94,7 +103,7 @@ def process_command(cmd_str):
         Dict: Yanıt mesajı
     """
     try:
-        cmd = json.loads(cmd_str)
+        cmd = codec.loads(cmd_str)
         action = cmd.get("action")
         kumes_id = cmd.get("kumes")
         
@@ -184,6 +193,13 @@ def process_command(cmd_str):
                 k["mesaj"] = ""
             return {"status": "success", "message": "✅ Tüm alarmlar sıfırlandı"}
         
+        # =====================================================================
+        # TELEMETRİ HIZI (istemci görünürlüğüne göre)
+        # =====================================================================
+        elif action == "set_rate":
+            hz = min(max(float(cmd.get("hz", 1.0)), RATE_LIMITS_HZ[0]), RATE_LIMITS_HZ[1])
+            return {"status": "success", "message": f"📶 Gönderim hızı: {hz:g} Hz", "hz": hz}
+        
         elif action == "trigger_alarm":
             if kumes_id:
                 state["kumesler"][kumes_idx]["alarm"] = True
@@ -210,7 +226,7 @@ def process_command(cmd_str):
         
         return {"status": "error", "message": f"❌ Bilinmeyen aksiyon: {action}"}
         
-    except json.JSONDecodeError as e:
+    except codec.DecodeError as e:
         return {"status": "error", "message": f"JSON parse hatası: {str(e)}"}
     except Exception as e:
         return {"status": "error", "message": f"Komut hatası: {str(e)}"}
@@ -291,6 +307,14 @@ def simulate_sensor_changes():
 # =============================================================================
 # WEBSOCKET İŞLEYİCİ
 # =============================================================================
+def get_command_id(message) -> str:
+    """Komut içindeki korelasyon kimliğini (cid) döndürür, yoksa boş string"""
+    try:
+        cmd = codec.loads(message)
+    except (codec.DecodeError, TypeError):
+        return ""
+    return cmd.get("cid", "") if isinstance(cmd, dict) else ""
+
 async def handle_client(websocket):
     """Tek bir istemci bağlantısını yönetir"""
     client_id = f"{websocket.remote_address[0]}:{websocket.remote_address[1]}"
@@ -299,15 +323,27 @@ async def handle_client(websocket):
     connected_clients.add(websocket)
     print(f"   👥 Aktif bağlantı sayısı: {len(connected_clients)}")
     
+    # İstemcinin istediği gönderim aralığı (set_rate ile değişir)
+    interval = [UPDATE_INTERVAL]
+    rate_changed = asyncio.Event()
+    
     # Otomatik veri gönderme
     async def send_periodic_updates():
         """Belirli aralıklarla güncel veri gönderir"""
+        last_sim = 0.0
         try:
             while simulation_running:
-                if AUTO_MODE:
+                # Sensörler hızdan bağımsız olarak UPDATE_INTERVAL'da bir değişir
+                if AUTO_MODE and time.monotonic() - last_sim >= UPDATE_INTERVAL:
                     simulate_sensor_changes()
-                await websocket.send(json.dumps(state))
-                await asyncio.sleep(UPDATE_INTERVAL)
+                    last_sim = time.monotonic()
+                # Gönderim sürerken gelen set_rate kaybolmasın: önce temizle
+                rate_changed.clear()
+                await websocket.send(codec.dumpb(state), text=True)
+                try:
+                    await asyncio.wait_for(rate_changed.wait(), interval[0])
+                except asyncio.TimeoutError:
+                    pass
         except websockets.exceptions.ConnectionClosed:
             pass
         except Exception as e:
@@ -316,21 +352,35 @@ async def handle_client(websocket):
     # Arka planda veri gönder
     update_task = asyncio.create_task(send_periodic_updates())
     
+    # İstemci sessiz kaldığında canlılık kontrolü (sabit aralıklı ping yok)
+    last_rx = [time.monotonic()]
+    keepalive_task = asyncio.create_task(idle_keepalive(
+        websocket, lambda: time.monotonic() - last_rx[0], KEEPALIVE_IDLE, KEEPALIVE_TIMEOUT))
+    
     try:
         # İlk durumu gönder
-        await websocket.send(json.dumps(state))
+        await websocket.send(codec.dumpb(state), text=True)
         print(f"[{timestamp}] 📤 İlk durum gönderildi")
         
         # Komutları dinle
         async for message in websocket:
+            last_rx[0] = time.monotonic()
             timestamp = datetime.now().strftime("%H:%M:%S")
             print(f"\n[{timestamp}] 📥 KOMUT ALINDI:")
             print(f"   {message}")
             
             response = process_command(message)
+            if "hz" in response:
+                interval[0] = 1.0 / response["hz"]
+                rate_changed.set()
+            
+            # Korelasyon kimliği varsa ack gönder (istemci onay takibi)
+            cid = get_command_id(message)
+            if cid:
+                await websocket.send(codec.dumpb({"type": "ack", "cid": cid, **response}), text=True)
             
             # Durumu gönder
-            await websocket.send(json.dumps(state))
+            await websocket.send(codec.dumpb(state), text=True)
             
             # Sonuç
             status_icon = "✅" if response.get("status") == "success" else "❌"
@@ -342,9 +392,11 @@ async def handle_client(websocket):
         print(f"\n❌ İstemci hatası ({client_id}): {e}")
     finally:
         update_task.cancel()
+        keepalive_task.cancel()
         connected_clients.discard(websocket)
         print(f"❌ Bağlantı sonlandı: {client_id}")
         print(f"   👥 Kalan bağlantı: {len(connected_clients)}\n")
+        print(f"   📉 Sıkıştırma: {compression_stats.summary()}")
 
 # =============================================================================
 # MANUEL KONSOL KONTROLÜ
@@ -412,20 +464,20 @@ def console_input_handler():
             # Alarm
             elif parts[0] == 'alarm':
                 kumes_id = int(parts[1])
-                cmd_json = json.dumps({
+                cmd_json = codec.dumps({
                     "action": "trigger_alarm",
                     "kumes": kumes_id,
                     "mesaj": "Manuel test alarmı!"
                 })
             
             elif cmd == 'clear':
-                cmd_json = json.dumps({"action": "reset_alarms"})
+                cmd_json = codec.dumps({"action": "reset_alarms"})
             
             # LED
             elif parts[0] == 'led':
                 kumes_id = int(parts[1])
                 on_off = parts[2]
-                cmd_json = json.dumps({
+                cmd_json = codec.dumps({
                     "action": f"led_{on_off}",
                     "kumes": kumes_id
                 })
@@ -434,7 +486,7 @@ def console_input_handler():
             elif parts[0] == 'fan':
                 kumes_id = int(parts[1])
                 on_off = parts[2]
-                cmd_json = json.dumps({
+                cmd_json = codec.dumps({
                     "action": f"fan_{on_off}",
                     "kumes": kumes_id
                 })
@@ -442,13 +494,13 @@ def console_input_handler():
             # Pompa
             elif parts[0] == 'pump':
                 on_off = parts[1]
-                cmd_json = json.dumps({"action": f"pump_{on_off}"})
+                cmd_json = codec.dumps({"action": f"pump_{on_off}"})
             
             # Kapı
             elif parts[0] == 'door':
                 kumes_id = int(parts[1])
                 open_close = parts[2]
-                cmd_json = json.dumps({
+                cmd_json = codec.dumps({
                     "action": f"door_{open_close}",
                     "kumes": kumes_id
                 })
@@ -457,7 +509,7 @@ def console_input_handler():
             elif parts[0] == 'temp':
                 kumes_id = int(parts[1])
                 value = float(parts[2])
-                cmd_json = json.dumps({
+                cmd_json = codec.dumps({
                     "action": "set_temp",
                     "kumes": kumes_id,
                     "value": value
@@ -467,7 +519,7 @@ def console_input_handler():
             elif parts[0] == 'hum':
                 kumes_id = int(parts[1])
                 value = float(parts[2])
-                cmd_json = json.dumps({
+                cmd_json = codec.dumps({
                     "action": "set_humidity",
                     "kumes": kumes_id,
                     "value": value
@@ -521,8 +573,8 @@ async def main():
             handle_client,
             SERVER_IP,
             SERVER_PORT,
-            ping_interval=5,
-            ping_timeout=3
+            **NO_BUILTIN_PING,
+            **server_options(compression_stats)
         ):
             print(f"✅ SUNUCU HAZIR! Bağlantılar bekleniyor...")
             print(f"💡 Ana uygulamayı başlatın: python main.py\n")
@@ -5,7 +5,9 @@ Gerçek ESP32 cihazını simüle eden test sunucusu
 
 import asyncio
 import websockets
-import json
+from core import codec
+from core.ws_compression import CompressionStats, server_options
+from core.keepalive import NO_BUILTIN_PING, idle_keepalive
 import random
 import time
 from datetime import datetime
@@ -17,6 +19,10 @@ from typing import Dict, Any
 SERVER_IP = "192.168.1.107"
 SERVER_PORT = 81  # Gerçek ESP32 ile aynı port
 UPDATE_INTERVAL = 2  # Saniye
+RATE_LIMITS_HZ = (0.1, 10.0)  # set_rate ile istenebilecek gönderim hızı aralığı
+# İstemciden bu kadar komut gelmezse ping atılır; pong KEEPALIVE_TIMEOUT'ta gelmezse kapatılır
+KEEPALIVE_IDLE = 30.0     # Saniye
+KEEPALIVE_TIMEOUT = 10.0  # Saniye
 
 # =============================================================================
 # BAŞLANGIÇ DURUMU
@@ -73,6 +79,9 @@ state: Dict[str, Any] = {
 # Aktif bağlantılar
 connected_clients = set()
 
+# permessage-deflate istatistikleri (tüm istemciler, WS_DEFLATE ayarlarıyla)
+compression_stats = CompressionStats()
+
 # =============================================================================
 # KOMUT İŞLEME
 # =============================================================================
@@ -140,9 +149,10 @@ def process_json_command(json_str: str) -> Dict[str, Any]:
     - {"action": "fan_off", "kumes": 2}
     - {"action": "door_open", "kumes": 1}
     - {"action": "get_status"}
+    - {"action": "set_rate", "hz": 5}
     """
     try:
-        cmd = json.loads(json_str)
+        cmd = codec.loads(json_str)
         action = cmd.get("action")
         kumes_id = cmd.get("kumes")
         
@@ -204,6 +214,11 @@ def process_json_command(json_str: str) -> Dict[str, Any]:
             state["pompa"] = False
             return {"status": "success", "message": "Pompa kapatıldı"}
         
+        # Telemetri hızı (istemci görünürlüğüne göre)
+        elif action == "set_rate":
+            hz = min(max(float(cmd.get("hz", 1.0)), RATE_LIMITS_HZ[0]), RATE_LIMITS_HZ[1])
+            return {"status": "success", "message": f"Gönderim hızı: {hz:g} Hz", "hz": hz}
+        
         # Alarm sıfırlama
         elif action == "reset_alarms":
             for k in state["kumesler"]:
@@ -213,7 +228,7 @@ def process_json_command(json_str: str) -> Dict[str, Any]:
         
         return {"status": "error", "message": f"Bilinmeyen aksiyon: {action}"}
         
-    except json.JSONDecodeError as e:
+    except codec.DecodeError as e:
         return {"status": "error", "message": f"JSON parse hatası: {str(e)}"}
     except Exception as e:
         return {"status": "error", "message": f"Komut hatası: {str(e)}"}
@@ -267,6 +282,14 @@ def simulate_sensor_changes():
 # =============================================================================
 # WEBSOCKET İŞLEYİCİ
 # =============================================================================
+def get_command_id(message) -> str:
+    """Komut içindeki korelasyon kimliğini (cid) döndürür, yoksa boş string"""
+    try:
+        cmd = codec.loads(message)
+    except (codec.DecodeError, TypeError):
+        return ""
+    return cmd.get("cid", "") if isinstance(cmd, dict) else ""
+
 async def handle_client(websocket):
     """
     Tek bir istemci bağlantısını yönetir
@@ -278,14 +301,27 @@ async def handle_client(websocket):
     print(f"✓ Yeni bağlantı: {client_id}")
     connected_clients.add(websocket)
     
+    # İstemcinin istediği gönderim aralığı (set_rate ile değişir)
+    interval = [UPDATE_INTERVAL]
+    rate_changed = asyncio.Event()
+    
     # Otomatik veri gönderme görevi
     async def send_periodic_updates():
         """Belirli aralıklarla güncel veri gönderir"""
+        last_sim = 0.0
         try:
             while True:
-                simulate_sensor_changes()
-                await websocket.send(json.dumps(state))
-                await asyncio.sleep(UPDATE_INTERVAL)
+                # Sensörler hızdan bağımsız olarak UPDATE_INTERVAL'da bir değişir
+                if time.monotonic() - last_sim >= UPDATE_INTERVAL:
+                    simulate_sensor_changes()
+                    last_sim = time.monotonic()
+                # Gönderim sürerken gelen set_rate kaybolmasın: önce temizle
+                rate_changed.clear()
+                await websocket.send(codec.dumpb(state), text=True)
+                try:
+                    await asyncio.wait_for(rate_changed.wait(), interval[0])
+                except asyncio.TimeoutError:
+                    pass
         except websockets.exceptions.ConnectionClosed:
             pass
         except Exception as e:
@@ -294,20 +330,34 @@ async def handle_client(websocket):
     # Arka planda veri göndermeyi başlat
     update_task = asyncio.create_task(send_periodic_updates())
     
+    # İstemci sessiz kaldığında canlılık kontrolü (sabit aralıklı ping yok)
+    last_rx = [time.monotonic()]
+    keepalive_task = asyncio.create_task(idle_keepalive(
+        websocket, lambda: time.monotonic() - last_rx[0], KEEPALIVE_IDLE, KEEPALIVE_TIMEOUT))
+    
     try:
         # İlk bağlantıda mevcut durumu gönder
-        await websocket.send(json.dumps(state))
+        await websocket.send(codec.dumpb(state), text=True)
         
         # İstemciden gelen komutları dinle
         async for message in websocket:
+            last_rx[0] = time.monotonic()
             timestamp = datetime.now().strftime("%H:%M:%S")
             print(f"[{timestamp}] ← Komut ({client_id}): {message[:100]}")
             
             # Komutu işle
             response = update_state_from_command(message)
+            if "hz" in response:
+                interval[0] = 1.0 / response["hz"]
+                rate_changed.set()
+            
+            # Korelasyon kimliği varsa ack gönder (istemci onay takibi)
+            cid = get_command_id(message)
+            if cid:
+                await websocket.send(codec.dumpb({"type": "ack", "cid": cid, **response}), text=True)
             
             # Yanıt gönder
-            await websocket.send(json.dumps(state))
+            await websocket.send(codec.dumpb(state), text=True)
             
             # Komut sonucunu logla
             if response.get("status") == "success":
@@ -322,9 +372,11 @@ async def handle_client(websocket):
     finally:
         # Temizlik
         update_task.cancel()
+        keepalive_task.cancel()
         connected_clients.discard(websocket)
         print(f"✗ Bağlantı sonlandı: {client_id}")
         print(f"   Aktif bağlantılar: {len(connected_clients)}")
+        print(f"   📉 Sıkıştırma: {compression_stats.summary()}")
 
 # =============================================================================
 # ANA SUNUCU
@@ -356,8 +408,8 @@ async def main():
             handle_client,
             SERVER_IP,
             SERVER_PORT,
-            ping_interval=5,
-            ping_timeout=3
+            **NO_BUILTIN_PING,
+            **server_options(compression_stats)
         ):
             print(f"✅ Sunucu hazır! Bağlantılar bekleniyor...\n")
             await asyncio.Future()  # Sonsuz döngü
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import Süresi Denetimi
+======================
+Bir modülü `python -X importtime` ile temiz bir süreçte yükler ve en pahalı
+import'ları listeler. Giriş penceresinden önce yüklenmemesi gereken ağır
+paketler (pandas, pyqtgraph, numpy, matplotlib, openpyxl) açılış yolunda
+görülürse işaretlenir ve çıkış kodu 1 olur.
+
+Kullanım:
+    python import_audit.py                     # main_tayyar
+    python import_audit.py -m ui.kumes_card    # başka bir modül
+    python import_audit.py -n 30 --self        # kendi süresine göre ilk 30
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Açılışta yüklenmemesi gereken paketler (ilk kullanımda yüklenirler)
+HEAVY_PACKAGES = ("pandas", "pyqtgraph", "numpy", "matplotlib", "openpyxl")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# (modül, kendi µs, toplam µs, derinlik)
+ImportRow = Tuple[str, int, int, int]
+
+
+def run_importtime(module: str) -> Tuple[List[ImportRow], str]:
+    """Modülü ayrı bir süreçte yükler; import satırları ve hata çıktısı"""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True,
+    )
+    rows, errors = [], []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+        elif not line.startswith("import time:"):
+            errors.append(line)
+    return rows, "\n".join(errors) if proc.returncode else ""
+
+
+def heavy_imports(rows: List[ImportRow]) -> Dict[str, int]:
+    """Yüklenen ağır paketler → toplam süre (µs, en üst seviye import)"""
+    found = {}
+    for name, _, cumulative_us, _ in rows:
+        package = name.split(".")[0]
+        if package in HEAVY_PACKAGES and name == package:
+            found[package] = cumulative_us
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import süresi denetimi (-X importtime)")
+    parser.add_argument("-m", "--module", default="main_tayyar", help="yüklenecek modül")
+    parser.add_argument("-n", "--top", type=int, default=20, help="listelenecek import sayısı")
+    parser.add_argument("--self", dest="by_self", action="store_true",
+                        help="toplam yerine kendi süresine göre sırala")
+    args = parser.parse_args()
+
+    rows, errors = run_importtime(args.module)
+    if errors:
+        print(f"❌ {args.module} yüklenemedi:\n{errors}")
+        sys.exit(2)
+
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+    key = (lambda row: row[1]) if args.by_self else (lambda row: row[2])
+
+    print("=" * 70)
+    print(f"⏱️ IMPORT SÜRESİ: {args.module}")
+    print("=" * 70)
+    print(f"{'Modül':<44} {'Kendi (ms)':>11} {'Toplam (ms)':>12}")
+    print("-" * 70)
+    for name, self_us, cumulative_us, _ in sorted(rows, key=key, reverse=True)[:args.top]:
+        print(f"{name[:44]:<44} {self_us / 1000:>11.1f} {cumulative_us / 1000:>12.1f}")
+    print("-" * 70)
+    print(f"{len(rows)} modül, toplam {total_us / 1000:.0f} ms")
+
+    heavy = heavy_imports(rows)
+    if heavy:
+        print("\n⚠️ Açılış yolunda ağır paketler:")
+        for package, cumulative_us in sorted(heavy.items(), key=lambda item: -item[1]):
+            print(f"   {package:<12} {cumulative_us / 1000:8.1f} ms")
+        sys.exit(1)
+    print("\n✅ Ağır paket yüklenmedi")
+
+
+if __name__ == "__main__":
+    main()
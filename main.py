@@ -12,8 +12,6 @@ Kümes Otomasyon Sistemi - Birleştirilmiş Ana Pencere
 """
 
 import sys
-import json
-import asyncio
 from typing import Optional
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -21,15 +19,16 @@ from PyQt6.QtWidgets import (
     QPushButton, QMessageBox, QDialog, QLineEdit, QFormLayout,
     QScrollArea
 )
-from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QThread
+from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QFont, QPalette, QColor
-import websockets
+
+# Bağlantı köprüsü (paylaşılan asyncio ağ döngüsü) her modda gerekli
+from core.websocket_bridge import WebSocketBridge
 
 # Eski dosyadan importlar
 try:
     from core.config import APP_TITLE, DEFAULT_ESP_IP, WS_PORT, KUMES_BILGILERI
     from core.database import DatabaseManager
-    from core.websocket_bridge import WebSocketBridge
     from core.alarm_manager import AlarmManager
     from ui.kumes_card import KumesCard
     from ui.system_status import SystemStatusPanel
@@ -55,94 +54,6 @@ except ImportError as e:
     }
 
 
-# ==================== WEBSOCKET THREAD ====================
-class WebSocketThread(QThread):
-    """WebSocket bağlantısını ayrı thread'de çalıştır"""
-    message_received = pyqtSignal(str)
-    connection_status = pyqtSignal(bool)
-
-    def __init__(self, ip, port=81):
-        super().__init__()
-        self.ip = ip
-        self.port = port
-        self.websocket = None
-        self.running = True
-        self.session_id = None
-        self._loop = None  # Event loop referansı
-        self._send_queue = asyncio.Queue()
-
-    async def connect_and_listen(self):
-        """WebSocket'e bağlan ve dinle"""
-        uri = f"ws://{self.ip}:{self.port}"
-        print(f"🔌 Bağlanılıyor: {uri}")
-
-        try:
-            async with websockets.connect(uri, open_timeout=10) as websocket:
-                self.websocket = websocket
-                self.connection_status.emit(True)
-                print("✅ WebSocket bağlandı!")
-
-                # Mesaj alma ve gönderme görevlerini paralel çalıştır
-                receive_task = asyncio.create_task(self._receive_loop(websocket))
-                send_task = asyncio.create_task(self._send_loop(websocket))
-
-                try:
-                    await asyncio.gather(receive_task, send_task)
-                except Exception:
-                    receive_task.cancel()
-                    send_task.cancel()
-
-        except Exception as e:
-            print(f"❌ Bağlantı hatası: {e}")
-            self.connection_status.emit(False)
-
-    async def _receive_loop(self, websocket):
-        """Mesaj alma döngüsü"""
-        while self.running:
-            try:
-                message = await asyncio.wait_for(
-                    websocket.recv(),
-                    timeout=1.0
-                )
-                self.message_received.emit(message)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                print(f"❌ Mesaj alma hatası: {e}")
-                break
-
-    async def _send_loop(self, websocket):
-        """Mesaj gönderme döngüsü - kuyruktan mesaj alıp gönderir"""
-        while self.running:
-            try:
-                message = await asyncio.wait_for(
-                    self._send_queue.get(),
-                    timeout=1.0
-                )
-                await websocket.send(message)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                print(f"❌ Mesaj gönderme hatası: {e}")
-                break
-
-    def run(self):
-        """Thread başlatıldığında çalışır"""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        self._loop.run_until_complete(self.connect_and_listen())
-        self._loop.close()
-
-    def send_message(self, message):
-        """Thread-safe mesaj gönder (herhangi bir thread'den çağrılabilir)"""
-        if self._loop and self._loop.is_running():
-            self._loop.call_soon_threadsafe(self._send_queue.put_nowait, message)
-
-    def stop(self):
-        """Thread'i durdur"""
-        self.running = False
-
-
 # ==================== LOGIN DIALOG ====================
 class LoginDialog(QDialog):
     """Login Dialog"""
@@ -351,7 +262,8 @@ class KumesOtomasyonMainWindow(QMainWindow):
         print("=" * 70 + "\n")
         
         self.session_manager = None
-        self.websocket_thread = None
+        self.link = None          # Oturum + veri bağlantısı (WebSocketBridge)
+        self.session_id = None
         self.kumes_cards = {}
         self.kumes_data = {}
         self.full_features = FULL_FEATURES  # Instance variable olarak da sakla
@@ -503,34 +415,32 @@ class KumesOtomasyonMainWindow(QMainWindow):
         return self.tabs
     
     def connect_websocket(self):
-        """WebSocket'e bağlan"""
-        self.websocket_thread = WebSocketThread(self.esp32_ip, WS_PORT)
-        self.websocket_thread.message_received.connect(self.on_message)
-        self.websocket_thread.connection_status.connect(self.on_connection_status)
-        self.websocket_thread.start()
+        """WebSocket'e bağlan (paylaşılan ağ döngüsündeki köprü üzerinden)"""
+        # Tam modda mevcut köprü kullanılır; aynı sunucuya ikinci bağlantı açılmaz
+        if self.full_features and hasattr(self, 'ws'):
+            self.link = self.ws
+            self.link.ip = self.esp32_ip
+        else:
+            self.link = WebSocketBridge(self.esp32_ip, WS_PORT)
+        
+        self.link.frameReceived.connect(self.on_message)  # Köprü çerçeveyi bir kez çözer
+        self.link.connectionChanged.connect(self.on_connection_status)
+        self.link.connect()
         
         # 2 saniye sonra login yap
         QTimer.singleShot(2000, self.send_login)
-        
-        # Eski sistem WebSocket'i de başlat (varsa)
-        if self.full_features and hasattr(self, 'ws'):
-            try:
-                self.ws.connect()
-                self.ws.dataReceived.connect(self.on_old_data)
-            except Exception as e:
-                print(f"⚠️ Eski WebSocket başlatılamadı: {e}")
     
     def send_login(self):
         """Login mesajı gönder"""
-        message = json.dumps({
+        message = {
             'type': 'auth',
             'username': self.username,
             'password': self.password,
             'client_type': 'desktop'
-        })
+        }
         
-        if self.websocket_thread:
-            self.websocket_thread.send_message(message)
+        if self.link:
+            self.link.submit(message)
             print(f"📤 Login gönderildi: {self.username}")
     
     def on_connection_status(self, connected):
@@ -542,39 +452,30 @@ class KumesOtomasyonMainWindow(QMainWindow):
             self.status_label.setText("🔴 Bağlantı kesildi")
             self.status_label.setStyleSheet("color: red;")
     
-    def on_message(self, message):
-        """Yeni WebSocket mesaj alındı"""
+    def on_message(self, data):
+        """Yeni WebSocket mesaj alındı (köprünün çözdüğü çerçeve)"""
+        if not isinstance(data, dict):
+            return
         try:
-            data = json.loads(message)
             msg_type = data.get('type')
             
             print(f"📥 Mesaj: {msg_type}")
             
             if msg_type == 'auth_success':
-                self.websocket_thread.session_id = data.get('session_id')
+                self.session_id = data.get('session_id')
                 print(f"✅ {data.get('username')} giriş yaptı!")
                 QMessageBox.information(self, "Başarılı", f"Hoş geldiniz {data.get('username')}!")
             
             elif msg_type == 'auth_failed':
                 QMessageBox.warning(self, "Hata", data.get('message', 'Giriş başarısız!'))
             
-            elif data.get('sistem') == 'kumes':
+            elif data.get('sistem') == 'kumes' or 'kumesler' in data:
                 # Kümes verisi
                 self.update_kumes_data(data)
             
-        except json.JSONDecodeError:
-            print("❌ JSON parse hatası")
         except Exception as e:
             print(f"❌ Hata: {e}")
     
-    def on_old_data(self, raw_json: str):
-        """Eski WebSocket'ten veri (eski sistem için)"""
-        try:
-            data = json.loads(raw_json)
-            self.update_kumes_data(data)
-        except:
-            pass
-    
     def update_kumes_data(self, data):
         """Kümes verilerini güncelle"""
         kumesler = data.get('kumesler', [])
@@ -588,14 +489,14 @@ class KumesOtomasyonMainWindow(QMainWindow):
     
     def send_command(self, command):
         """Komut gönder"""
-        message = json.dumps({
+        message = {
             'type': 'command',
             'command': command,
-            'session_id': self.websocket_thread.session_id if self.websocket_thread else 'test'
-        })
+            'session_id': self.session_id or 'test'
+        }
         
-        if self.websocket_thread:
-            self.websocket_thread.send_message(message)
+        if self.link:
+            self.link.submit(message)
             print(f"📤 Komut: {command}")
     
     def toggle_mode(self):
@@ -613,16 +514,15 @@ class KumesOtomasyonMainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.websocket_thread:
-                self.websocket_thread.stop()
+            if self.link:
+                self.link.disconnect()
             self.close()
     
     def closeEvent(self, event):
         """Pencere kapatılıyor"""
         try:
-            if hasattr(self, 'websocket_thread') and self.websocket_thread:
-                self.websocket_thread.stop()
-                self.websocket_thread.wait()
+            if self.link and self.link is not getattr(self, 'ws', None):
+                self.link.disconnect()
             
             if self.full_features:
                 if hasattr(self, 'updater') and self.updater: 
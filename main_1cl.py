@@ -5,10 +5,9 @@ Modern, profesyonel kümes yönetim arayüzü
 """
 
 import sys
-import json
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QStackedWidget, QFrame, QLabel, QGridLayout
+    QTabWidget, QStackedWidget, QFrame, QLabel
 )
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QFont
@@ -16,11 +15,14 @@ from PyQt6.QtGui import QFont
 from core.config import APP_TITLE, DEFAULT_ESP_IP, WS_PORT, KUMES_BILGILERI
 from core.database import DatabaseManager
 from core.websocket_bridge import WebSocketBridge
-from core.alarm_manager import AlarmManager
+from core.alarm_manager import AlarmManager, SEVERITY_WARNING, STALE_DATA_MESSAGE
+from core import codec
 from ui.kumes_card import KumesCard
 from ui.system_status import SystemStatusPanel
 from ui.control_panel import ControlPanel
 from ui.alarm_view import AlarmView
+from ui.alarm_style import NORMAL, ALARM, STALE
+from ui.kumes_grid import KumesGridModel, KumesGridView, TILE_SIZE
 from ui.settings_tab_cl import SettingsTab
 from data.real_time_updater import RealTimeDataUpdater
 
@@ -50,8 +52,9 @@ class KumesOtomasyonMainWindow(QMainWindow):
         self.updater = RealTimeDataUpdater(self.ws)
         
         # Veri depoları
-        self.kumes_widgets = {}
+        self.kumes_model = KumesGridModel(KUMES_BILGILERI)  # Sol panel karoları
         self.kumes_data = {}
+        self.stale_kumes = set()  # Veri gelmeyen kümesler (bayat görünüm)
         
         # UI'ı başlat
         self._init_ui()
@@ -76,29 +79,11 @@ class KumesOtomasyonMainWindow(QMainWindow):
         # ==================== SOL PANEL ====================
         left_panel = QVBoxLayout()
         
-        # Kümes Kareleri Grid
-        grid_container = QWidget()
-        grid_layout = QGridLayout(grid_container)
-        grid_layout.setSpacing(15)
-        
-        # 3 kümes için kart oluştur
-        for i in range(1, 4):
-            card = self._create_kumes_card(i)
-            row = (i-1) // 2
-            col = (i-1) % 2
-            grid_layout.addWidget(card, row, col)
-            
-            # Widget referanslarını sakla
-            self.kumes_widgets[i] = {
-                'frame': card,
-                'icon': card.findChild(QLabel, 'icon'),
-                'name': card.findChild(QLabel, 'name'),
-                'temp': card.findChild(QLabel, 'temp'),
-                'status': card.findChild(QLabel, 'status')
-            }
-        
-        left_panel.addWidget(grid_container)
-        left_panel.addStretch()
+        # Kümes karoları (sanal ızgara - yalnızca görünenler çizilir)
+        self.kumes_grid = KumesGridView(self.kumes_model)
+        self.kumes_grid.setMinimumSize(2 * TILE_SIZE.width() + 10, 2 * TILE_SIZE.height() + 10)
+        self.kumes_grid.kumesClicked.connect(self._on_kumes_clicked)
+        left_panel.addWidget(self.kumes_grid, stretch=1)
         
         # Gelişmiş Sistem Durum Paneli
         self.system_panel = self._create_enhanced_status_panel()
@@ -122,7 +107,7 @@ class KumesOtomasyonMainWindow(QMainWindow):
         self.tabs.addTab(self.control_panel, "Kontrol")
         
         # 3. Alarmlar
-        self.alarm_view = AlarmView(self.alarm_mgr)
+        self.alarm_view = AlarmView(self.alarm_mgr, self.kumes_bilgileri)
         self.tabs.addTab(self.alarm_view, "Alarmlar")
         
         # 4. Ayarlar
@@ -131,97 +116,6 @@ class KumesOtomasyonMainWindow(QMainWindow):
         
         main_layout.addWidget(self.tabs, stretch=3)
     
-    def _create_kumes_card(self, kumes_id: int) -> QFrame:
-        """
-        Sol paneldeki kümes kartını oluşturur
-        
-        Args:
-            kumes_id: Kümes numarası (1-3)
-            
-        Returns:
-            QFrame: Kümes kartı widget'ı
-        """
-        # Kümes bilgilerini config'den al
-        info = KUMES_BILGILERI.get(kumes_id, {
-            "ad": f"Kümes {kumes_id}",
-            "tavuk_sayisi": 0,
-            "gunluk": 0,
-            "icon": "🏠"
-        })
-        
-        # Kart frame'i
-        card = QFrame()
-        card.setFixedSize(180, 240)
-        card.setCursor(Qt.CursorShape.PointingHandCursor)
-        card.setObjectName(f"kumes_{kumes_id}")
-        card.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #21262d, stop:1 #161b22
-                );
-                border: 3px solid #30363d;
-                border-radius: 15px;
-            }
-            QFrame:hover {
-                border-color: #58a6ff;
-            }
-        """)
-        
-        layout = QVBoxLayout(card)
-        layout.setSpacing(6)
-        layout.setContentsMargins(10, 10, 10, 10)
-        
-        # İkon
-        icon = QLabel(info.get("icon", "🏠"))
-        icon.setObjectName("icon")
-        icon.setFont(QFont("Segoe UI", 36))
-        icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(icon)
-        
-        # İsim
-        name = QLabel(info["ad"])
-        name.setObjectName("name")
-        name.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        name.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name.setStyleSheet("color: #c9d1d9;")
-        layout.addWidget(name)
-        
-        # Sıcaklık
-        temp = QLabel("-- °C")
-        temp.setObjectName("temp")
-        temp.setFont(QFont("Segoe UI", 10))
-        temp.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        temp.setStyleSheet("color: #8b949e;")
-        layout.addWidget(temp)
-        
-        # Tavuk sayısı
-        tavuk = QLabel(f"🐔 {info['tavuk_sayisi']} tavuk")
-        tavuk.setFont(QFont("Segoe UI", 9))
-        tavuk.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        tavuk.setStyleSheet("color: #9ae6b4;")
-        layout.addWidget(tavuk)
-        
-        # Günlük
-        gun = QLabel(f"📅 {info['gunluk']} günlük")
-        gun.setFont(QFont("Segoe UI", 9))
-        gun.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        gun.setStyleSheet("color: #9ae6b4;")
-        layout.addWidget(gun)
-        
-        # Durum
-        status = QLabel("● Normal")
-        status.setObjectName("status")
-        status.setFont(QFont("Segoe UI", 11))
-        status.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        status.setStyleSheet("color: #48bb78; font-weight: bold;")
-        layout.addWidget(status)
-        
-        # Tıklama olayı
-        card.mousePressEvent = lambda e, kid=kumes_id: self._on_kumes_clicked(kid)
-        
-        return card
-    
     def _create_enhanced_status_panel(self) -> QFrame:
         """
         Gelişmiş sistem durum panelini oluşturur
@@ -322,20 +216,23 @@ class KumesOtomasyonMainWindow(QMainWindow):
     
     def _connect_signals(self):
         """Sinyalleri ilgili slot'lara bağlar"""
-        self.ws.dataReceived.connect(self._handle_data)
+        self.ws.frameReceived.connect(self._handle_data)
         self.ws.connectionChanged.connect(self._on_connection_changed)
+        self.updater.kumesStale.connect(self._on_stale_data)
+        self.updater.kumesRecovered.connect(self._on_data_recovered)
         self.alarm_mgr.alarmAdded.connect(self._update_alarm_display)
         self.alarm_mgr.alarmCleared.connect(self._update_alarm_display)
     
-    def _handle_data(self, raw_json: str):
+    def _handle_data(self, raw_json):
         """
         WebSocket'ten gelen JSON verisini işler
         
         Args:
-            raw_json: Ham JSON string
+            raw_json: Parse edilmiş çerçeve (dict) veya ham JSON
         """
         try:
-            data = json.loads(raw_json)
+            # Köprü parse edilmiş çerçeveyi verir; ham metin gelirse çözülür
+            data = codec.loads(raw_json) if isinstance(raw_json, (str, bytes)) else raw_json
             
             # Kümes kartlarını güncelle
             if 'kumesler' in data:
@@ -344,25 +241,25 @@ class KumesOtomasyonMainWindow(QMainWindow):
                 
                 for kumes in data['kumesler']:
                     kumes_id = kumes.get('id')
+                    # Kimliksiz ya da karosu olmayan kümes atlanır
+                    if kumes_id is None or self.kumes_model.tile(kumes_id) is None:
+                        continue
                     self.kumes_data[kumes_id] = kumes
                     
-                    if kumes_id in self.kumes_widgets:
-                        # Sıcaklık güncelle
-                        temp = kumes.get('sicaklik', 0)
-                        temps.append(temp)
-                        self.kumes_widgets[kumes_id]['temp'].setText(f"{temp:.1f} °C")
-                        
-                        # Nem
-                        hum = kumes.get('nem', 0)
-                        hums.append(hum)
-                        
-                        # Alarm kontrolü
-                        has_alarm = kumes.get('alarm', False)
-                        self._update_kumes_card_alarm(kumes_id, has_alarm)
-                        
-                        if has_alarm:
-                            mesaj = kumes.get('mesaj', 'Alarm!')
-                            self.alarm_mgr.add_alarm(kumes_id, mesaj)
+                    # Sıcaklık güncelle (karo yalnızca değer değişince çizilir)
+                    temps.append(kumes.get('sicaklik', 0))
+                    self.kumes_model.update_kumes(kumes_id, kumes)
+                    
+                    # Nem
+                    hums.append(kumes.get('nem', 0))
+                    
+                    # Alarm kontrolü
+                    has_alarm = kumes.get('alarm', False)
+                    self._update_kumes_card_alarm(kumes_id, has_alarm)
+                    
+                    if has_alarm:
+                        mesaj = kumes.get('mesaj', 'Alarm!')
+                        self.alarm_mgr.add_alarm(kumes_id, mesaj)
                 
                 # Ortalamalar
                 if temps:
@@ -397,47 +294,28 @@ class KumesOtomasyonMainWindow(QMainWindow):
                 if current_id in self.kumes_data:
                     self.detail_tab.currentWidget().update_data(self.kumes_data[current_id])
                     
-        except json.JSONDecodeError as e:
+        except codec.DecodeError as e:
             print(f"❌ JSON parse hatası: {e}")
         except Exception as e:
             print(f"❌ Veri işleme hatası: {e}")
     
     def _update_kumes_card_alarm(self, kumes_id: int, has_alarm: bool):
         """
-        Kümes kartının alarm durumunu günceller
+        Kümes kartının alarm / bayat durumunu günceller
         
         Args:
             kumes_id: Kümes ID
             has_alarm: Alarm var mı?
         """
-        if kumes_id not in self.kumes_widgets:
-            return
-        
-        status_label = self.kumes_widgets[kumes_id]['status']
-        card_frame = self.kumes_widgets[kumes_id]['frame']
-        
         if has_alarm:
-            status_label.setText("⚠️ ALARM")
-            status_label.setStyleSheet("color: #ff4444; font-weight: bold;")
-            
-            # Kart kenarlığını kırmızı yap
-            current_style = card_frame.styleSheet()
-            new_style = current_style.replace(
-                "border: 3px solid #30363d",
-                "border: 3px solid #ff4444"
-            )
-            card_frame.setStyleSheet(new_style)
+            state = ALARM
+        elif kumes_id in self.stale_kumes:
+            state = STALE
         else:
-            status_label.setText("● Normal")
-            status_label.setStyleSheet("color: #48bb78; font-weight: bold;")
-            
-            # Kart kenarlığını normale döndür
-            current_style = card_frame.styleSheet()
-            new_style = current_style.replace(
-                "border: 3px solid #ff4444",
-                "border: 3px solid #30363d"
-            )
-            card_frame.setStyleSheet(new_style)
+            state = NORMAL
+        
+        # Durum aynıysa karo yeniden çizilmez
+        self.kumes_model.set_state(kumes_id, state)
     
     def _update_alarm_display(self):
         """Genel alarm sayısını ve rengini günceller"""
@@ -449,6 +327,26 @@ class KumesOtomasyonMainWindow(QMainWindow):
             value_label.setText(str(count))
             value_label.setStyleSheet(f"color: {color}; background: transparent; font-weight: bold;")
 
+    def _on_stale_data(self, kumes_id: int, age: float):
+        """Bağlantı açık olsa da kümesten güncel veri gelmiyorsa alarm üretir"""
+        self.alarm_mgr.add_alarm(kumes_id, STALE_DATA_MESSAGE, SEVERITY_WARNING)
+        self._set_kumes_stale(kumes_id, True)
+
+    def _on_data_recovered(self, kumes_id: int):
+        """Bayat kümesten yeniden veri geldi: uyarı alarmı kalkar"""
+        self.alarm_mgr.remove_alarm(kumes_id, STALE_DATA_MESSAGE)
+        self._update_alarm_display()
+        self._set_kumes_stale(kumes_id, False)
+
+    def _set_kumes_stale(self, kumes_id: int, stale: bool):
+        """Kartı bayat / normal görünüme alır (alarm görünümü önceliklidir)"""
+        if stale:
+            self.stale_kumes.add(kumes_id)
+        else:
+            self.stale_kumes.discard(kumes_id)
+        self._update_kumes_card_alarm(
+            kumes_id, self.kumes_data.get(kumes_id, {}).get('alarm', False))
+
     def _on_connection_changed(self, connected: bool):
         """
         Bağlantı durumu değiştiğinde çağrılır
@@ -1,5 +1,4 @@
 import sys
-import json
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QStackedWidget, QFrame, QLabel, QGridLayout, QInputDialog, QMessageBox
@@ -11,6 +10,7 @@ from core.config import APP_TITLE, DEFAULT_ESP_IP, WS_PORT
 from core.database import DatabaseManager
 from core.websocket_bridge import WebSocketBridge
 from core.alarm_manager import AlarmManager
+from core import codec
 from ui.kumes_card import KumesCard
 from ui.system_status import SystemStatusPanel
 from ui.control_panel import ControlPanel
@@ -243,9 +243,9 @@ class KumesOtomasyonMainWindow(QMainWindow):
         self.detail_tab.addWidget(detail); self.detail_tab.setCurrentWidget(detail)
         self.tabs.setCurrentIndex(0)
 
-    def _handle_data(self, raw_json: str):
+    def _handle_data(self, raw_json):
         try:
-            data = json.loads(raw_json)
+            data = codec.loads(raw_json) if isinstance(raw_json, (str, bytes)) else raw_json
             if 'kumesler' in data:
                 temps = []; hums = []
                 for k in data['kumesler']:
@@ -303,7 +303,7 @@ class KumesOtomasyonMainWindow(QMainWindow):
         self._update_kumes_card_alarm(2, True)
 
     def _connect_signals(self):
-        self.ws.dataReceived.connect(self._handle_data)
+        self.ws.frameReceived.connect(self._handle_data)
         self.ws.connectionChanged.connect(self._on_connection_changed)
         self.alarm_mgr.alarmAdded.connect(self._update_alarm_display)
         self.alarm_mgr.alarmCleared.connect(self._update_alarm_display)
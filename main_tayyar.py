@@ -8,31 +8,43 @@ Kümes Otomasyon Sistemi - Ana Pencere (Responsive Versiyon)
 """
 
 import sys
-import json
+from core.startup_timeline import timeline  # Açılış ölçümü: ilk import olmalı
 import asyncio
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QTabWidget, QStackedWidget, QFrame, QLabel, QGridLayout, QScrollArea, QPushButton, 
+    QTabWidget, QStackedWidget, QFrame, QLabel, QScrollArea, QPushButton, 
     QMessageBox, QDialog, QSizePolicy
 )
-from PyQt6.QtCore import QTimer, Qt, QSize, QTimer, pyqtSignal, QObject, QThread
+from PyQt6.QtCore import QTimer, Qt, QSize, QTimer, pyqtSignal, QObject, QThread, QEvent
 from PyQt6.QtGui import QFont, QPalette, QColor
 import websockets
 
-from core.config import APP_TITLE, DEFAULT_ESP_IP, WS_PORT, KUMES_BILGILERI
+from core.config import APP_TITLE, DEFAULT_ESP_IP, WS_PORT, KUMES_BILGILERI, DEVICE_ENDPOINTS
 from core.database import DatabaseManager
 from core.websocket_bridge import WebSocketBridge
-from core.alarm_manager import AlarmManager
+from core.device_pool import DevicePool
+from core.commands import LedCommand, FanCommand, DoorCommand
+from core.telemetry_rate import TelemetryRateController
+from core.alarm_manager import AlarmManager, SEVERITY_WARNING, STALE_DATA_MESSAGE
 from ui.kumes_card import KumesCard
 from ui.system_status import SystemStatusPanel
+from ui.status_panel import StatusPanel
 from ui.control_panel import ControlPanel
 from ui.alarm_view import AlarmView
 from ui.settings_tab import SettingsTab
+from ui.render_scheduler import RenderScheduler
+from ui.alarm_style import NORMAL, ALARM, STALE
+from ui.kumes_grid import KumesGridModel, KumesGridView, TILE_SIZE
 from data.real_time_updater import RealTimeDataUpdater
+from data.frame_worker import FrameWorker, FrameChanges
+from data.sensor_recorder import SensorRecorder
 from core.user_manager import UserManager, User
 from ui.login_window import LoginWindow
 from ui.user_management_tab import UserManagementTab
 from core.session_manager import SessionManager
+from ui.lazy_tabs import LazyTabs
+
+timeline.mark("import")
 
 
 class KumesOtomasyonMainWindow(QMainWindow):
@@ -79,13 +91,36 @@ class KumesOtomasyonMainWindow(QMainWindow):
         
         # Core bileşenler
         self.db = DatabaseManager()
-        self.ws = WebSocketBridge(initial_ip)
+        timeline.mark("db")
+        # Birden fazla kontrolcü tanımlıysa havuz, değilse tek cihaz köprüsü
+        if len(DEVICE_ENDPOINTS) > 1:
+            self.ws = DevicePool(DEVICE_ENDPOINTS)
+        else:
+            self.ws = WebSocketBridge(initial_ip)
         self.alarm_mgr = AlarmManager(self.db)
         self.updater = RealTimeDataUpdater(self.ws)
         
+        # Cihazın gönderim hızı pencere / detay / alarm durumuna göre ayarlanır
+        self.rate_ctrl = TelemetryRateController(self.ws, parent=self)
+        self.rate_ctrl.rateChanged.connect(self.updater.set_expected_rate)
+        
         # Veri depoları
-        self.kumes_widgets = {}
+        self.kumes_model = KumesGridModel(self.kumes_bilgileri)  # Sol panel karoları
         self.kumes_data = {}
+        self._permissions = None  # (can_control, admin_active) - oturum bildirince
+        self.stale_kumes = set()  # Veri gelmeyen kümesler (bayat görünüm)
+        
+        # Gelen çerçeveler kare hızında çizilir (RENDER_FPS)
+        self.renderer = RenderScheduler(parent=self)
+        self._panel_values = {}  # Durum paneline bir sonraki karede yazılacaklar
+        
+        # Çerçeveler ağ iş parçacığından doğrudan çözme / fark iş parçacığına gider;
+        # GUI'ye yalnızca değişiklik kümesi gelir; geçmiş grafiği için örnekler
+        # de orada seyreltilerek veritabanına yazılır
+        self.frame_worker = FrameWorker(recorder=SensorRecorder(self.db), parent=self)
+        self.ws.frameReceived.connect(
+            self.frame_worker.submit, Qt.ConnectionType.DirectConnection)
+        self.frame_worker.changesReady.connect(self._apply_frame_changes)
         
         # UI'ı başlat
         #self._init_ui()
@@ -127,11 +162,14 @@ class KumesOtomasyonMainWindow(QMainWindow):
         """Login başarılı olunca"""
         self.current_user = user
         print(f"✅ Giriş başarılı: {user.full_name} ({user.role})")
+        timeline.mark("login")
         
         # Ana pencereyi başlat
         self._init_ui()
         self._connect_signals()
         self._start_services()
+        timeline.mark("ui")
+        timeline.watch_first_paint(self)
         
         role_icon = "🔑" if user.role == 'admin' else "👤"
         role_text = "Yönetici" if user.role == 'admin' else "Kullanıcı"
@@ -157,6 +195,11 @@ class KumesOtomasyonMainWindow(QMainWindow):
            print("  📡 WebSocket bağlanıyor...")
         self.ws.connect()
     
+    # Çerçeve iş parçacığı (yeni arayüz tam durumu alsın diye sıfırlanır)
+        self.frame_worker.reset()
+        if not self.frame_worker.isRunning():
+            self.frame_worker.start()
+    
     # AutoUpdater'ı başlat
         if hasattr(self, 'updater') and self.updater:
            print("  🔄 AutoUpdater başlatılıyor...")
@@ -170,11 +213,6 @@ class KumesOtomasyonMainWindow(QMainWindow):
         self.setMinimumSize(1000, 600)         # En küçük
         central = QWidget()
         self.setCentralWidget(central)
-        self.settings_tab = SettingsTab(
-            self.ws,
-            kumes_bilgileri=self.kumes_bilgileri  # ← Bilgileri ver
-        )
-        #tabs.addTab(self.settings_tab, "⚙️ Ayarlar")
         
         # Ana Layout - Yatay (Sol + Sağ)
         main_layout = QHBoxLayout(central)
@@ -244,250 +282,21 @@ class KumesOtomasyonMainWindow(QMainWindow):
         scroll_layout.addWidget(title)
         
         # ==================== KÜMES KARTLARI GRİDİ ====================
-        grid_container = QWidget()
-        grid_layout = QGridLayout(grid_container)
-        grid_layout.setSpacing(12)
-        grid_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # 3 kümes kartı oluştur
-        for i in range(1, 4):
-            card = self._create_responsive_kumes_card(i)
-            row = (i - 1) // 2
-            col = (i - 1) % 2
-            grid_layout.addWidget(card, row, col)
-            
-            # Widget referanslarını sakla
-            self.kumes_widgets[i] = {
-                'frame': card,
-                'icon': card.findChild(QLabel, 'icon'),
-                'name': card.findChild(QLabel, 'name'),
-                'temp': card.findChild(QLabel, 'temp'),
-                'status': card.findChild(QLabel, 'status'),
-                'tavuk': card.findChild(QLabel, 'tavuk'),
-                'gunluk': card.findChild(QLabel, 'gunluk')
-            }
-        
-        scroll_layout.addWidget(grid_container)
+        # Kümes sayısından bağımsız: yalnızca görünen karolar çizilir
+        self.kumes_grid = KumesGridView(self.kumes_model)
+        self.kumes_grid.setMinimumHeight(2 * TILE_SIZE.height() + 10)
+        self.kumes_grid.kumesClicked.connect(self._on_kumes_clicked)
+        scroll_layout.addWidget(self.kumes_grid, stretch=1)
         
         # ==================== SİSTEM DURUM PANELİ ====================
-        self.system_panel = self._create_enhanced_status_panel()
+        self.system_panel = StatusPanel()
         scroll_layout.addWidget(self.system_panel)
         
-        scroll_layout.addStretch()
-        
         # Scroll içeriğini ayarla
         scroll_area.setWidget(scroll_content)
         
         return scroll_area
     
-    def _create_responsive_kumes_card(self, kumes_id: int) -> QFrame:
-        """
-        Responsive kümes kartı oluşturur
-        - Dinamik boyutlandırma
-        - Minimum/maksimum boyutlar
-        """
-        # Kümes bilgilerini al
-        info = KUMES_BILGILERI.get(kumes_id, {
-            "ad": f"Kümes {kumes_id}",
-            "tavuk_sayisi": 0,
-            "gunluk": 0,
-            "icon": "🏠"
-        })
-        
-        # Kart frame'i
-        card = QFrame()
-        
-        card.setSizePolicy(
-        QSizePolicy.Policy.Expanding,   # Genişlik esnek
-        QSizePolicy.Policy.Fixed        # Yükseklik sabit
-    )
-        card.setMinimumHeight(140)
-        card.setMaximumHeight(180)
-        card.setObjectName(f"kumes_{kumes_id}")
-        
-        # Responsive boyutlar
-        card.setMinimumSize(160, 200)  # Minimum
-        card.setMaximumSize(200, 250)  # Maksimum
-        
-        card.setCursor(Qt.CursorShape.PointingHandCursor)
-        card.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #21262d, stop:1 #161b22
-                );
-                border: 3px solid #30363d;
-                border-radius: 12px;
-            }
-            QFrame:hover {
-                border-color: #58a6ff;
-                background: qlineargradient(
-                    x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #2d3748, stop:1 #1a202c
-                );
-            }
-        """)
-        
-        layout = QVBoxLayout(card)
-        layout.setSpacing(4)
-        layout.setContentsMargins(8, 8, 8, 8)
-        
-        # İkon
-        icon = QLabel(info.get("icon", "🏠"))
-        icon.setObjectName("icon")
-        icon.setFont(QFont("Segoe UI", 32))
-        icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(icon)
-        
-        # İsim
-        name = QLabel(info["ad"])
-        name.setObjectName("name")
-        name.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        name.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        name.setStyleSheet("color: #c9d1d9;")
-        name.setWordWrap(True)  # Uzun isimler için
-        layout.addWidget(name)
-        
-        # Sıcaklık
-        temp = QLabel("-- °C")
-        temp.setObjectName("temp")
-        temp.setFont(QFont("Segoe UI", 9))
-        temp.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        temp.setStyleSheet("color: #f85149; font-weight: bold;")
-        layout.addWidget(temp)
-        
-        # Tavuk sayısı
-        tavuk = QLabel(f"🐔 {info['tavuk_sayisi']}")
-        tavuk.setObjectName("tavuk")
-        tavuk.setFont(QFont("Segoe UI", 8))
-        tavuk.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        tavuk.setStyleSheet("color: #9ae6b4;")
-        layout.addWidget(tavuk)
-        
-        # Günlük
-        gun = QLabel(f"📅 {info['gunluk']}g")
-        gun.setObjectName("gunluk")
-        gun.setFont(QFont("Segoe UI", 8))
-        gun.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        gun.setStyleSheet("color: #9ae6b4;")
-        layout.addWidget(gun)
-        
-        # Durum
-        status = QLabel("● Normal")
-        status.setObjectName("status")
-        status.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-        status.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        status.setStyleSheet("color: #48bb78;")
-        layout.addWidget(status)
-        
-        # Tıklama olayı
-        card.mousePressEvent = lambda e, kid=kumes_id: self._on_kumes_clicked(kid)
-        self.kumes_widgets[kumes_id] = {
-            'frame': card,
-            'icon': icon,      # ← EKLE
-            'name': name,      # ← EKLE
-            'temp': temp,
-            'status': status,
-            'tavuk': tavuk,    # ← EKLE
-            'gunluk': gun      # ← EKLE
-    }
-        layout.addStretch()
-        return card
-    
-    def _create_enhanced_status_panel(self) -> QFrame:
-        """
-        Responsive sistem durum panelini oluşturur
-        """
-        panel = QFrame()
-        panel.setStyleSheet("""
-            QFrame {
-                background-color: #161b22;
-                border: 2px solid #30363d;
-                border-radius: 12px;
-                padding: 12px;
-            }
-        """)
-        
-        layout = QVBoxLayout(panel)
-        layout.setSpacing(10)
-        
-        # Başlık
-        title = QLabel("📊 SİSTEM DURUMU")
-        title.setFont(QFont("Segoe UI", 13, QFont.Weight.Bold))
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("color: #58a6ff; border: none; padding: 8px;")
-        layout.addWidget(title)
-        
-        # Bağlantı durumu
-        self.connection_status = self._create_status_row("🔌", "Bağlantı", "Bekleniyor...")
-        layout.addWidget(self.connection_status)
-        
-        # Ortalama sıcaklık
-        self.avg_temp = self._create_status_row("🌡️", "Ort. Sıc.", "--°C")
-        layout.addWidget(self.avg_temp)
-        
-        # Ortalama nem
-        self.avg_hum = self._create_status_row("💧", "Ort. Nem", "--%")
-        layout.addWidget(self.avg_hum)
-        
-        # Yem seviyesi
-        self.feed_level = self._create_status_row("🌾", "Yem", "-- cm")
-        layout.addWidget(self.feed_level)
-        
-        # Pompa durumu
-        self.pump_status = self._create_status_row("💦", "Pompa", "Kapalı")
-        layout.addWidget(self.pump_status)
-        
-        # Çalışma süresi
-        self.uptime = self._create_status_row("⏱️", "Çalışma", "00:00:00")
-        layout.addWidget(self.uptime)
-        
-        # Toplam alarm
-        self.total_alarms = self._create_status_row("⚠️", "Alarm", "0")
-        layout.addWidget(self.total_alarms)
-        
-        return panel
-    
-    def _create_status_row(self, icon: str, label: str, value: str) -> QWidget:
-        """
-        Durum satırı widget'ı oluşturur (responsive)
-        """
-        container = QWidget()
-        container.setStyleSheet("""
-            QWidget {
-                background: rgba(22, 27, 34, 0.5);
-                border-radius: 6px;
-                padding: 6px 10px;
-            }
-        """)
-        
-        layout = QHBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(8)
-        
-        # İkon
-        icon_label = QLabel(icon)
-        icon_label.setFont(QFont("Segoe UI", 12))
-        icon_label.setStyleSheet("background: transparent;")
-        layout.addWidget(icon_label)
-        
-        # Etiket
-        label_widget = QLabel(label)
-        label_widget.setFont(QFont("Segoe UI", 9))
-        label_widget.setStyleSheet("color: #8b949e; background: transparent;")
-        layout.addWidget(label_widget)
-        
-        layout.addStretch()
-        
-        # Değer
-        value_label = QLabel(value)
-        value_label.setObjectName("value")
-        value_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-        value_label.setStyleSheet("color: #c9d1d9; background: transparent;")
-        layout.addWidget(value_label)
-        
-        return container
-    
     def _create_tabbed_right_panel(self) -> QTabWidget:
         """
         Sekmeli sağ paneli oluşturur
@@ -534,45 +343,80 @@ class KumesOtomasyonMainWindow(QMainWindow):
         self.detail_tab.addWidget(welcome)
         self.tabs.addTab(self.detail_tab, "📊 Detay")
         
+        # Diğer sekmeler ilk açıldıklarında oluşturulur (ilk boyama hızlanır).
+        # Yeniden girişte önceki oturumun sekmeleri ve referansları bırakılır.
+        if hasattr(self, 'lazy_tabs'):
+            self.lazy_tabs.reset_all()
+        self.lazy_tabs = LazyTabs(self.tabs)
+        
         # SEKME 2: Kontrol
-        self.control_panel = ControlPanel(self.ws)
-       # if not self.user_mgr.is_admin():
-            # User için kontrol panelini devre dışı bırak
-          #  self.control_panel.setEnabled(False)
-           # self.control_panel.setToolTip("⚠️ Bu özellik sadece yöneticiler için")
-        scroll_control = QScrollArea()
-        scroll_control.setWidgetResizable(True)
-        scroll_control.setWidget(self.control_panel)
-        scroll_control.setStyleSheet("QScrollArea { border: none; }")
-        self.tabs.addTab(scroll_control, "🎮 Kontrol")
+        self.lazy_tabs.add("control", "🎮 Kontrol", self._create_control_tab,
+                           on_reset=lambda _: self._forget('control_panel'))
         
         # SEKME 3: Alarmlar
-        self.alarm_view = AlarmView(self.alarm_mgr)
-        #if not self.user_mgr.is_admin():
-            # User için alarm temizleme butonlarını gizle
-            # AlarmView içinde handle edilecek
-           # pass
-        self.tabs.addTab(self.alarm_view, "⚠️ Alarmlar")
+        self.lazy_tabs.add("alarms", "⚠️ Alarmlar", lambda: AlarmView(self.alarm_mgr, self.kumes_bilgileri),
+                           on_create=lambda view: setattr(self, 'alarm_view', view),
+                           on_reset=lambda _: self._forget('alarm_view'))
         
-        # SEKME 4: Ayarlar
-        self.settings_tab = SettingsTab(self.ws, kumes_bilgileri=self.kumes_bilgileri)
-        if not self.user_mgr.is_admin():
-            # User için ayarları devre dışı bırak
-            self.settings_tab.setEnabled(False)
-            self.settings_tab.setToolTip("⚠️ Bu özellik sadece yöneticiler için")
+        # SEKME: Geçmiş grafiği (pyqtgraph / numpy ilk açılışta yüklenir)
+        self.lazy_tabs.add("history", "📈 Geçmiş", self._create_history_tab,
+                           on_reset=self._drop_history_tab)
         
-        self.tabs.addTab(self.settings_tab, "⚙️ Ayarlar")
+        # SEKME 4: Ayarlar
+        self.lazy_tabs.add("settings", "⚙️ Ayarlar", self._create_settings_tab,
+                           on_reset=lambda _: self._forget('settings_tab'))
 
         if self.user_mgr.is_admin():
-            self.user_mgmt_tab = UserManagementTab(self.user_mgr)
-            self.tabs.addTab(self.user_mgmt_tab, "👥 Kullanıcılar")
+            self.lazy_tabs.add("users", "👥 Kullanıcılar", lambda: UserManagementTab(self.user_mgr),
+                               on_create=lambda tab: setattr(self, 'user_mgmt_tab', tab),
+                               on_reset=lambda _: self._forget('user_mgmt_tab'))
         
         # ============ YENİ SEKME 6: Profil ============
-        self.profile_tab = self._create_profile_tab()
-        self.tabs.addTab(self.profile_tab, "👤 Profil")
+        self.lazy_tabs.add("profile", "👤 Profil", self._create_profile_tab,
+                           on_create=lambda tab: setattr(self, 'profile_tab', tab),
+                           on_reset=lambda _: self._forget('profile_tab'))
         
         return self.tabs
     
+    def _create_control_tab(self) -> QWidget:
+        """Kontrol sekmesi (kaydırılabilir)"""
+        self.control_panel = ControlPanel(self.ws)
+        if self._permissions is not None:
+            self._apply_control_permissions()
+        scroll_control = QScrollArea()
+        scroll_control.setWidgetResizable(True)
+        scroll_control.setWidget(self.control_panel)
+        scroll_control.setStyleSheet("QScrollArea { border: none; }")
+        return scroll_control
+    
+    def _create_history_tab(self) -> QWidget:
+        """Geçmiş grafiği sekmesi"""
+        from ui.history_explorer import HistoryExplorer
+        self.history_explorer = HistoryExplorer(self.kumes_bilgileri)
+        return self.history_explorer
+    
+    def _drop_history_tab(self, explorer: QWidget):
+        """Geçmiş sekmesi bırakılırken sorgu iş parçacığı durdurulur"""
+        explorer.shutdown()
+        self._forget('history_explorer')
+    
+    def _forget(self, name: str):
+        """Bırakılan sekmenin pencere referansını siler (hasattr kontrolleri için)"""
+        if hasattr(self, name):
+            delattr(self, name)
+    
+    def _create_settings_tab(self) -> QWidget:
+        """Ayarlar sekmesi"""
+        self.settings_tab = SettingsTab(self.ws, kumes_bilgileri=self.kumes_bilgileri)
+        if not self.user_mgr.is_admin():
+            # User için ayarları devre dışı bırak
+            self.settings_tab.setEnabled(False)
+            self.settings_tab.setToolTip("⚠️ Bu özellik sadece yöneticiler için")
+        if self._permissions is not None:
+            self._apply_control_permissions()
+        self.settings_tab.kumesInfoChanged.connect(self._on_kumes_info_changed)
+        return self.settings_tab
+    
     def _create_profile_tab(self) -> QWidget:
         """Profil sekmesi - Tüm kullanıcılar için"""
         widget = QWidget()
@@ -724,171 +568,181 @@ class KumesOtomasyonMainWindow(QMainWindow):
 
     def _connect_signals(self):
         """Sinyalleri ilgili slot'lara bağlar"""
-        self.ws.dataReceived.connect(self._handle_data)
         self.ws.connectionChanged.connect(self._on_connection_changed)
+        self.updater.kumesStale.connect(self._on_stale_data)
+        self.updater.kumesRecovered.connect(self._on_data_recovered)
         self.alarm_mgr.alarmAdded.connect(self._update_alarm_display)
         self.alarm_mgr.alarmCleared.connect(self._update_alarm_display)
         self.alarm_mgr.alarmCleared.connect(self._on_alarm_cleared)
-        self.settings_tab.kumesInfoChanged.connect(
-            self._on_kumes_info_changed)
+        self.alarm_mgr.alarmCountChanged.connect(
+            lambda count: self.rate_ctrl.set_alarm_active(count > 0))
+        self.tabs.currentChanged.connect(self._update_detail_visibility)
+        self.detail_tab.currentChanged.connect(self._update_detail_visibility)
+
+    def _update_detail_visibility(self, *_):
+        """Detay grafiği ekranda mı (telemetri hızı için)"""
+        self.rate_ctrl.set_detail_open(
+            self.tabs.currentWidget() is self.detail_tab
+            and isinstance(self.detail_tab.currentWidget(), KumesCard))
+
+    def changeEvent(self, event):
+        """Simge durumuna küçültülünce cihaz gönderimi yavaşlatılır"""
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, 'rate_ctrl'):
+            self.rate_ctrl.set_window_visible(not self.isMinimized())
+        super().changeEvent(event)
+
+    def hideEvent(self, event):
+        if hasattr(self, 'rate_ctrl'):
+            self.rate_ctrl.set_window_visible(False)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        if hasattr(self, 'rate_ctrl'):
+            self.rate_ctrl.set_window_visible(not self.isMinimized())
+        super().showEvent(event)
 
     def _on_kumes_info_changed(self, updated_info: dict):
         """Kümes bilgileri değiştiğinde"""
         self.kumes_bilgileri = updated_info
         
-        # Kartları güncelle
-        for kumes_id, info in updated_info.items():
-            if kumes_id in self.kumes_widgets:
-                self._update_kumes_card_info(kumes_id, info)
-    
-    def _update_kumes_card_info(self, kumes_id: int, info: dict):
-        """Kart bilgilerini güncelle"""
-        widgets = self.kumes_widgets[kumes_id]
-        
-        widgets['icon'].setText(info['icon'])
-        widgets['name'].setText(info['ad'])
-        widgets['tavuk'].setText(f"🐔 {info['tavuk_sayisi']} tavuk")
-        widgets['gunluk'].setText(f"📅 {info['gunluk']} günlük")
+        # Karoları güncelle
+        self.kumes_model.set_kumes_info(updated_info)
+        if hasattr(self, 'history_explorer'):
+            self.history_explorer.set_kumes_info(updated_info)
+        if hasattr(self, 'alarm_view'):
+            self.alarm_view.set_kumes_info(updated_info)
 
     def _on_alarm_cleared(self, kumes_id: int):
         """Alarm temizlendiğinde"""
         print(f"🔔 Alarm temizlendi: Kümes {kumes_id}")
+        self.frame_worker.rearm(kumes_id)  # Cihaz hâlâ bildiriyorsa alarm yeniden eklenir
         self._update_kumes_card_alarm(kumes_id, has_alarm=False)
         self._update_alarm_display()
 
-    def _handle_data(self, raw_json: str):
-        """WebSocket'ten gelen JSON verisini işler"""
-        try:
-            data = json.loads(raw_json)
-            
-            if 'kumesler' in data:
-                temps = []
-                hums = []
-                
-                for kumes in data['kumesler']:
-                    kumes_id = kumes.get('id')
-                    self.kumes_data[kumes_id] = kumes
-                    
-                    if kumes_id in self.kumes_widgets:
-                        # Sıcaklık güncelle
-                        temp = kumes.get('sicaklik', 0)
-                        temps.append(temp)
-                        self.kumes_widgets[kumes_id]['temp'].setText(f"{temp:.1f}°C")
-                        
-                        # Nem
-                        hum = kumes.get('nem', 0)
-                        hums.append(hum)
-                        
-                        # Alarm kontrolü
-                        has_alarm = kumes.get('alarm', False)
-                        self._update_kumes_card_alarm(kumes_id, has_alarm)
-                        
-                        if has_alarm:
-                            mesaj = kumes.get('mesaj', 'Alarm!')
-                            self.alarm_mgr.add_alarm(kumes_id, mesaj)
-                
-                # Ortalamalar
-                if temps:
-                    avg_t = sum(temps) / len(temps)
-                    self.avg_temp.findChild(QLabel, "value").setText(f"{avg_t:.1f}°C")
-                
-                if hums:
-                    avg_h = sum(hums) / len(hums)
-                    self.avg_hum.findChild(QLabel, "value").setText(f"{avg_h:.1f}%")
-            
-            # Sistem bilgileri
-            if 'yem' in data:
-                self.feed_level.findChild(QLabel, "value").setText(f"{data['yem']} cm")
-            
-            if 'pompa' in data:
-                status = "Açık" if data['pompa'] else "Kapalı"
-                color = "#48bb78" if data['pompa'] else "#8b949e"
-                value_label = self.pump_status.findChild(QLabel, "value")
-                value_label.setText(status)
-                value_label.setStyleSheet(f"color: {color}; background: transparent; font-weight: bold;")
-            
-            if 'zaman' in data:
-                seconds = data['zaman']
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                secs = seconds % 60
-                self.uptime.findChild(QLabel, "value").setText(f"{hours:02d}:{minutes:02d}:{secs:02d}")
-            
-            # Detay sekmesini güncelle
-            if self.detail_tab.currentWidget() and isinstance(self.detail_tab.currentWidget(), KumesCard):
-                current_id = self.detail_tab.currentWidget().kumes_id
-                if current_id in self.kumes_data:
-                    self.detail_tab.currentWidget().update_data(self.kumes_data[current_id])
-                    
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON parse hatası: {e}")
-        except Exception as e:
-            print(f"❌ Veri işleme hatası: {e}")
+    def _apply_frame_changes(self, changes: FrameChanges):
+        """
+        FrameWorker'ın değişiklik kümesini uygular
+        
+        Çözme, ortalama ve alarm adayı hesabı iş parçacığında yapılmıştır;
+        burada yalnızca durum ve alarmlar güncellenir, widget'lar
+        RenderScheduler ile bir sonraki karede, kare başına bir kez çizilir.
+        """
+        if not timeline.reported:
+            timeline.mark("first_frame")
+        
+        for kumes_id, kumes in changes.kumesler.items():
+            self.kumes_data[kumes_id] = kumes
+            # Model yalnızca değişen karoyu yeniden çizdirir
+            self.renderer.schedule(("kumes", kumes_id), self._render_kumes_card, kumes_id)
+        
+        # Alarm adayları (çizimden bağımsız, hemen)
+        for kumes_id, mesaj in changes.alarms:
+            self.alarm_mgr.add_alarm(kumes_id, mesaj)
+        
+        # Ortalamalar ve sistem bilgileri: kare içinde gelenler birikir
+        if changes.averages or changes.system:
+            self._panel_values.update(
+                {f"avg_{key}": value for key, value in changes.averages.items()})
+            self._panel_values.update(changes.system)
+            self.renderer.schedule("system", self._render_system, widget=self.system_panel)
+        
+        # Detay sekmesi: örnek grafiğe hemen girer, çizim kareye kalır
+        detail = self.detail_tab.currentWidget()
+        if isinstance(detail, KumesCard) and changes.detail is not None:
+            if detail.record(changes.detail):
+                self.renderer.schedule("detail", detail.render, widget=detail)
     
-    def _update_kumes_card_alarm(self, kumes_id: int, has_alarm: bool):
-        """Kümes kartının alarm durumunu günceller"""
-        if kumes_id not in self.kumes_widgets:
+    def _render_kumes_card(self, kumes_id: int):
+        """Sol paneldeki kümes karosunu son veriyle günceller"""
+        kumes = self.kumes_data.get(kumes_id)
+        if kumes is None:
             return
-        
-        status_label = self.kumes_widgets[kumes_id]['status']
-        card_frame = self.kumes_widgets[kumes_id]['frame']
-        
+        self.kumes_model.update_kumes(kumes_id, kumes)
+        self._update_kumes_card_alarm(kumes_id, kumes.get('alarm', False))
+    
+    def _render_system(self):
+        """Ortalama, yem, pompa ve çalışma süresi satırları (yalnızca değişenler)"""
+        values, self._panel_values = self._panel_values, {}
+        if 'avg_temp' in values:
+            self.system_panel.set_avg_temp(values['avg_temp'])
+        if 'avg_hum' in values:
+            self.system_panel.set_avg_hum(values['avg_hum'])
+        if 'yem' in values:
+            self.system_panel.set_feed_level(values['yem'])
+        if 'pompa' in values:
+            self.system_panel.set_pump(bool(values['pompa']))
+        if 'zaman' in values:
+            self.system_panel.set_uptime(values['zaman'])
+    
+    def _update_kumes_card_alarm(self, kumes_id: int, has_alarm: bool):
+        """Kümes karosunun alarm / bayat durumunu günceller"""
         if has_alarm:
-            status_label.setText("⚠️ ALARM")
-            status_label.setStyleSheet("color: #ff4444; font-weight: bold;")
-            
-            current_style = card_frame.styleSheet()
-            new_style = current_style.replace(
-                "border: 3px solid #30363d",
-                "border: 3px solid #ff4444"
-            )
-            card_frame.setStyleSheet(new_style)
+            state = ALARM
+        elif kumes_id in self.stale_kumes:
+            state = STALE
         else:
-            status_label.setText("● Normal")
-            status_label.setStyleSheet("color: #48bb78; font-weight: bold;")
-            
-            current_style = card_frame.styleSheet()
-            new_style = current_style.replace(
-                "border: 3px solid #ff4444",
-                "border: 3px solid #30363d"
-            )
-            card_frame.setStyleSheet(new_style)
+            state = NORMAL
+        
+        # Durum aynıysa karo yeniden çizilmez
+        self.kumes_model.set_state(kumes_id, state)
     
     def _update_alarm_display(self):
         """Genel alarm sayısını günceller"""
-        count = self.alarm_mgr.get_alarm_count()
-        color = "#ff4444" if count > 0 else "#8b949e"
-        
-        value_label = self.total_alarms.findChild(QLabel, "value")
-        if value_label:
-            value_label.setText(str(count))
-            value_label.setStyleSheet(f"color: {color}; background: transparent; font-weight: bold;")
+        self.system_panel.set_alarm_count(self.alarm_mgr.get_alarm_count())
+
+    def _on_stale_data(self, kumes_id: int, age: float):
+        """Bağlantı açık olsa da kümesten güncel veri gelmiyorsa alarm üretir"""
+        self.alarm_mgr.add_alarm(kumes_id, STALE_DATA_MESSAGE, SEVERITY_WARNING)
+        self._set_kumes_stale(kumes_id, True)
+
+    def _on_data_recovered(self, kumes_id: int):
+        """Bayat kümesten yeniden veri geldi: uyarı alarmı kalkar"""
+        self.alarm_mgr.remove_alarm(kumes_id, STALE_DATA_MESSAGE)
+        self._update_alarm_display()
+        self._set_kumes_stale(kumes_id, False)
+
+    def _set_kumes_stale(self, kumes_id: int, stale: bool):
+        """Kartı bayat / normal görünüme alır (alarm görünümü önceliklidir)"""
+        if stale:
+            self.stale_kumes.add(kumes_id)
+        else:
+            self.stale_kumes.discard(kumes_id)
+        self._update_kumes_card_alarm(
+            kumes_id, self.kumes_data.get(kumes_id, {}).get('alarm', False))
+
+        detail = self.detail_tab.currentWidget()
+        if isinstance(detail, KumesCard) and detail.kumes_id == kumes_id:
+            detail.set_stale(stale)
 
     def _on_connection_changed(self, connected: bool):
         """Bağlantı durumu değiştiğinde"""
         status = "Bağlı ✓" if connected else "Bağlı Değil"
-        color = "#48bb78" if connected else "#ff4444"
-        
         self.setWindowTitle(f"{APP_TITLE} - {status}")
-        
-        value_label = self.connection_status.findChild(QLabel, "value")
-        if value_label:
-            value_label.setText(status)
-            value_label.setStyleSheet(f"color: {color}; background: transparent; font-weight: bold;")
+        self.system_panel.set_connection(connected, status)
 
     def _on_kumes_clicked(self, kumes_id: int):
         """Kümes kartına tıklandığında"""
         # Önceki detay widget'ları temizle
+        self.renderer.cancel("detail")
         while self.detail_tab.count() > 1:
             widget = self.detail_tab.widget(1)
             self.detail_tab.removeWidget(widget)
             widget.deleteLater()
         
-        # Yeni detay kartı oluştur
+        # Yeni detay kartı oluştur (iş parçacığı bu kümesin her örneğini gönderir)
+        self.frame_worker.set_watched(kumes_id)
         detail_card = KumesCard(kumes_id)
         if kumes_id in self.kumes_data:
             detail_card.update_data(self.kumes_data[kumes_id])
         
+        # Kart butonları komutları kuyruğa bırakır (hızlı tıklamalar birleştirilir)
+        detail_card.ledToggled.connect(
+            lambda kid, on: self.ws.send_command(LedCommand(kumes=kid, on=on)))
+        detail_card.fanToggled.connect(
+            lambda kid, on: self.ws.send_command(FanCommand(kumes=kid, on=on)))
+        detail_card.doorToggled.connect(
+            lambda kid, on: self.ws.send_command(DoorCommand(kumes=kid, open=on)))
+        
         self.detail_tab.addWidget(detail_card)
         self.detail_tab.setCurrentWidget(detail_card)
         self.tabs.setCurrentIndex(0)
@@ -922,19 +776,9 @@ class KumesOtomasyonMainWindow(QMainWindow):
         print(f"   - is_admin: {is_admin}")
         print(f"   - admin_active: {admin_active}")
     
-    # Kontrol panelindeki butonları bul ve güncelle
-        if hasattr(self, 'control_panel'):
-        # Eğer ControlPanel'de set_controls_enabled metodu varsa
-           if hasattr(self.control_panel, 'set_controls_enabled'):
-            self.control_panel.set_controls_enabled(can_control)
-           else:
-            # Yoksa manuel olarak butonları güncelle
-            for widget in self.control_panel.findChildren(QPushButton):
-                widget.setEnabled(can_control)
-    
-    # Ayarlar sekmesini güncelle (sadece admin aktif modda)
-        if hasattr(self, 'settings_tab'):
-           self.settings_tab.setEnabled(admin_active)
+    # Sekmeler henüz oluşmadıysa oluştuklarında uygulanır
+        self._permissions = (can_control, admin_active)
+        self._apply_control_permissions()
     
     # TabWidget'teki ayarlar sekmesini kontrol et
         if hasattr(self, 'tab_widget'):
@@ -950,6 +794,24 @@ class KumesOtomasyonMainWindow(QMainWindow):
     # Info banner güncelle
         self.update_info_banner()
 
+    def _apply_control_permissions(self):
+        """Kontrol paneli ve ayarlar sekmesine son yetkileri uygular"""
+        can_control, admin_active = self._permissions
+        
+    # Kontrol panelindeki butonları bul ve güncelle
+        if hasattr(self, 'control_panel'):
+        # Eğer ControlPanel'de set_controls_enabled metodu varsa
+           if hasattr(self.control_panel, 'set_controls_enabled'):
+            self.control_panel.set_controls_enabled(can_control)
+           else:
+            # Yoksa manuel olarak butonları güncelle
+            for widget in self.control_panel.findChildren(QPushButton):
+                widget.setEnabled(can_control)
+    
+    # Ayarlar sekmesini güncelle (sadece admin aktif modda)
+        if hasattr(self, 'settings_tab'):
+           self.settings_tab.setEnabled(admin_active)
+
     def update_header(self):
         """Header'daki kullanıcı bilgisini güncelle"""
         if not hasattr(self, 'user_info_label'):
@@ -1108,6 +970,11 @@ class KumesOtomasyonMainWindow(QMainWindow):
             if hasattr(self, 'ws') and self.ws:
                 self.ws.disconnect()
             
+            if hasattr(self, 'history_explorer'):
+                self.history_explorer.shutdown()
+            
+            self.frame_worker.stop()
+            
             if hasattr(self, 'db') and self.db:
                 self.db.close()
             
@@ -10,7 +10,9 @@ PWA Test Sunucusu - SessionManager & Auth Destekli
 
 import asyncio
 import websockets
-import json
+from core import codec
+from core.ws_compression import CompressionStats, server_options
+from core.subscriptions import Subscription, SubscriptionHub
 import random
 import time
 from http.server import HTTPServer, SimpleHTTPRequestHandler
@@ -81,7 +83,13 @@ def generate_mock_data():
 # ==================== WEBSOCKET HANDLER ====================
 connected_clients = set()
 
-async def handle_websocket(websocket, path):
+# permessage-deflate istatistikleri (mobil veri üzerindeki PWA istemcileri için)
+compression_stats = CompressionStats()
+
+# İstemci abonelikleri (kümes / ölçüm / hız filtresi)
+subscriptions = SubscriptionHub()
+
+async def handle_websocket(websocket, path=None):
     """WebSocket bağlantısını yönet"""
     global admin_session_id, admin_mode
     
@@ -92,7 +100,7 @@ async def handle_websocket(websocket, path):
     print(f"🔌 Yeni bağlantı: Client #{client_id}")
     
     # Auth gerekli mesajı gönder
-    await websocket.send(json.dumps({
+    await websocket.send(codec.dumps({
         "type": "auth_required",
         "message": "Lütfen giriş yapın"
     }))
@@ -100,7 +108,7 @@ async def handle_websocket(websocket, path):
     try:
         async for message in websocket:
             try:
-                data = json.loads(message)
+                data = codec.loads(message)
                 msg_type = data.get("type")
                 
                 # ==================== AUTH ====================
@@ -132,7 +140,7 @@ async def handle_websocket(websocket, path):
                             # Önceki admin varsa override
                             if admin_session_id and admin_session_id in active_sessions:
                                 old_ws = active_sessions[admin_session_id]["websocket"]
-                                await old_ws.send(json.dumps({
+                                await old_ws.send(codec.dumps({
                                     "type": "admin_override",
                                     "message": "Başka bir cihazdan admin girişi yapıldı",
                                     "new_admin_client": client_type
@@ -161,7 +169,7 @@ async def handle_websocket(websocket, path):
                         if user["role"] == "admin":
                             response["admin_mode"] = session["admin_mode"]
                         
-                        await websocket.send(json.dumps(response))
+                        await websocket.send(codec.dumps(response))
                         
                         print(f"✅ {username} ({user['role']}) giriş yaptı - Kontrol: {session['can_control']}")
                         
@@ -175,7 +183,7 @@ async def handle_websocket(websocket, path):
                     
                     else:
                         # Hatalı giriş
-                        await websocket.send(json.dumps({
+                        await websocket.send(codec.dumps({
                             "type": "auth_failed",
                             "message": "Kullanıcı adı veya şifre hatalı"
                         }))
@@ -198,7 +206,7 @@ async def handle_websocket(websocket, path):
                             update_permissions()
                             
                             # Admin'e onay
-                            await websocket.send(json.dumps({
+                            await websocket.send(codec.dumps({
                                 "type": "mode_changed",
                                 "mode": new_mode
                             }))
@@ -217,6 +225,24 @@ async def handle_websocket(websocket, path):
                                     "admin_mode": "active"
                                 }, exclude_roles=["admin"])
                 
+                # ==================== ABONELİK ====================
+                elif msg_type == "subscribe":
+                    try:
+                        subscription = Subscription.from_message(data)
+                    except (TypeError, ValueError):
+                        await websocket.send(codec.dumps({
+                            "type": "subscribe_failed",
+                            "message": "Geçersiz abonelik"
+                        }))
+                        continue
+                    
+                    subscriptions.subscribe(websocket, subscription)
+                    await websocket.send(codec.dumps({
+                        "type": "subscribed",
+                        **subscription.to_dict()
+                    }))
+                    print(f"📋 Abonelik: Client #{client_id} → {subscription.to_dict()}")
+                
                 # ==================== KOMUT ====================
                 elif msg_type == "command":
                     sid = data.get("session_id")
@@ -229,19 +255,19 @@ async def handle_websocket(websocket, path):
                             print(f"📤 Komut: {command} (by {session['username']})")
                             
                             # Başarı mesajı
-                            await websocket.send(json.dumps({
+                            await websocket.send(codec.dumps({
                                 "type": "command_sent",
                                 "command": command
                             }))
                         else:
                             # Yetki yok
-                            await websocket.send(json.dumps({
+                            await websocket.send(codec.dumps({
                                 "type": "permission_denied",
                                 "message": "Bu işlem için kontrol yetkisi gerekli"
                             }))
                             print(f"❌ Komut reddedildi: {session['username']} (Yetki yok)")
             
-            except json.JSONDecodeError:
+            except codec.DecodeError:
                 print("❌ JSON parse hatası")
     
     except websockets.exceptions.ConnectionClosed:
@@ -250,6 +276,7 @@ async def handle_websocket(websocket, path):
     finally:
         # Bağlantı kesildi
         connected_clients.discard(websocket)
+        subscriptions.remove(websocket)
         
         # Session temizle
         if session_id and session_id in active_sessions:
@@ -272,10 +299,11 @@ async def handle_websocket(websocket, path):
             update_permissions()
         
         print(f"⚠️ Bağlantı kesildi: Client #{client_id}")
+        print(f"   📉 Sıkıştırma: {compression_stats.summary()}")
 
 async def broadcast(message, exclude=None, exclude_roles=None):
     """Tüm clientlara mesaj gönder"""
-    msg_json = json.dumps(message)
+    msg_json = codec.dumps(message)
     
     for sid, session in active_sessions.items():
         ws = session["websocket"]
@@ -299,18 +327,20 @@ async def send_periodic_data():
         
         if connected_clients:
             data = generate_mock_data()
-            data_json = json.dumps(data)
             
-            # Tüm clientlara gönder
+            # Her farklı abonelik bir kez kodlanır, aynı aboneler metni paylaşır
             disconnected = set()
-            for client in connected_clients:
-                try:
-                    await client.send(data_json)
-                except:
-                    disconnected.add(client)
+            for data_json, clients in subscriptions.fanout(data, list(connected_clients)):
+                for client in clients:
+                    try:
+                        await client.send(data_json)
+                    except:
+                        disconnected.add(client)
             
             # Kopmuş clientları temizle
             connected_clients.difference_update(disconnected)
+            for client in disconnected:
+                subscriptions.remove(client)
 
 # ==================== HTTP SERVER ====================
 class CORSRequestHandler(SimpleHTTPRequestHandler):
@@ -356,7 +386,8 @@ async def main():
     http_thread.start()
     
     # WebSocket sunucusu (farklı port!)
-    async with websockets.serve(handle_websocket, "localhost", 8765):
+    async with websockets.serve(handle_websocket, "localhost", 8765,
+                                **server_options(compression_stats)):
         # Periyodik veri gönderme task'ı
         await send_periodic_data()
 
@@ -14,7 +14,9 @@ from flask import Flask, send_from_directory, jsonify, request
 from flask_cors import CORS
 from flask_sock import Sock
 import os
-import json
+from core import codec
+from core.ws_compression import DeflateEstimator
+from core.subscriptions import Subscription, SubscriptionHub
 import time
 import random
 import threading
@@ -30,6 +32,13 @@ PWA_DIR = os.path.join(os.path.dirname(__file__), 'pwa')
 
 # ==================== GLOBAL DEĞİŞKENLER ====================
 connected_clients = []
+
+# flask-sock sıkıştırmayı kendisi müzakere eder (ayarlanamaz); burada
+# WS_DEFLATE ayarlarıyla tahmini oran ve CPU maliyeti ölçülür
+deflate_estimator = DeflateEstimator()
+
+# İstemci abonelikleri (kümes / ölçüm / hız filtresi)
+subscriptions = SubscriptionHub()
 authenticated_clients = {}
 mock_data_running = True
 
@@ -148,19 +157,25 @@ def generate_mock_data():
 def send_data_to_clients():
     """Tüm bağlı clientlara veri gönder"""
     if authenticated_clients:
-        data_json = json.dumps(kumes_data)
-        print(f"📤 {len(authenticated_clients)} client'a veri gönderiliyor...")
+        # Her farklı abonelik bir kez kodlanır, aynı aboneler metni paylaşır
+        batches = subscriptions.fanout(kumes_data, list(authenticated_clients))
+        for data_json, _ in batches:
+            deflate_estimator.measure(data_json.encode("utf-8"))
+        print(f"📤 {sum(len(c) for _, c in batches)} client'a {len(batches)} farklı çerçeve gönderiliyor... "
+              f"(deflate tahmini: {deflate_estimator.stats.summary()})")
         
         # Disconnected clientları temizle
         disconnected = []
-        for ws, username in authenticated_clients.items():
-            try:
-                ws.send(data_json)
-            except:
-                disconnected.append(ws)
+        for data_json, clients in batches:
+            for ws in clients:
+                try:
+                    ws.send(data_json)
+                except:
+                    disconnected.append(ws)
         
         for ws in disconnected:
-            del authenticated_clients[ws]
+            authenticated_clients.pop(ws, None)
+            subscriptions.remove(ws)
 
 # ==================== WEBSOCKET HANDLER ====================
 @sock.route('/ws')
@@ -170,7 +185,7 @@ def websocket(ws):
     connected_clients.append(ws)
     
     # Auth gerekli mesajı gönder
-    ws.send(json.dumps({
+    ws.send(codec.dumps({
         "type": "auth_required",
         "message": "Lütfen giriş yapın"
     }))
@@ -184,7 +199,7 @@ def websocket(ws):
             print(f"📥 Mesaj alındı: {message}")
             
             try:
-                data = json.loads(message)
+                data = codec.loads(message)
                 msg_type = data.get('type', '')
                 
                 # AUTH mesajı
@@ -204,32 +219,47 @@ def websocket(ws):
                             "role": role
                         }
                         
-                        ws.send(json.dumps(response))
+                        ws.send(codec.dumps(response))
                         print(f"✅ Auth başarılı: {username} ({role})")
                         
                         # İlk veriyi gönder
-                        ws.send(json.dumps(kumes_data))
+                        ws.send(subscriptions.project_for(ws, kumes_data))
                     else:
                         # Başarısız auth
                         response = {
                             "type": "auth_failed",
                             "message": "Kullanıcı adı veya şifre hatalı"
                         }
-                        ws.send(json.dumps(response))
+                        ws.send(codec.dumps(response))
                         print(f"❌ Auth başarısız: {username}")
                 
+                # SUBSCRIBE mesajı (kümes / ölçüm / hız filtresi)
+                elif msg_type == 'subscribe':
+                    try:
+                        subscription = Subscription.from_message(data)
+                    except (TypeError, ValueError):
+                        ws.send(codec.dumps({
+                            "type": "subscribe_failed",
+                            "message": "Geçersiz abonelik"
+                        }))
+                        continue
+                    
+                    subscriptions.subscribe(ws, subscription)
+                    ws.send(codec.dumps({"type": "subscribed", **subscription.to_dict()}))
+                    print(f"📋 Abonelik: {subscription.to_dict()}")
+                
                 # COMMAND mesajı
                 elif msg_type == 'command':
                     if ws in authenticated_clients:
                         command = data.get('command', '')
                         handle_command(command, ws)
                     else:
-                        ws.send(json.dumps({
+                        ws.send(codec.dumps({
                             "type": "error",
                             "message": "Önce giriş yapmalısınız"
                         }))
                 
-            except json.JSONDecodeError:
+            except codec.DecodeError:
                 print(f"⚠️ JSON parse hatası: {message}")
     
     except Exception as e:
@@ -239,6 +269,7 @@ def websocket(ws):
         # Bağlantı kesildi
         if ws in connected_clients:
             connected_clients.remove(ws)
+        subscriptions.remove(ws)
         if ws in authenticated_clients:
             username = authenticated_clients[ws]
             del authenticated_clients[ws]
@@ -255,7 +286,7 @@ def handle_command(command, ws):
         state = command.split(":")[1]
         for kumes in kumes_data["kumesler"]:
             kumes["led"] = (state == "1")
-        ws.send(json.dumps({"type": "ok", "command": "LED"}))
+        ws.send(codec.dumps({"type": "ok", "command": "LED"}))
     
     # FAN kontrol
     elif command.startswith("FAN"):
@@ -265,33 +296,33 @@ def handle_command(command, ws):
         
         if 1 <= fan_id <= 3:
             kumes_data["kumesler"][fan_id - 1]["fan"] = (state == "1")
-            ws.send(json.dumps({"type": "ok", "command": f"FAN{fan_id}"}))
+            ws.send(codec.dumps({"type": "ok", "command": f"FAN{fan_id}"}))
     
     # POMPA kontrol
     elif command.startswith("POMPA:"):
         state = command.split(":")[1]
         kumes_data["pompa"] = (state == "1")
-        ws.send(json.dumps({"type": "ok", "command": "POMPA"}))
+        ws.send(codec.dumps({"type": "ok", "command": "POMPA"}))
     
     # KAPI kontrol
     elif command.startswith("KAPI:"):
         angle = command.split(":")[1]
         print(f"🚪 Kapı açısı: {angle}°")
-        ws.send(json.dumps({"type": "ok", "command": "KAPI"}))
+        ws.send(codec.dumps({"type": "ok", "command": "KAPI"}))
     
     # YEM dağıt
     elif command.startswith("YEM:"):
         duration = command.split(":")[1]
         print(f"🌾 Yem dağıtılıyor ({duration} saniye)...")
         kumes_data["yem"] = max(0, kumes_data["yem"] - 1)
-        ws.send(json.dumps({"type": "ok", "command": "YEM"}))
+        ws.send(codec.dumps({"type": "ok", "command": "YEM"}))
     
     # STATUS
     elif command == "STATUS":
-        ws.send(json.dumps(kumes_data))
+        ws.send(subscriptions.project_for(ws, kumes_data))
     
     else:
-        ws.send(json.dumps({
+        ws.send(codec.dumps({
             "type": "error",
             "message": f"Bilinmeyen komut: {command}"
         }))
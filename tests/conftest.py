@@ -0,0 +1,15 @@
+# tests/conftest.py
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Sinyal / zamanlayıcı kullanan testler için tek QApplication"""
+    return QApplication.instance() or QApplication([])
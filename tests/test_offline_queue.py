@@ -0,0 +1,45 @@
+# tests/test_offline_queue.py
+import time
+
+from core import offline_queue
+from core.offline_queue import OfflineCommandStore
+from core.websocket_bridge import WebSocketBridge
+
+
+def test_push_keeps_given_times(tmp_path):
+    store = OfflineCommandStore(str(tmp_path / "kuyruk.db"), ttl=60)
+    store.push({"action": "yem_ver"}, created=100.0, expires=160.0)
+
+    entry = store.conn.execute(
+        'SELECT olusturma, son_gecerlilik FROM bekleyen_komutlar').fetchone()
+    assert entry == (100.0, 160.0)
+    store.close()
+
+
+def test_reparked_command_expires_at_original_deadline(tmp_path, qapp, monkeypatch):
+    bridge = WebSocketBridge(offline_path=str(tmp_path / "kuyruk.db"))
+    bridge.offline.ttl = 60
+    bridge.offline.push({"action": "yem_ver"})
+    created, expires = bridge.offline.conn.execute(
+        'SELECT olusturma, son_gecerlilik FROM bekleyen_komutlar').fetchone()
+
+    # Bağlanınca yeniden gönderilir, soket yazılamadan kopar ve tekrar saklanır
+    monkeypatch.setattr(offline_queue.time, "time", lambda: created + 30)
+    bridge.connected, bridge.ws = True, object()
+    for entry in bridge.offline.pop_all():
+        assert bridge.send_tracked(entry.payload, durable=True,
+                                   origin=(entry.created, entry.expires)) is not None
+    for payload in bridge.outbox.clear():
+        bridge._park_unsent(payload)
+
+    assert bridge.offline.conn.execute(
+        'SELECT olusturma, son_gecerlilik FROM bekleyen_komutlar').fetchone() == (created, expires)
+
+    # İlk son geçerlilikten sonra artık gönderilmez
+    monkeypatch.setattr(offline_queue.time, "time", lambda: expires + 1)
+    assert bridge.offline.pop_all() == []
+    assert bridge.offline.count() == 0
+
+    bridge.connected, bridge.ws = False, None
+    bridge.tracker.cancel_all()
+    bridge.offline.close()
@@ -0,0 +1,59 @@
+# tests/test_sensor_history.py
+import time
+
+from core.database import DatabaseManager, SensorHistoryReader
+from data.frame_worker import FrameWorker
+from data.sensor_recorder import SensorRecorder
+
+
+def _frame(sicaklik: float) -> dict:
+    return {"kumesler": [
+        {"id": 1, "sicaklik": sicaklik, "nem": 50, "su": 3, "isik": 400},
+        {"id": 2, "sicaklik": sicaklik + 5, "nem": 60},
+    ]}
+
+
+def test_recorder_throttles_per_coop(tmp_path):
+    db = DatabaseManager(str(tmp_path / "kumes.db"))
+    recorder = SensorRecorder(db, interval=10.0)
+
+    assert recorder.record(_frame(20.0), now=100.0) == 2
+    assert recorder.record(_frame(21.0), now=105.0) == 0
+    assert recorder.record({"kumesler": [{"id": 3, "sicaklik": 1.0}]}, now=106.0) == 1
+    assert recorder.record(_frame(22.0), now=110.0) == 2
+
+    rows = db.conn.execute(
+        "SELECT kumes_id, COUNT(*) FROM kumes_veriler GROUP BY kumes_id").fetchall()
+    assert rows == [(1, 2), (2, 2), (3, 1)]
+    db.close()
+
+
+def test_frames_are_readable_through_history_reader(tmp_path, qapp):
+    path = str(tmp_path / "kumes.db")
+    db = DatabaseManager(path)
+    worker = FrameWorker(recorder=SensorRecorder(db, interval=0.0))
+    worker.start()
+    for value in (20.0, 24.0, 22.0):
+        worker.submit(_frame(value))
+
+    deadline = time.time() + 5
+    while worker.frames_in < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    worker.stop()
+    assert worker.recorder.rows_written == 6
+
+    reader = SensorHistoryReader(path)
+    start = int(time.time()) // 3600 * 3600 - 3600
+    try:
+        # Dakikalık özet (kova 60 sn) ve ham tablo (kova 1 sn) aynı örnekleri görür
+        for width, count in ((60, 120), (1, 7200)):
+            buckets = reader.buckets(1, "sicaklik", start, width, count)
+            assert sum(b[1] for b in buckets) == 3
+            assert min(b[2] for b in buckets) == 20.0
+            assert max(b[3] for b in buckets) == 24.0
+
+        assert sum(b[1] for b in reader.buckets(2, "nem", start, 60, 120)) == 3
+        assert reader.buckets(1, "su_seviyesi", start, 60, 120)[0][2] == 3
+    finally:
+        reader.close()
+        db.close()
@@ -0,0 +1,86 @@
+# tests/test_stale_alarm.py
+from functools import partial
+from types import SimpleNamespace
+
+from core.alarm_manager import AlarmManager, STALE_DATA_MESSAGE, SEVERITY_CRITICAL
+from core.link_stats import LinkStats
+from data import real_time_updater
+from data.real_time_updater import RealTimeDataUpdater
+from main_tayyar import KumesOtomasyonMainWindow
+
+
+class FakeBridge:
+    """Bağlı görünen, yalnızca link_stats'ı olan köprü"""
+
+    def __init__(self):
+        self.link_stats = LinkStats()
+        self.commands = []
+
+    def is_connected(self):
+        return True
+
+    def send_command(self, command):
+        self.commands.append(command)
+        return True
+
+    def reconnect(self):
+        pass
+
+
+def _window(alarm_mgr):
+    """Pencerenin bayat veri işleyicilerini gerçek AlarmManager ile çalıştırır"""
+    window = SimpleNamespace(alarm_mgr=alarm_mgr, stale=set())
+    window._update_alarm_display = lambda: None
+    window._set_kumes_stale = lambda kumes_id, stale: (
+        window.stale.add(kumes_id) if stale else window.stale.discard(kumes_id))
+    window._on_stale_data = partial(KumesOtomasyonMainWindow._on_stale_data, window)
+    window._on_data_recovered = partial(KumesOtomasyonMainWindow._on_data_recovered, window)
+    return window
+
+
+def _step(updater, bridge, monkeypatch, now, kumes=()):
+    """`now` anında kümes verisi gelir (varsa) ve bekçi bir kez çalışır"""
+    if kumes:
+        bridge.link_stats.record_inbound(100, now=now)
+        bridge.link_stats.touch_kumes(kumes, now=now)
+    monkeypatch.setattr(real_time_updater.time, "monotonic", lambda: now)
+    updater._update()
+
+
+def test_recovery_clears_stale_alarm(qapp, monkeypatch):
+    bridge = FakeBridge()
+    alarm_mgr = AlarmManager(None)
+    counts = []
+    alarm_mgr.alarmCountChanged.connect(counts.append)
+
+    window = _window(alarm_mgr)
+    updater = RealTimeDataUpdater(bridge, interval_ms=1000)
+    updater.kumesStale.connect(window._on_stale_data)
+    updater.kumesRecovered.connect(window._on_data_recovered)
+
+    _step(updater, bridge, monkeypatch, 1000.0, kumes=[1, 2])
+    assert alarm_mgr.get_alarm_count() == 0
+
+    # Kümes 2 güncellenmeye devam eder, kümes 1 susar
+    _step(updater, bridge, monkeypatch, 1010.0, kumes=[2])
+    assert [a["mesaj"] for a in alarm_mgr.get_active_alarms()] == [STALE_DATA_MESSAGE]
+    assert window.stale == {1}
+
+    _step(updater, bridge, monkeypatch, 1011.0, kumes=[1, 2])
+    assert alarm_mgr.get_alarm_count() == 0
+    assert window.stale == set()
+    assert counts[-1] == 0
+
+
+def test_recovery_keeps_device_alarm(qapp):
+    alarm_mgr = AlarmManager(None)
+    window = _window(alarm_mgr)
+    cleared = []
+    alarm_mgr.alarmCleared.connect(cleared.append)
+
+    alarm_mgr.add_alarm(1, "Sıcaklık yüksek", SEVERITY_CRITICAL)
+    window._on_stale_data(1, 20.0)
+    window._on_data_recovered(1)
+
+    assert [a["mesaj"] for a in alarm_mgr.get_active_alarms()] == ["Sıcaklık yüksek"]
+    assert cleared == []  # Kümesin cihaz alarmı sürüyor
@@ -0,0 +1,212 @@
+# ui/alarm_model.py
+"""
+Alarm tablosu için Model/View sınıfları
+
+- ActiveAlarmModel: AlarmManager'daki aktif alarmlar; ekleme / silme tek
+  satırlık beginInsertRows / beginRemoveRows ile bildirilir, tablo baştan
+  kurulmaz.
+- AlarmHistoryModel: Veritabanındaki alarm geçmişi; satırlar kaydırdıkça
+  sayfa sayfa yüklenir (canFetchMore / fetchMore).
+- AlarmFilterProxy: Kümes ve seviyeye göre süzme.
+"""
+from typing import List, Optional, Tuple
+
+from PyQt6.QtCore import (
+    QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+)
+from PyQt6.QtGui import QColor
+
+from core.alarm_manager import AlarmManager, SEVERITY_CRITICAL, SEVERITY_LABELS
+from core.config import ALARM_HISTORY_PAGE_SIZE
+
+# Satır: (kümes no, seviye, mesaj, zaman metni)
+AlarmRow = Tuple[object, str, str, str]
+
+COLUMNS = ["Kümes No", "Seviye", "Durum/Mesaj", "Kayıt Zamanı"]
+COL_KUMES, COL_SEVIYE, COL_MESAJ, COL_ZAMAN = range(len(COLUMNS))
+
+SEVERITY_COLORS = {
+    SEVERITY_CRITICAL: QColor("#d32f2f"),
+}
+DEFAULT_SEVERITY_COLOR = QColor("#f57c00")
+_CENTER = int(Qt.AlignmentFlag.AlignCenter)
+_LEFT = int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+
+
+def _format_time(zaman) -> str:
+    if hasattr(zaman, 'strftime'):
+        return zaman.strftime("%Y-%m-%d %H:%M:%S")
+    return str(zaman or '')
+
+
+class _AlarmTableModel(QAbstractTableModel):
+    """Ortak sütunlar ve gösterim; satırlar önceden biçimlendirilmiş tuple'lardır"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[AlarmRow] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        kumes_id, seviye, mesaj, zaman = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COL_KUMES:
+                return f"Kümes {kumes_id}"
+            if column == COL_SEVIYE:
+                return SEVERITY_LABELS.get(seviye, seviye)
+            if column == COL_MESAJ:
+                return mesaj
+            return zaman
+        if role == Qt.ItemDataRole.ForegroundRole and column in (COL_SEVIYE, COL_MESAJ):
+            return SEVERITY_COLORS.get(seviye, DEFAULT_SEVERITY_COLOR)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _LEFT if column == COL_MESAJ else _CENTER
+        return None
+
+    def alarm_at(self, row: int) -> AlarmRow:
+        """Kaynak satırın ham değerleri (filtre için)"""
+        return self._rows[row]
+
+
+class ActiveAlarmModel(_AlarmTableModel):
+    """AlarmManager.active_alarms'ın satır satır aynası"""
+
+    def __init__(self, alarm_manager: AlarmManager, parent=None):
+        super().__init__(parent)
+        self.alarm_mgr = alarm_manager
+        self._load()
+
+        self.alarm_mgr.alarmInserted.connect(self._on_inserted)
+        self.alarm_mgr.alarmRemoved.connect(self._on_removed)
+        self.alarm_mgr.alarmsReset.connect(self.reload)
+
+    @staticmethod
+    def _to_row(alarm: dict) -> AlarmRow:
+        return (
+            alarm.get('kumes_id') or alarm.get('id', '?'),
+            alarm.get('seviye', SEVERITY_CRITICAL),
+            alarm.get('mesaj', 'Bilinmeyen hata'),
+            _format_time(alarm.get('zaman') or alarm.get('timestamp', '')),
+        )
+
+    def _load(self):
+        self._rows = [self._to_row(alarm) for alarm in self.alarm_mgr.active_alarms]
+
+    def reload(self):
+        """Tüm listeyi yeniden okur (toplu temizleme)"""
+        self.beginResetModel()
+        self._load()
+        self.endResetModel()
+
+    def _on_inserted(self, row: int):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, self._to_row(self.alarm_mgr.active_alarms[row]))
+        self.endInsertRows()
+
+    def _on_removed(self, row: int):
+        if not 0 <= row < len(self._rows):
+            self.reload()
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+
+class AlarmHistoryModel(_AlarmTableModel):
+    """
+    Veritabanındaki alarm geçmişi (en yeni üstte)
+
+    İlk sayfa açılışta, sonrakiler görünüm sona yaklaştıkça yüklenir. Kümes /
+    seviye filtresi sorguya eklenir; böylece seyrek eşleşmelerde binlerce
+    satır boşuna belleğe alınmaz.
+    """
+
+    def __init__(self, db, page_size: int = ALARM_HISTORY_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.page_size = page_size
+        self.kumes_id: Optional[int] = None
+        self.severity: Optional[str] = None
+        self._last_id: Optional[int] = None
+        self._exhausted = False
+
+    def set_filter(self, kumes_id: Optional[int] = None, severity: Optional[str] = None):
+        """Filtre değişince baştan yükler"""
+        if (kumes_id, severity) == (self.kumes_id, self.severity) and self._rows:
+            return
+        self.kumes_id, self.severity = kumes_id, severity
+        self.refresh()
+
+    def refresh(self):
+        self.beginResetModel()
+        self._rows = []
+        self._last_id = None
+        self._exhausted = False
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and self.db is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        try:
+            page = self.db.get_alarm_history(
+                before_id=self._last_id, limit=self.page_size,
+                kumes_id=self.kumes_id, severity=self.severity)
+        except Exception as e:
+            print(f"❌ Alarm geçmişi okunamadı: {e}")
+            self._exhausted = True
+            return
+
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if not page:
+            return
+
+        self._last_id = page[-1]['id']
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(
+            (row['kumes_id'], row.get('seviye') or SEVERITY_CRITICAL, row['mesaj'], row['timestamp'])
+            for row in page)
+        self.endInsertRows()
+
+
+class AlarmFilterProxy(QSortFilterProxyModel):
+    """Kümes ve seviye filtresi (None = hepsi)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.kumes_id: Optional[int] = None
+        self.severity: Optional[str] = None
+
+    def set_filter(self, kumes_id: Optional[int] = None, severity: Optional[str] = None):
+        if (kumes_id, severity) == (self.kumes_id, self.severity):
+            return
+        self.kumes_id, self.severity = kumes_id, severity
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self.kumes_id is None and self.severity is None:
+            return True
+        kumes_id, seviye, _, _ = self.sourceModel().alarm_at(source_row)
+        if self.kumes_id is not None and kumes_id != self.kumes_id:
+            return False
+        if self.severity is not None and seviye != self.severity:
+            return False
+        return True
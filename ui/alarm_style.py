@@ -0,0 +1,61 @@
+# ui/alarm_style.py
+"""
+Kümes kartlarının alarm / normal / bayat görünümü
+
+Durum, widget'ın `alarmState` dinamik özelliğinde tutulur; renkler aşağıdaki
+özellik seçicili stil bloğundan gelir. Böylece her çerçevede `styleSheet()`
+okunup `str.replace` ile yeniden yazılmaz - Qt stil metnini bir kez ayrıştırır,
+durum gerçekten değiştiğinde yalnızca ilgili widget yeniden cilalanır (polish).
+
+Qt'de widget'ın kendi stil metni uygulama stilinden önce gelir; bu yüzden
+seçiciler kartın kendi stiline bir kez eklenir (bkz. KumesCard):
+
+    QGroupBox[alarmState="alarm"] { border: 4px solid ...; }
+    set_alarm_state(card, ALARM)
+
+Kendi çizen bileşenler (kümes ızgarası) aynı durum adlarını, metinleri ve
+renkleri kullanır.
+"""
+from PyQt6.QtWidgets import QWidget
+
+STATE_PROPERTY = "alarmState"
+
+NORMAL = "normal"
+ALARM = "alarm"
+STALE = "stale"   # Bağlantı açık ama kümesten veri gelmiyor
+
+# Durum etiketi metinleri
+STATE_TEXTS = {
+    NORMAL: "● Normal",
+    ALARM: "⚠️ ALARM",
+    STALE: "⏸ Veri yok",
+}
+
+# Durum renkleri (kenarlık / durum metni); kendi çizen bileşenler de kullanır
+STATE_COLORS = {
+    NORMAL: "#48bb78",
+    ALARM: "#ff4444",
+    STALE: "#d29922",
+}
+
+def alarm_state(widget: QWidget) -> str:
+    """Widget'ın mevcut görsel durumu (atanmamışsa NORMAL)"""
+    return widget.property(STATE_PROPERTY) or NORMAL
+
+
+def set_alarm_state(widget: QWidget, state: str) -> bool:
+    """
+    Görsel durumu değiştirir; durum aynıysa hiçbir şey yapmaz
+
+    Returns:
+        Durum değiştiyse True
+    """
+    if widget.property(STATE_PROPERTY) == state:
+        return False
+    widget.setProperty(STATE_PROPERTY, state)
+    # Özellik seçicileri ancak yeniden cilalamada değerlendirilir
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
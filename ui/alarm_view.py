@@ -1,23 +1,42 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QPushButton, QLabel, QHeaderView, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QComboBox,
+    QPushButton, QLabel, QHeaderView, QMessageBox
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
-from core.alarm_manager import AlarmManager
+from typing import Dict, Optional
+from core.alarm_manager import AlarmManager, SEVERITY_LABELS
+from core.config import KUMES_BILGILERI
+from ui.alarm_model import ActiveAlarmModel, AlarmHistoryModel, AlarmFilterProxy
+
+MODE_ACTIVE = 0
+MODE_HISTORY = 1
 
 
 class AlarmView(QWidget):
-    """Aktif alarmları gösteren tablo ve yönetim paneli"""
+    """
+    Aktif alarmları ve alarm geçmişini gösteren tablo ve yönetim paneli
+
+    Tablo bir QTableView + model; alarm eklenip silindikçe yalnızca ilgili
+    satır güncellenir. Geçmiş kipinde satırlar kaydırdıkça yüklenir.
+    Kümes filtresi pencerenin kümes bilgileri ve alarmı olan kümeslerden
+    oluşur; havuzdaki başka cihazların kümesleri de listelenir.
+    """
 
-    def __init__(self, alarm_manager: AlarmManager, parent=None):
+    def __init__(self, alarm_manager: AlarmManager,
+                 kumes_info: Optional[Dict[int, dict]] = None, parent=None):
         super().__init__(parent)
         self.alarm_mgr = alarm_manager
+        self.kumes_info = dict(kumes_info or KUMES_BILGILERI)
+        self.active_model = ActiveAlarmModel(alarm_manager, self)
+        self.history_model = AlarmHistoryModel(getattr(alarm_manager, 'db', None), parent=self)
+        self.proxy = AlarmFilterProxy(self)
+        self.proxy.setSourceModel(self.active_model)
+        
         self._init_ui()
         self._connect_signals()
         
-        # Başlangıçta mevcut alarmları yükle
-        self.update_table()
+        # Başlangıçta mevcut alarm sayısını göster
+        self._update_count(self.alarm_mgr.get_alarm_count())
 
     def _init_ui(self):
         """Arayüz bileşenlerini oluşturur"""
@@ -35,7 +54,7 @@ class AlarmView(QWidget):
         self._create_buttons(layout)
 
     def _create_info_panel(self, parent_layout):
-        """Üst bilgi panelini oluşturur"""
+        """Üst bilgi ve filtre panelini oluşturur"""
         info_layout = QHBoxLayout()
         
         self.count_label = QLabel("Aktif Alarm: 0")
@@ -45,34 +64,62 @@ class AlarmView(QWidget):
         info_layout.addWidget(self.count_label)
         info_layout.addStretch()
         
+        # Görünüm: aktif alarmlar / geçmiş
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Aktif Alarmlar", MODE_ACTIVE)
+        self.mode_combo.addItem("Alarm Geçmişi", MODE_HISTORY)
+        self.mode_combo.setEnabled(self.history_model.db is not None)
+        self.mode_combo.currentIndexChanged.connect(self._on_mode_changed)
+        info_layout.addWidget(self.mode_combo)
+        
+        # Kümes filtresi
+        self.kumes_combo = QComboBox()
+        self._fill_kumes_combo()
+        self.kumes_combo.currentIndexChanged.connect(self._apply_filter)
+        info_layout.addWidget(self.kumes_combo)
+        
+        # Seviye filtresi
+        self.severity_combo = QComboBox()
+        self.severity_combo.addItem("Tüm Seviyeler", None)
+        for severity, label in SEVERITY_LABELS.items():
+            self.severity_combo.addItem(label, severity)
+        self.severity_combo.currentIndexChanged.connect(self._apply_filter)
+        info_layout.addWidget(self.severity_combo)
+        
         parent_layout.addLayout(info_layout)
 
     def _create_table(self, parent_layout):
         """Alarm tablosunu oluşturur"""
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Kümes No", "Durum/Mesaj", "Kayıt Zamanı"])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         
         # Sütun genişlikleri
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        
+        # Sabit satır yüksekliği: on binlerce satırda ölçüm yapılmaz
+        rows = self.table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(28)
+        rows.setVisible(False)
         
         # Tablo özellikleri
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
         
         # Stil
         self.table.setStyleSheet("""
-            QTableWidget { 
+            QTableView { 
                 gridline-color: #e2e8f0; 
                 border: 1px solid #cbd5e0;
                 background-color: white;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e3f2fd;
                 color: black;
             }
@@ -86,7 +133,7 @@ class AlarmView(QWidget):
         button_layout.setSpacing(10)
         
         # Seçili alarmı sil butonu
-        remove_btn = QPushButton("Seçili Alarmı Sil")
+        self.remove_btn = remove_btn = QPushButton("Seçili Alarmı Sil")
         remove_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         remove_btn.setStyleSheet("""
             QPushButton { 
@@ -108,7 +155,7 @@ class AlarmView(QWidget):
         button_layout.addWidget(remove_btn)
         
         # Tümünü temizle butonu
-        clear_btn = QPushButton("Tüm Alarmları Temizle")
+        self.clear_btn = clear_btn = QPushButton("Tüm Alarmları Temizle")
         clear_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         clear_btn.setStyleSheet("""
             QPushButton { 
@@ -132,60 +179,73 @@ class AlarmView(QWidget):
         parent_layout.addLayout(button_layout)
 
     def _connect_signals(self):
-        """AlarmManager sinyallerini bağlar"""
-        # Sinyal varlığını kontrol et ve bağla
-        if hasattr(self.alarm_mgr, 'alarmAdded'):
-            self.alarm_mgr.alarmAdded.connect(self.update_table)
-        
-        if hasattr(self.alarm_mgr, 'alarmCleared'):
-            self.alarm_mgr.alarmCleared.connect(self.update_table)
-        
-        if hasattr(self.alarm_mgr, 'alarmRemoved'):
-            self.alarm_mgr.alarmRemoved.connect(self.update_table)
-        
-        if hasattr(self.alarm_mgr, 'alarmCountChanged'):
-            self.alarm_mgr.alarmCountChanged.connect(self._update_count)
+        """AlarmManager sinyallerini bağlar (satırları model günceller)"""
+        self.alarm_mgr.alarmCountChanged.connect(self._update_count)
+        self.alarm_mgr.alarmInserted.connect(self._on_alarm_inserted)
+
+    def set_kumes_info(self, kumes_info: Dict[int, dict]):
+        """Kümes bilgileri değişince filtre listesi yenilenir"""
+        self.kumes_info = dict(kumes_info)
+        self._fill_kumes_combo()
+
+    def _fill_kumes_combo(self):
+        """Kümes filtresini kümes bilgileri + aktif alarmların kümesleriyle doldurur"""
+        selected = self.kumes_combo.currentData()
+        kumes_ids = set(self.kumes_info)
+        kumes_ids.update(alarm['kumes_id'] for alarm in self.alarm_mgr.get_active_alarms()
+                         if alarm.get('kumes_id') is not None)
+
+        self.kumes_combo.blockSignals(True)
+        self.kumes_combo.clear()
+        self.kumes_combo.addItem("Tüm Kümesler", None)
+        for kumes_id in sorted(kumes_ids):
+            info = self.kumes_info.get(kumes_id, {})
+            self.kumes_combo.addItem(f"{kumes_id} - {info.get('ad', 'Kümes')}", kumes_id)
+        self.kumes_combo.setCurrentIndex(max(0, self.kumes_combo.findData(selected)))
+        self.kumes_combo.blockSignals(False)
+
+        if self.kumes_combo.currentData() != selected:
+            self._apply_filter()
+
+    def _on_alarm_inserted(self, row: int):
+        """Listede olmayan kümesin alarmı geldiyse filtreye eklenir"""
+        kumes_id = self.alarm_mgr.active_alarms[row].get('kumes_id')
+        if kumes_id is not None and self.kumes_combo.findData(kumes_id) < 0:
+            self._fill_kumes_combo()
+
+    def _current_mode(self) -> int:
+        return self.mode_combo.currentData()
+
+    def _on_mode_changed(self):
+        """Aktif alarmlar ile geçmiş arasında geçiş"""
+        history = self._current_mode() == MODE_HISTORY
+        self.remove_btn.setEnabled(not history)
+        self.clear_btn.setEnabled(not history)
+        if history:
+            self.history_model.refresh()
+            self.proxy.setSourceModel(self.history_model)
+        else:
+            self.proxy.setSourceModel(self.active_model)
+        self._apply_filter()
+
+    def _apply_filter(self):
+        kumes_id = self.kumes_combo.currentData()
+        severity = self.severity_combo.currentData()
+        if self._current_mode() == MODE_HISTORY:
+            # Geçmişte filtre sorguya iner; proxy aynı koşulla tutarlı kalır
+            self.history_model.set_filter(kumes_id, severity)
+        self.proxy.set_filter(kumes_id, severity)
 
     def update_table(self):
         """
-        Alarm tablosunu günceller
-        NOT: Bu metod public olmalı (main.py'den çağrılıyor)
+        Tabloyu yeniden yükler
+        NOT: Model sinyallerle güncellenir; bu metod yalnızca uyumluluk için
         """
-        try:
-            alarms = self.alarm_mgr.get_active_alarms()
-            
-            self.table.setRowCount(len(alarms))
-            
-            for row, alarm in enumerate(alarms):
-                # Kümes sütunu (ID)
-                kumes_id = alarm.get('kumes_id') or alarm.get('id', '?')
-                kumes_item = QTableWidgetItem(f"Kümes {kumes_id}")
-                kumes_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 0, kumes_item)
-                
-                # Mesaj sütunu
-                mesaj = alarm.get('mesaj', 'Bilinmeyen hata')
-                msg_item = QTableWidgetItem(mesaj)
-                msg_item.setForeground(QColor("#d32f2f"))  # Kırmızı
-                msg_item.setTextAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                self.table.setItem(row, 1, msg_item)
-                
-                # Zaman sütunu
-                zaman = alarm.get('zaman') or alarm.get('timestamp', '')
-                if hasattr(zaman, 'strftime'):
-                    zaman_str = zaman.strftime("%Y-%m-%d %H:%M:%S")
-                else:
-                    zaman_str = str(zaman)
-                
-                time_item = QTableWidgetItem(zaman_str)
-                time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 2, time_item)
-            
-            # Sayacı güncelle
-            self._update_count(len(alarms))
-            
-        except Exception as e:
-            print(f"Tablo güncelleme hatası: {e}")
+        if self._current_mode() == MODE_HISTORY:
+            self.history_model.refresh()
+        else:
+            self.active_model.reload()
+        self._update_count(self.alarm_mgr.get_alarm_count())
 
     def _update_count(self, count: int):
         """Alarm sayısı etiketini günceller"""
@@ -199,9 +259,10 @@ class AlarmView(QWidget):
 
     def _remove_selected(self):
         """Seçili satırdaki alarmı siler"""
-        current_row = self.table.currentRow()
+        current = self.table.currentIndex()
+        current_row = self.proxy.mapToSource(current).row() if current.isValid() else -1
         
-        if current_row < 0:
+        if current_row < 0 or self._current_mode() != MODE_ACTIVE:
             QMessageBox.warning(
                 self, 
                 "Uyarı", 
@@ -219,8 +280,7 @@ class AlarmView(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.alarm_mgr.remove_alarm_by_index(current_row):
-                self.update_table()
+            self.alarm_mgr.remove_alarm_by_index(current_row)
 
     def _clear_all(self):
         """Tüm alarmları temizler"""
@@ -242,5 +302,4 @@ class AlarmView(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.alarm_mgr.clear_all()
-            self.update_table()
\ No newline at end of file
+            self.alarm_mgr.clear_all()
\ No newline at end of file
@@ -5,6 +5,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from core.commands import (
+    FanCommand, LedCommand, PumpCommand, ServoDoorCommand, FeedCommand, AutoModeCommand
+)
 
 
 class ControlPanel(QWidget):
@@ -34,13 +37,12 @@ class ControlPanel(QWidget):
 
     def _send_command(self, action: str, kumes: int = None):
         """JSON formatında komut gönder"""
-        import json
         cmd = {"action": action}
         if kumes is not None:
             cmd["kumes"] = kumes
 
         if self.sender and self.sender.is_connected():
-            self.sender.send_command(json.dumps(cmd))
+            self.sender.send_command(cmd)
             print(f"✅ Komut gönderildi: {cmd}")
         else:
             QMessageBox.warning(
@@ -49,7 +51,7 @@ class ControlPanel(QWidget):
                 "ESP32'ye bağlı değilsiniz!\n\nLütfen bağlantıyı kontrol edin."
             )
 
-    def _send(self, cmd: str):
+    def _send(self, cmd):
         success = self.sender.send_command(cmd)
         if success:
             print(f"Komut gönderildi: {cmd}")
@@ -74,11 +76,11 @@ class ControlPanel(QWidget):
 
             btn_on = QPushButton("AÇ")
             btn_on.setStyleSheet("background-color: #4caf50; color: white;")
-            btn_on.clicked.connect(lambda checked, x=i: self._send(f"FAN{x}:1"))
+            btn_on.clicked.connect(lambda checked, x=i: self._send(FanCommand(kumes=x, on=True)))
 
             btn_off = QPushButton("KAPAT")
             btn_off.setStyleSheet("background-color: #f44336; color: white;")
-            btn_off.clicked.connect(lambda checked, x=i: self._send(f"FAN{x}:0"))
+            btn_off.clicked.connect(lambda checked, x=i: self._send(FanCommand(kumes=x, on=False)))
 
             fan_layout.addWidget(lbl, 0, col, 1, 2)
             fan_layout.addWidget(btn_on, 1, col)
@@ -95,11 +97,11 @@ class ControlPanel(QWidget):
 
         btn_led_on = QPushButton("TÜM IŞIKLARI AÇ")
         btn_led_on.setStyleSheet("background-color: #ffc107; color: black; font-size: 15px;")
-        btn_led_on.clicked.connect(lambda: self._send("LED:1"))
+        btn_led_on.clicked.connect(lambda: self._send(LedCommand(on=True)))
 
         btn_led_off = QPushButton("TÜM IŞIKLARI KAPAT")
         btn_led_off.setStyleSheet("background-color: #424242; color: white; font-size: 15px;")
-        btn_led_off.clicked.connect(lambda: self._send("LED:0"))
+        btn_led_off.clicked.connect(lambda: self._send(LedCommand(on=False)))
 
         led_layout.addWidget(btn_led_on)
         led_layout.addWidget(btn_led_off)
@@ -114,11 +116,11 @@ class ControlPanel(QWidget):
 
         btn_pompa_on = QPushButton("POMPA BAŞLAT (10 sn)")
         btn_pompa_on.setStyleSheet("background-color: #2196f3; color: white;")
-        btn_pompa_on.clicked.connect(lambda: self._send("POMPA:1"))
+        btn_pompa_on.clicked.connect(lambda: self._send(PumpCommand(on=True)))
 
         btn_pompa_off = QPushButton("POMPA DURDUR")
         btn_pompa_off.setStyleSheet("background-color: #d32f2f; color: white;")
-        btn_pompa_off.clicked.connect(lambda: self._send("POMPA:0"))
+        btn_pompa_off.clicked.connect(lambda: self._send(PumpCommand(on=False)))
 
         su_layout.addWidget(btn_pompa_on)
         su_layout.addWidget(btn_pompa_off)
@@ -146,7 +148,7 @@ class ControlPanel(QWidget):
         self.angle_label.setStyleSheet("color: #667eea; min-width: 60px;")
 
         self.kapi_slider.valueChanged.connect(
-            lambda v: [self.angle_label.setText(f"{v}°"), self._send(f"KAPI:{v}")]
+            lambda v: [self.angle_label.setText(f"{v}°"), self._send(ServoDoorCommand(derece=v))]
         )
 
         slider_layout.addWidget(slider_lbl)
@@ -158,15 +160,15 @@ class ControlPanel(QWidget):
         btn_layout = QHBoxLayout()
         btn_kapat = QPushButton("TAM KAPAT (0°)")
         btn_kapat.setStyleSheet("background-color: #9e9e9e; color: white;")
-        btn_kapat.clicked.connect(lambda: [self.kapi_slider.setValue(0), self._send("KAPI:0")])
+        btn_kapat.clicked.connect(lambda: [self.kapi_slider.setValue(0), self._send(ServoDoorCommand(derece=0))])
 
         btn_yari = QPushButton("YARI AÇIK (45°)")
         btn_yari.setStyleSheet("background-color: #ff9800; color: white;")
-        btn_yari.clicked.connect(lambda: [self.kapi_slider.setValue(45), self._send("KAPI:45")])
+        btn_yari.clicked.connect(lambda: [self.kapi_slider.setValue(45), self._send(ServoDoorCommand(derece=45))])
 
         btn_ac = QPushButton("TAM AÇ (90°)")
         btn_ac.setStyleSheet("background-color: #4caf50; color: white;")
-        btn_ac.clicked.connect(lambda: [self.kapi_slider.setValue(90), self._send("KAPI:90")])
+        btn_ac.clicked.connect(lambda: [self.kapi_slider.setValue(90), self._send(ServoDoorCommand(derece=90))])
 
         btn_layout.addWidget(btn_kapat)
         btn_layout.addWidget(btn_yari)
@@ -191,7 +193,7 @@ class ControlPanel(QWidget):
 
         btn_yem = QPushButton("YEM DAĞIT")
         btn_yem.setStyleSheet("background-color: #8bc34a; color: white; font-size: 16px;")
-        btn_yem.clicked.connect(lambda: self._send(f"YEM:{self.yem_spin.value()}"))
+        btn_yem.clicked.connect(lambda: self._send(FeedCommand(miktar=self.yem_spin.value())))
 
         yem_layout.addWidget(yem_lbl)
         yem_layout.addWidget(self.yem_spin)
@@ -206,11 +208,11 @@ class ControlPanel(QWidget):
 
         btn_auto_on = QPushButton("OTOMATİK MODU AKTİF ET")
         btn_auto_on.setStyleSheet("background-color: #9c27b0; color: white; font-size: 15px;")
-        btn_auto_on.clicked.connect(lambda: self._send("AUTO:1"))
+        btn_auto_on.clicked.connect(lambda: self._send(AutoModeCommand(value=True)))
 
         btn_auto_off = QPushButton("MANUEL MODA GEÇ")
         btn_auto_off.setStyleSheet("background-color: #ff5722; color: white; font-size: 15px;")
-        btn_auto_off.clicked.connect(lambda: self._send("AUTO:0"))
+        btn_auto_off.clicked.connect(lambda: self._send(AutoModeCommand(value=False)))
 
         mode_layout.addWidget(btn_auto_on)
         mode_layout.addWidget(btn_auto_off)
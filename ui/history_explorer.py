@@ -0,0 +1,397 @@
+# ui/history_explorer.py
+"""
+Geçmiş grafiği gezgini
+
+Görünen zaman aralığı, ekran pikseli başına bir kova düşecek şekilde bir kova
+genişliğine çevrilir ve aralık sabit kova sayılı parçalara (tile) bölünür.
+Her parça arka plan iş parçacığında tek bir GROUP BY sorgusuyla (min / max /
+ortalama) okunur ve (kümes, metrik, genişlik, parça no) anahtarıyla önbelleğe
+alınır. Görünen parçaların iki yanındaki parçalar da önceden istenir; böylece
+aylar boyunca kaydırırken grafik sorgu beklemez. Sekme görünürken ve görünüm
+şimdiki zamanı içeriyorsa grafik HISTORY_LIVE_REFRESH aralığıyla kayar ve
+şimdiki zamanın parçası yeniden okunur.
+
+    explorer = HistoryExplorer(kumes_info)
+    ...
+    explorer.shutdown()   # Pencere kapanırken sorgu iş parçacığını durdurur
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from pyqtgraph import DateAxisItem, FillBetweenItem, PlotWidget, mkBrush, mkPen
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtWidgets import (
+    QComboBox, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+)
+
+from core.config import (
+    DB_PATH, HISTORY_BUCKET_WIDTHS, HISTORY_CACHE_TILES, HISTORY_LIVE_REFRESH,
+    HISTORY_TILE_BUCKETS, KUMES_BILGILERI
+)
+from core.database import SensorHistoryReader
+
+# Metrik → (etiket, renk)
+METRICS = {
+    "sicaklik": ("🌡️ Sıcaklık (°C)", "#f85149"),
+    "nem": ("💧 Nem (%)", "#58a6ff"),
+    "su_seviyesi": ("🚰 Su Seviyesi", "#3fb950"),
+    "isik_seviyesi": ("💡 Işık Seviyesi", "#d29922"),
+}
+
+# Hazır aralıklar (saniye)
+RANGE_PRESETS = (
+    ("1 Saat", 3600),
+    ("1 Gün", 86400),
+    ("1 Hafta", 7 * 86400),
+    ("1 Ay", 30 * 86400),
+    ("6 Ay", 182 * 86400),
+)
+
+REFRESH_DELAY_MS = 40  # Kaydırma / yakınlaştırma olaylarını tek sorguda birleştirir
+
+
+class TileKey(NamedTuple):
+    """Önbellek anahtarı: parça no, epoch'tan itibaren hizalı aralığı belirler"""
+    kumes_id: int
+    metric: str
+    width: int
+    index: int
+
+    @property
+    def start(self) -> int:
+        return self.index * self.width * HISTORY_TILE_BUCKETS
+
+    @property
+    def end(self) -> int:
+        return self.start + self.width * HISTORY_TILE_BUCKETS
+
+
+@dataclass
+class HistoryTile:
+    """Bir parçanın kova dizileri (veri olmayan kovalar NaN)"""
+    x: np.ndarray
+    vmin: np.ndarray
+    vmax: np.ndarray
+    avg: np.ndarray
+    fetched_at: float
+
+    def is_live(self, key: TileKey) -> bool:
+        """Parça sorgulandığında henüz bitmemiş bir aralığı kapsıyordu"""
+        return key.end > self.fetched_at
+
+
+def pick_bucket_width(seconds_per_pixel: float) -> int:
+    """Piksel başına en az bir kova düşecek en küçük kova genişliği"""
+    for width in HISTORY_BUCKET_WIDTHS:
+        if width >= seconds_per_pixel:
+            return width
+    return HISTORY_BUCKET_WIDTHS[-1]
+
+
+def build_tile(key: TileKey, buckets: list, fetched_at: float) -> HistoryTile:
+    """Sorgu satırlarını sabit uzunluklu dizilere yerleştirir"""
+    count = HISTORY_TILE_BUCKETS
+    x = key.start + (np.arange(count) + 0.5) * key.width
+    vmin = np.full(count, np.nan)
+    vmax = np.full(count, np.nan)
+    avg = np.full(count, np.nan)
+    if buckets:
+        rows = np.asarray(buckets, dtype=np.float64)
+        index = rows[:, 0].astype(np.int64)
+        vmin[index] = rows[:, 2]
+        vmax[index] = rows[:, 3]
+        avg[index] = rows[:, 4]
+    return HistoryTile(x, vmin, vmax, avg, fetched_at)
+
+
+class HistoryTileCache:
+    """En son kullanılan parçaları tutan LRU önbellek"""
+
+    def __init__(self, max_tiles: int = HISTORY_CACHE_TILES):
+        self.max_tiles = max_tiles
+        self._tiles: "OrderedDict[TileKey, HistoryTile]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, key: TileKey) -> Optional[HistoryTile]:
+        tile = self._tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._tiles.move_to_end(key)
+        return tile
+
+    def put(self, key: TileKey, tile: HistoryTile):
+        self._tiles[key] = tile
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+
+    def needs_fetch(self, key: TileKey, now: float) -> bool:
+        """Parça yoksa ya da şimdiki zamanı içerip eskidiyse True"""
+        tile = self._tiles.get(key)
+        if tile is None:
+            return True
+        return tile.is_live(key) and now - tile.fetched_at >= HISTORY_LIVE_REFRESH
+
+
+class HistoryQueryWorker(QThread):
+    """
+    Parça sorgularını sırayla çalıştıran arka plan iş parçacığı
+
+    `request()` bekleyen listeyi tamamen değiştirir: kullanıcı kaydırmaya devam
+    ettikçe artık görünmeyen aralıkların sorguları hiç çalıştırılmaz.
+    """
+
+    tileReady = pyqtSignal(object, object)  # (TileKey, HistoryTile)
+
+    def __init__(self, db_path: str = DB_PATH, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self._cond = threading.Condition()
+        self._pending: List[TileKey] = []
+        self._current: Optional[TileKey] = None
+        self._running = True
+
+    def request(self, keys: List[TileKey]):
+        """Öncelik sırasıyla istenen parçalar (çalışmakta olan tekrar istenmez)"""
+        with self._cond:
+            self._pending = [key for key in keys if key != self._current]
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._cond.notify()
+        self.wait(2000)
+
+    def run(self):
+        try:
+            reader = SensorHistoryReader(self.db_path)  # Bağlantı bu iş parçacığına ait
+        except Exception as e:
+            print(f"❌ Geçmiş veritabanı açılamadı: {e}")
+            return
+
+        try:
+            while True:
+                with self._cond:
+                    while self._running and not self._pending:
+                        self._cond.wait()
+                    if not self._running:
+                        return
+                    key = self._current = self._pending.pop(0)
+
+                try:
+                    fetched_at = time.time()
+                    buckets = reader.buckets(key.kumes_id, key.metric, key.start,
+                                             key.width, HISTORY_TILE_BUCKETS)
+                    tile = build_tile(key, buckets, fetched_at)
+                except Exception as e:
+                    print(f"❌ Geçmiş sorgusu başarısız ({key}): {e}")
+                    tile = None
+
+                with self._cond:
+                    self._current = None
+                if tile is not None:
+                    self.tileReady.emit(key, tile)
+        finally:
+            reader.close()
+
+
+class HistoryExplorer(QWidget):
+    """Kümes / metrik seçilebilen, yakınlaştırılabilir geçmiş grafiği"""
+
+    def __init__(self, kumes_info: Optional[Dict[int, dict]] = None,
+                 db_path: str = DB_PATH, parent=None):
+        super().__init__(parent)
+        self.kumes_info = kumes_info or KUMES_BILGILERI
+        self.cache = HistoryTileCache()
+        self._visible: List[TileKey] = []
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._refresh)
+
+        # Canlı görünüm: yalnızca sekme görünürken çalışır (showEvent / hideEvent)
+        self._live_timer = QTimer(self)
+        self._live_timer.setInterval(int(HISTORY_LIVE_REFRESH * 1000))
+        self._live_timer.timeout.connect(self._on_live_tick)
+
+        self.worker = HistoryQueryWorker(db_path, self)
+        self.worker.tileReady.connect(self._on_tile_ready)
+        self.worker.start()
+
+        self._init_ui()
+        self.show_last(86400)
+
+    # ------------------------------------------------------------------
+    # Arayüz
+    # ------------------------------------------------------------------
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(8)
+
+        toolbar = QHBoxLayout()
+        self.kumes_combo = QComboBox()
+        self.set_kumes_info(self.kumes_info)
+        self.kumes_combo.currentIndexChanged.connect(self._on_selection_changed)
+        toolbar.addWidget(self.kumes_combo)
+
+        self.metric_combo = QComboBox()
+        for metric, (label, _) in METRICS.items():
+            self.metric_combo.addItem(label, metric)
+        self.metric_combo.currentIndexChanged.connect(self._on_selection_changed)
+        toolbar.addWidget(self.metric_combo)
+
+        toolbar.addStretch()
+        for title, seconds in RANGE_PRESETS:
+            button = QPushButton(title)
+            button.clicked.connect(lambda _, s=seconds: self.show_last(s))
+            toolbar.addWidget(button)
+        layout.addLayout(toolbar)
+
+        self.plot = PlotWidget(axisItems={'bottom': DateAxisItem()})
+        self.plot.setBackground('#0d1117')
+        self.plot.showGrid(x=True, y=True, alpha=0.3)
+        self.plot.setMouseEnabled(x=True, y=False)   # Yalnızca zaman ekseni gezilir
+        self.plot.enableAutoRange(axis='y')
+        self.plot.setAutoVisible(y=True)
+        self.plot.setLimits(minXRange=60)
+
+        self.min_curve = self.plot.plot(connect='finite')
+        self.max_curve = self.plot.plot(connect='finite')
+        self.band = FillBetweenItem(self.min_curve, self.max_curve)
+        self.plot.addItem(self.band)
+        self.avg_curve = self.plot.plot(connect='finite')
+        self._apply_metric_style()
+
+        self.plot.sigXRangeChanged.connect(lambda *_: self._refresh_timer.start())
+        layout.addWidget(self.plot, stretch=1)
+
+        self.info_label = QLabel("")
+        self.info_label.setFont(QFont("Segoe UI", 9))
+        self.info_label.setStyleSheet("color: #8b949e;")
+        layout.addWidget(self.info_label)
+
+    def set_kumes_info(self, kumes_info: Dict[int, dict]):
+        """Kümes adları değişince listeyi günceller (seçim korunur)"""
+        self.kumes_info = kumes_info
+        selected = self.kumes_combo.currentData()
+        self.kumes_combo.blockSignals(True)
+        self.kumes_combo.clear()
+        for kumes_id in sorted(kumes_info):
+            name = kumes_info[kumes_id].get("ad", f"Kümes {kumes_id}")
+            self.kumes_combo.addItem(f"🏠 {kumes_id} - {name}", kumes_id)
+        index = self.kumes_combo.findData(selected)
+        self.kumes_combo.setCurrentIndex(max(index, 0))
+        self.kumes_combo.blockSignals(False)
+
+    def _apply_metric_style(self):
+        color = QColor(METRICS[self.metric_combo.currentData()][1])
+        edge = QColor(color)
+        edge.setAlpha(110)
+        fill = QColor(color)
+        fill.setAlpha(50)
+        self.min_curve.setPen(mkPen(edge, width=1))
+        self.max_curve.setPen(mkPen(edge, width=1))
+        self.band.setBrush(mkBrush(fill))
+        self.avg_curve.setPen(mkPen(color, width=2))
+
+    def show_last(self, seconds: int):
+        """Son `seconds` saniyeyi gösterir"""
+        now = time.time()
+        self.plot.setXRange(now - seconds, now, padding=0)
+        self._refresh_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._live_timer.start()
+        self._refresh_timer.start()   # Gizliyken eskiyen parça hemen yenilensin
+
+    def hideEvent(self, event):
+        self._live_timer.stop()
+        super().hideEvent(event)
+
+    def _on_live_tick(self):
+        """Görünüm şimdiki zamanı içeriyorsa sağ kenarı şimdiye kaydırır"""
+        x0, x1 = self.plot.getViewBox().viewRange()[0]
+        now = time.time()
+        if not x0 <= now <= x1 + HISTORY_LIVE_REFRESH * 1.5:
+            return  # Kullanıcı geçmişe bakıyor; görünüm değişmez
+        if x1 < now:
+            # Aralık değişimi sigXRangeChanged → _refresh ile yeniden sorgulanır
+            self.plot.setXRange(now - (x1 - x0), now, padding=0)
+        else:
+            self._refresh()
+
+    def _on_selection_changed(self, *_):
+        # Önceki kümesin / metriğin eğrileri yeni veri gelene kadar kalmasın
+        for curve in (self.min_curve, self.max_curve, self.avg_curve):
+            curve.setData([], [])
+        self._apply_metric_style()
+        self._refresh()
+
+    # ------------------------------------------------------------------
+    # Sorgu / önbellek
+    # ------------------------------------------------------------------
+    def _refresh(self):
+        """Görünen aralığın parçalarını belirler; eksikleri ve komşuları ister"""
+        kumes_id = self.kumes_combo.currentData()
+        metric = self.metric_combo.currentData()
+        if kumes_id is None:
+            return
+
+        x0, x1 = self.plot.getViewBox().viewRange()[0]
+        pixels = max(self.plot.getViewBox().width(), 1.0)
+        width = pick_bucket_width((x1 - x0) / pixels)
+        span = width * HISTORY_TILE_BUCKETS
+        first, last = int(x0 // span), int(x1 // span)
+
+        self._visible = [TileKey(kumes_id, metric, width, i) for i in range(first, last + 1)]
+        # Komşu parçalar: kaydırma yönü bilinmediği için iki yan da önceden okunur
+        prefetch = [TileKey(kumes_id, metric, width, first - 1),
+                    TileKey(kumes_id, metric, width, last + 1)]
+
+        now = time.time()
+        missing = [key for key in self._visible + prefetch
+                   if key.start <= now and self.cache.needs_fetch(key, now)]
+        self.worker.request(missing)
+        self._draw()
+
+        self.info_label.setText(
+            f"Çözünürlük: {width} sn/kova   •   Parça: {len(self._visible)} görünür, "
+            f"{len(missing)} sorguda   •   Önbellek: {len(self.cache)} parça")
+
+    def _on_tile_ready(self, key: TileKey, tile: HistoryTile):
+        self.cache.put(key, tile)
+        if key in self._visible:
+            self._draw()
+
+    def _draw(self):
+        """Önbellekteki görünür parçaları birleştirip çizer"""
+        tiles = [tile for tile in (self.cache.get(key) for key in self._visible) if tile]
+        if not tiles:
+            # Yeni çözünürlük henüz gelmedi: eski çizim (aynı eksende) kalır
+            return
+        x = np.concatenate([t.x for t in tiles])
+        self.min_curve.setData(x, np.concatenate([t.vmin for t in tiles]))
+        self.max_curve.setData(x, np.concatenate([t.vmax for t in tiles]))
+        self.avg_curve.setData(x, np.concatenate([t.avg for t in tiles]))
+
+    def shutdown(self):
+        """Sorgu iş parçacığını durdurur"""
+        self._refresh_timer.stop()
+        self._live_timer.stop()
+        self.worker.stop()
@@ -3,23 +3,37 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt, pyqtSignal
-from collections import deque
+import importlib.util
+import time
+from ui.alarm_style import STATE_PROPERTY, NORMAL, ALARM, STALE, set_alarm_state
 
 # Config import'ları - eksik olanlar için varsayılan değerler
 try:
-    from core.config import CARD_BORDER_COLOR, ALARM_COLOR, SUCCESS_COLOR
+    from core.config import CARD_BORDER_COLOR, ALARM_COLOR, SUCCESS_COLOR, WARNING_COLOR
 except ImportError:
     CARD_BORDER_COLOR = "#667eea"
     ALARM_COLOR = "#d32f2f"
     SUCCESS_COLOR = "#2e7d32"
+    WARNING_COLOR = "#f6ad55"
 
-# PyQtGraph import - opsiyonel
-try:
-    from pyqtgraph import PlotWidget, mkPen
-    GRAPH_AVAILABLE = True
-except ImportError:
-    GRAPH_AVAILABLE = False
+# PyQtGraph - opsiyonel ve ağır; yalnızca varlığı kontrol edilir, modül ilk
+# kart oluşturulurken yüklenir (giriş penceresi pyqtgraph'ı beklemez)
+GRAPH_AVAILABLE = importlib.util.find_spec("pyqtgraph") is not None
+if not GRAPH_AVAILABLE:
     print("⚠️ PyQtGraph bulunamadı. Grafikler devre dışı.")
+PlotWidget = mkPen = DateAxisItem = None
+
+
+def _load_pyqtgraph() -> bool:
+    """pyqtgraph'ı ilk çağrıda yükler; grafik kullanılabiliyorsa True"""
+    global GRAPH_AVAILABLE, PlotWidget, mkPen, DateAxisItem
+    if GRAPH_AVAILABLE and PlotWidget is None:
+        try:
+            from pyqtgraph import PlotWidget, mkPen, DateAxisItem
+        except ImportError as e:
+            GRAPH_AVAILABLE = False
+            print(f"⚠️ PyQtGraph yüklenemedi ({e}). Grafikler devre dışı.")
+    return GRAPH_AVAILABLE
 
 # Graph ayarları
 try:
@@ -41,10 +55,12 @@ class KumesCard(QGroupBox):
         super().__init__(f"🏠 Kümes #{kumes_id}", parent)
         self.kumes_id = kumes_id
         
-        # Grafik veri depoları
-        self.temp_data = deque(maxlen=GraphSettings.MAX_DATA_POINTS)
-        self.hum_data = deque(maxlen=GraphSettings.MAX_DATA_POINTS)
-        self.ammonia_data = deque(maxlen=GraphSettings.MAX_DATA_POINTS)
+        # Grafik veri deposu: zaman, sıcaklık, nem, amonyak (önceden ayrılmış)
+        from data.ring_buffer import RingBuffer  # numpy ilk kartla yüklenir
+        self.history = RingBuffer(GraphSettings.MAX_DATA_POINTS, channels=4)
+        self._latest = None  # Son kaydedilen, henüz çizilmemiş olabilir
+        self._has_alarm = False
+        self._stale = False
         
         # Mevcut durumlar
         self.led_state = False
@@ -70,7 +86,7 @@ class KumesCard(QGroupBox):
         main_layout.setContentsMargins(15, 20, 15, 15)
 
         # ÜST KISIM: Grafik
-        if GRAPH_AVAILABLE:
+        if _load_pyqtgraph():
             self._create_enhanced_graph()
             main_layout.addWidget(self.plot)
 
@@ -116,8 +132,12 @@ class KumesCard(QGroupBox):
 
     def _create_enhanced_graph(self):
         """Gelişmiş 3 eğrili grafik oluşturur"""
-        self.plot = PlotWidget()
+        # Alt eksen gerçek zaman damgası gösterir
+        self.plot = PlotWidget(axisItems={'bottom': DateAxisItem()})
         self.plot.setBackground('#0d1117')
+        # Uzun pencerelerde yalnızca görünen kısım çizilir, noktalar seyreltilir
+        self.plot.setClipToView(True)
+        self.plot.setDownsampling(auto=True, mode='peak')
         self.plot.showGrid(x=True, y=True, alpha=0.3)
         self.plot.setYRange(0, 100)
         self.plot.setFixedHeight(200)
@@ -295,11 +315,38 @@ class KumesCard(QGroupBox):
                 color: #58a6ff;
                 background-color: #0d1117;
             }}
+            QGroupBox[alarmState="alarm"] {{
+                border: 4px solid {ALARM_COLOR};
+            }}
+            QGroupBox[alarmState="stale"] {{
+                border: 3px solid {WARNING_COLOR};
+            }}
         """)
+        self.setProperty(STATE_PROPERTY, NORMAL)
 
     def update_data(self, data: dict):
         """WebSocket'ten gelen veriyi güvenli bir şekilde arayüze yansıtır"""
+        if self.record(data):
+            self.render()
+
+    def record(self, data: dict) -> bool:
+        """
+        Örneği kaydeder, ekrana çizmez (RenderScheduler ile kullanılır)
+        
+        Grafik geçmişine her örnek girer; etiketler ve eğriler bir sonraki
+        `render()` çağrısında son duruma göre bir kez güncellenir.
+        """
         if not data or data.get('id') != self.kumes_id:
+            return False
+        self._latest = data
+        if GRAPH_AVAILABLE:
+            self._record_sample(data)
+        return True
+
+    def render(self):
+        """Son kaydedilen durumu widget'lara uygular"""
+        data = self._latest
+        if data is None:
             return
 
         # Sensör verilerini güncelle
@@ -310,7 +357,7 @@ class KumesCard(QGroupBox):
         
         # Grafikleri güncelle
         if GRAPH_AVAILABLE:
-            self._update_graphs(data)
+            self._redraw_graphs()
         
         # Alarm kontrolü
         self._update_alarm_status(data)
@@ -365,28 +412,24 @@ class KumesCard(QGroupBox):
             self.buttons['door'].setChecked(kapi)
             self.buttons['door'].setText(f"🚪\nKAPI\n{'AÇIK' if kapi else 'KAPALI'}")
 
-    def _update_graphs(self, data):
-        """Grafikleri günceller - 3 eğri"""
-        if not GRAPH_AVAILABLE or not self.plot:
+    def _record_sample(self, data):
+        """Grafik geçmişine örnek ekler"""
+        # Eksik ölçümler NaN olarak saklanır, eğride boşluk olarak görünür
+        values = [data.get(key) for key in ('sicaklik', 'nem', 'amonyak')]
+        values = [v if isinstance(v, (int, float)) else float('nan') for v in values]
+        if all(v != v for v in values):  # Hiç ölçüm yok
             return
         
-        # Sıcaklık
-        temp = data.get('sicaklik')
-        if temp is not None and isinstance(temp, (int, float)):
-            self.temp_data.append(temp)
-            self.temp_curve.setData(list(self.temp_data))
-        
-        # Nem
-        hum = data.get('nem')
-        if hum is not None and isinstance(hum, (int, float)):
-            self.hum_data.append(hum)
-            self.hum_curve.setData(list(self.hum_data))
-        
-        # Amonyak
-        amm = data.get('amonyak')
-        if amm is not None and isinstance(amm, (int, float)):
-            self.ammonia_data.append(amm)
-            self.ammonia_curve.setData(list(self.ammonia_data))
+        self.history.append((time.time(), *values))
+
+    def _redraw_graphs(self):
+        """Grafikleri günceller - 3 eğri (liste kopyası yok, tampon görünümü verilir)"""
+        if not self.plot or not len(self.history):
+            return
+        x = self.history.view(0)
+        self.temp_curve.setData(x, self.history.view(1), connect='finite')
+        self.hum_curve.setData(x, self.history.view(2), connect='finite')
+        self.ammonia_curve.setData(x, self.history.view(3), connect='finite')
 
     def _create_kumes_card(self, kumes_id):
          info = self.kumes_bilgileri.get(kumes_id, {"ad": f"Kümes {kumes_id}", "tavuk_sayisi": 0, "gunluk": 0})
@@ -402,25 +445,28 @@ class KumesCard(QGroupBox):
          gunluk_lbl = QLabel(f"📅 {info['gunluk']} günlük")
     
     def _update_alarm_status(self, data):
-
-        """Alarm durumunu günceller"""
+        """Alarm durumunu günceller (stil yalnızca durum değişince yeniden uygulanır)"""
         has_alarm = data.get('alarm', False)
         
         if has_alarm:
             msg = data.get('mesaj', 'Kritik Durum!')
             self.alarm_label.setText(f"⚠️ ALARM: {msg}")
-            self.alarm_label.setVisible(True)
-            
-            # Kart kenarlığını alarm rengine çevir
-            self.setStyleSheet(self.styleSheet().replace(
-                f"border: 3px solid {CARD_BORDER_COLOR}",
-                f"border: 4px solid {ALARM_COLOR}"
-            ))
+        self.alarm_label.setVisible(bool(has_alarm))
+        
+        self._has_alarm = bool(has_alarm)
+        self._apply_state()
+
+    def set_stale(self, stale: bool):
+        """Kümesten veri gelmiyor (bayat) görünümü"""
+        self._stale = stale
+        self._apply_state()
+
+    def _apply_state(self):
+        # Kart kenarlığı: alarm > bayat > normal
+        if self._has_alarm:
+            state = ALARM
+        elif self._stale:
+            state = STALE
         else:
-            self.alarm_label.setVisible(False)
-            
-            # Normal kenarlığa dön
-            self.setStyleSheet(self.styleSheet().replace(
-                f"border: 4px solid {ALARM_COLOR}",
-                f"border: 3px solid {CARD_BORDER_COLOR}"
-            ))
\ No newline at end of file
+            state = NORMAL
+        set_alarm_state(self, state)
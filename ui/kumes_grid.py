@@ -0,0 +1,239 @@
+# ui/kumes_grid.py
+"""
+Sanal (virtualized) kümes ızgarası
+
+Her kümes için ayrı QFrame + etiketler kurmak yerine kümesler bir liste
+modelinde tutulur ve QListView'de bir delegate ile karo olarak çizilir.
+Görünüm yalnızca ekrandaki karoları boyar; 200 kümeste de widget sayısı
+sabittir. Grafikli tam KumesCard yalnızca seçilen kümes için açılır.
+"""
+import bisect
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import (
+    QAbstractListModel, QModelIndex, QRectF, QSize, Qt, pyqtSignal
+)
+from PyQt6.QtGui import QColor, QFont, QLinearGradient, QPainter, QPen
+from PyQt6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+from ui.alarm_style import NORMAL, STATE_COLORS, STATE_TEXTS
+
+TILE_SIZE = QSize(170, 150)
+
+# Karo verisi için rol (delegate doğrudan nesneyi okur)
+TileRole = Qt.ItemDataRole.UserRole + 1
+KumesIdRole = Qt.ItemDataRole.UserRole + 2
+
+
+@dataclass
+class KumesTile:
+    """Bir karonun çizim için gereken durumu"""
+    kumes_id: int
+    ad: str
+    icon: str = "🏠"
+    tavuk_sayisi: int = 0
+    gunluk: int = 0
+    sicaklik: Optional[float] = None
+    state: str = NORMAL
+
+
+class KumesGridModel(QAbstractListModel):
+    """
+    Kümes no sırasına göre karo listesi
+
+    Güncellemeler yalnızca görünür bir alan değiştiğinde tek satırlık
+    dataChanged üretir; çerçevede bilinmeyen bir kümes gelirse sırasına
+    eklenir.
+    """
+
+    def __init__(self, kumes_info: Optional[Dict[int, dict]] = None, parent=None):
+        super().__init__(parent)
+        self._ids: List[int] = []
+        self._tiles: List[KumesTile] = []
+        self._rows: Dict[int, int] = {}
+        if kumes_info:
+            self.set_kumes_info(kumes_info)
+
+    # ------------------------------------------------------------------
+    # Qt model arayüzü
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tiles)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        tile = self._tiles[index.row()]
+        if role == TileRole:
+            return tile
+        if role == KumesIdRole:
+            return tile.kumes_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            return tile.ad
+        if role == Qt.ItemDataRole.ToolTipRole:
+            temp = "--" if tile.sicaklik is None else f"{tile.sicaklik:.1f}"
+            return f"Kümes {tile.kumes_id} - {tile.ad}\n🌡️ {temp} °C\n{STATE_TEXTS[tile.state]}"
+        return None
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+    def kumes_ids(self) -> List[int]:
+        return list(self._ids)
+
+    def tile(self, kumes_id: int) -> Optional[KumesTile]:
+        row = self._rows.get(kumes_id)
+        return None if row is None else self._tiles[row]
+
+    def _ensure(self, kumes_id: int) -> int:
+        """Kümesin satırı; yoksa sıralı konumuna ekler"""
+        row = self._rows.get(kumes_id)
+        if row is not None:
+            return row
+        row = bisect.bisect_left(self._ids, kumes_id)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.insert(row, kumes_id)
+        self._tiles.insert(row, KumesTile(kumes_id, f"Kümes {kumes_id}"))
+        self._rows = {kid: i for i, kid in enumerate(self._ids)}
+        self.endInsertRows()
+        return row
+
+    def _changed(self, row: int):
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [TileRole])
+
+    def set_kumes_info(self, kumes_info: Dict[int, dict]):
+        """İsim, ikon, tavuk sayısı ve günlük bilgisi (ayarlar değişince)"""
+        for kumes_id, info in kumes_info.items():
+            row = self._ensure(kumes_id)
+            tile = self._tiles[row]
+            tile.ad = info.get("ad", tile.ad)
+            tile.icon = info.get("icon", tile.icon)
+            tile.tavuk_sayisi = info.get("tavuk_sayisi", tile.tavuk_sayisi)
+            tile.gunluk = info.get("gunluk", tile.gunluk)
+            self._changed(row)
+
+    def update_kumes(self, kumes_id: int, kumes: dict) -> bool:
+        """Çerçevedeki kümes verisi; çizilen bir değer değiştiyse True"""
+        row = self._ensure(kumes_id)
+        tile = self._tiles[row]
+        temp = kumes.get('sicaklik')
+        if temp == tile.sicaklik:
+            return False
+        tile.sicaklik = temp
+        self._changed(row)
+        return True
+
+    def set_state(self, kumes_id: int, state: str) -> bool:
+        """Görsel durum (normal / alarm / bayat); değiştiyse True"""
+        row = self._ensure(kumes_id)
+        tile = self._tiles[row]
+        if tile.state == state:
+            return False
+        tile.state = state
+        self._changed(row)
+        return True
+
+
+class KumesTileDelegate(QStyledItemDelegate):
+    """Kümes karosunu doğrudan QPainter ile çizer (widget yok)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.icon_font = QFont("Segoe UI", 20)
+        self.name_font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+        self.temp_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self.info_font = QFont("Segoe UI", 8)
+        self.status_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self.state_colors = {state: QColor(color) for state, color in STATE_COLORS.items()}
+
+    def sizeHint(self, option, index) -> QSize:
+        return TILE_SIZE
+
+    def paint(self, painter: QPainter, option, index):
+        tile: KumesTile = index.data(TileRole)
+        if tile is None:
+            return
+
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        rect = QRectF(option.rect).adjusted(4, 4, -4, -4)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Arka plan ve kenarlık (alarm / bayat > seçili / üzerinde > normal)
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomLeft())
+        if hover or selected:
+            gradient.setColorAt(0, QColor("#2d3748"))
+            gradient.setColorAt(1, QColor("#1a202c"))
+        else:
+            gradient.setColorAt(0, QColor("#21262d"))
+            gradient.setColorAt(1, QColor("#161b22"))
+        if tile.state != NORMAL:
+            border = self.state_colors[tile.state]
+        elif hover or selected:
+            border = QColor("#58a6ff")
+        else:
+            border = QColor("#30363d")
+        painter.setPen(QPen(border, 3))
+        painter.setBrush(gradient)
+        painter.drawRoundedRect(rect, 12, 12)
+
+        # İçerik satırları
+        center = Qt.AlignmentFlag.AlignCenter
+        inner = rect.adjusted(8, 6, -8, -6)
+        line = inner.height() / 6
+
+        def row(n: int, height: int = 1) -> QRectF:
+            return QRectF(inner.left(), inner.top() + n * line, inner.width(), line * height)
+
+        painter.setFont(self.icon_font)
+        painter.setPen(QColor("#c9d1d9"))
+        painter.drawText(row(0, 2), center, tile.icon)
+
+        painter.setFont(self.name_font)
+        name = painter.fontMetrics().elidedText(
+            tile.ad, Qt.TextElideMode.ElideRight, int(inner.width()))
+        painter.drawText(row(2), center, name)
+
+        painter.setFont(self.temp_font)
+        painter.setPen(QColor("#f85149"))
+        temp = "-- °C" if tile.sicaklik is None else f"{tile.sicaklik:.1f}°C"
+        painter.drawText(row(3), center, temp)
+
+        painter.setFont(self.info_font)
+        painter.setPen(QColor("#9ae6b4"))
+        painter.drawText(row(4), center, f"🐔 {tile.tavuk_sayisi}   📅 {tile.gunluk}g")
+
+        painter.setFont(self.status_font)
+        painter.setPen(self.state_colors[tile.state])
+        painter.drawText(row(5), center, STATE_TEXTS[tile.state])
+
+        painter.restore()
+
+
+class KumesGridView(QListView):
+    """Sarmalanan karo ızgarası; tıklanan kümesi bildirir"""
+
+    kumesClicked = pyqtSignal(int)
+
+    def __init__(self, model: KumesGridModel, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(KumesTileDelegate(self))
+
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)   # Düzen için her karo ölçülmez
+        self.setGridSize(TILE_SIZE)
+        self.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.setMouseTracking(True)      # Üzerinde (hover) vurgusu
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+
+        self.clicked.connect(lambda index: self.kumesClicked.emit(index.data(KumesIdRole)))
@@ -0,0 +1,99 @@
+# ui/lazy_tabs.py
+import time
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+class _LazyTab:
+    def __init__(self, title: str, factory: Callable[[], QWidget],
+                 on_create: Optional[Callable[[QWidget], None]],
+                 on_reset: Optional[Callable[[QWidget], None]]):
+        self.title = title
+        self.factory = factory
+        self.on_create = on_create
+        self.on_reset = on_reset
+        self.placeholder = QWidget()
+        self.layout = QVBoxLayout(self.placeholder)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.widget: Optional[QWidget] = None
+
+
+class LazyTabs(QObject):
+    """
+    Sekme fabrika kaydı: sekmeler ilk açıldıklarında oluşturulur
+
+    Sekme çubuğuna hemen boş bir yer tutucu eklenir; kullanıcı sekmeye ilk
+    geçtiğinde fabrika çağrılır ve gerçek widget yer tutucunun içine konur.
+    Sekme sırası ve indeksleri değişmez.
+
+    Kullanım:
+        lazy = LazyTabs(self.tabs)
+        lazy.add("alarms", "⚠️ Alarmlar", lambda: AlarmView(self.alarm_mgr),
+                 on_create=self._on_alarm_view_created,
+                 on_reset=self._on_alarm_view_dropped)
+        lazy.ensure("alarms")  # Gerekirse hemen oluştur
+        lazy.reset_all()       # Sekmeler bir sonraki açılışta yeniden kurulur
+    """
+
+    tabCreated = pyqtSignal(str, QWidget)  # (anahtar, widget)
+
+    def __init__(self, tabs: QTabWidget, parent=None):
+        super().__init__(parent or tabs)
+        self.tabs = tabs
+        self._entries: Dict[str, _LazyTab] = {}
+        self.tabs.currentChanged.connect(self._on_current_changed)
+
+    def add(self, key: str, title: str, factory: Callable[[], QWidget],
+            on_create: Optional[Callable[[QWidget], None]] = None,
+            on_reset: Optional[Callable[[QWidget], None]] = None) -> int:
+        """
+        Sekmeyi kaydeder; sekme çubuğundaki indeksi döndürür
+
+        `on_reset`, oluşturulmuş widget `reset()` ile bırakılırken çağrılır
+        (referansları silmek, iş parçacıklarını durdurmak için).
+        """
+        entry = _LazyTab(title, factory, on_create, on_reset)
+        self._entries[key] = entry
+        return self.tabs.addTab(entry.placeholder, title)
+
+    def widget(self, key: str) -> Optional[QWidget]:
+        """Oluşturulmuşsa sekmenin widget'ı"""
+        entry = self._entries.get(key)
+        return entry.widget if entry else None
+
+    def ensure(self, key: str) -> QWidget:
+        """Sekmeyi (henüz yoksa) hemen oluşturur"""
+        entry = self._entries[key]
+        if entry.widget is None:
+            started = time.perf_counter()
+            entry.widget = entry.factory()
+            entry.layout.addWidget(entry.widget)
+            if entry.on_create:
+                entry.on_create(entry.widget)
+            print(f"🧩 Sekme hazır: {entry.title} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+            self.tabCreated.emit(key, entry.widget)
+        return entry.widget
+
+    def reset(self, key: str):
+        """Oluşturulmuş widget'ı bırakır; sekme bir sonraki açılışta yeniden kurulur"""
+        entry = self._entries[key]
+        widget, entry.widget = entry.widget, None
+        if widget is None:
+            return
+        if entry.on_reset:
+            entry.on_reset(widget)
+        widget.deleteLater()
+
+    def reset_all(self):
+        """Tüm sekmeleri bırakır (ör. yeniden girişte önceki oturumun sekmeleri)"""
+        for key in list(self._entries):
+            self.reset(key)
+
+    def _on_current_changed(self, index: int):
+        page = self.tabs.widget(index)
+        for key, entry in self._entries.items():
+            if entry.placeholder is page:
+                self.ensure(key)
+                return
@@ -0,0 +1,99 @@
+# ui/render_scheduler.py
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QWidget
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from core.config import RENDER_FPS
+
+
+class RenderScheduler(QObject):
+    """
+    Kare hızına bağlı arayüz güncelleyici
+
+    Veri geldiğinde widget'lar hemen boyanmaz; güncelleme işi bir anahtarla
+    "kirli" olarak işaretlenir. Zamanlayıcı en fazla `fps` kez/sn tetiklenir
+    ve bekleyen tüm işleri tek seferde uygular; işin bağlı olduğu widget
+    (kart, durum paneli) iş süresince `setUpdatesEnabled(False)` tutulur ve
+    sonunda yalnızca o bölge bir kez boyanır. Aynı anahtar iki kare arasında
+    birden fazla işaretlenirse yalnızca sonuncusu çalışır; böylece cihaz hızı
+    arttıkça CPU kullanımı kare hızında sabit kalır.
+
+    Kullanım:
+        scheduler = RenderScheduler(parent=self)
+        scheduler.schedule(("kumes", 3), self._render_kumes, 3, widget=card)
+    """
+
+    frameRendered = pyqtSignal(int)  # Karede uygulanan iş sayısı
+
+    def __init__(self, fps: float = RENDER_FPS, parent=None):
+        super().__init__(parent)
+        self._pending: Dict[Hashable, Tuple[Callable, tuple, Optional[QWidget]]] = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.set_fps(fps)
+
+        self.frames = 0      # Çizilen kare sayısı
+        self.scheduled = 0   # Toplam işaretleme
+        self.coalesced = 0   # Kare beklerken üzerine yazılan işler
+
+    def set_fps(self, fps: float):
+        """Kare hızını değiştir (en az 1)"""
+        self.fps = max(1.0, float(fps))
+        self._timer.setInterval(int(1000 / self.fps))
+
+    def schedule(self, key: Hashable, func: Callable, *args, widget: Optional[QWidget] = None):
+        """
+        Güncelleme işini bir sonraki kareye bırakır (aynı anahtar birleştirilir)
+
+        Args:
+            key: İşin kimliği - aynı anahtarla gelen son iş geçerlidir
+            func, args: Karede çağrılacak fonksiyon
+            widget: İş süresince boyaması durdurulacak kapsayıcı
+        """
+        self.scheduled += 1
+        if key in self._pending:
+            self.coalesced += 1
+        self._pending[key] = (func, args, widget)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self, key: Hashable):
+        """Bekleyen işi iptal eder (widget silinirken)"""
+        self._pending.pop(key, None)
+
+    def flush(self):
+        """Bekleyen tüm işleri tek boyama turunda uygular"""
+        self._timer.stop()
+        if not self._pending:
+            return
+        jobs, self._pending = self._pending, {}
+
+        # Zaten kapalı olanlara dokunma (iç içe toplu güncellemeler)
+        frozen = []
+        for _, _, widget in jobs.values():
+            if widget is not None and widget.updatesEnabled() and widget not in frozen:
+                widget.setUpdatesEnabled(False)
+                frozen.append(widget)
+        try:
+            for key, (func, args, _) in jobs.items():
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(f"❌ Çizim hatası ({key}): {e}")
+        finally:
+            for widget in frozen:
+                widget.setUpdatesEnabled(True)  # Bölge başına tek repaint
+
+        self.frames += 1
+        self.frameRendered.emit(len(jobs))
+
+    def stats(self) -> dict:
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "scheduled": self.scheduled,
+            "coalesced": self.coalesced,
+            "pending": len(self._pending),
+        }
@@ -519,6 +519,7 @@ class SettingsTab(QWidget):
         save_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         save_btn.clicked.connect(self._save_and_reconnect)
         parent_layout.addWidget(save_btn)
+        self.reconnect_btn = save_btn
 
     def _create_info_section(self, parent_layout):
         """Bilgi notu"""
@@ -557,6 +558,7 @@ class SettingsTab(QWidget):
     def _connect_signals(self):
         """Signal bağlantıları"""
         self.ws.connectionChanged.connect(self._update_connection_status)
+        self.ws.addressChanged.connect(self._on_address_changed)
     
     def _update_connection_status(self):
         """Bağlantı durumunu günceller"""
@@ -581,20 +583,20 @@ class SettingsTab(QWidget):
             QMessageBox.warning(self, "Uyarı", "IP adresi boş olamaz!")
             return
         
-        # Bağlantıyı kes
-        self.ws.disconnect()
-        
-        # Yeni ayarları uygula
-        self.ws.ip = new_ip
-        self.ws.port = new_port
-        
-        # Yeniden bağlan
-        self.ws.connect()
-        
+        # Kapatma / yeniden bağlanma ağ thread'inde yapılır, UI donmaz
+        self.reconnect_btn.setEnabled(False)
+        self.status_label.setText("⏳ Yeniden bağlanılıyor...")
+        self.status_label.setStyleSheet("font-size: 13px; color: #d29922; padding: 10px; font-weight: bold;")
+        self.ws.update_ip(new_ip, new_port)
+
+    def _on_address_changed(self, ip: str, port: int):
+        """Eski bağlantı kapanıp yeni adrese bağlanma başladığında"""
+        self.reconnect_btn.setEnabled(True)
+        self._update_connection_status()
         QMessageBox.information(
             self,
             "Başarılı",
-            f"Yeni bağlantı:\nIP: {new_ip}\nPort: {new_port}"
+            f"Yeni bağlantı:\nIP: {ip}\nPort: {port}"
         )
     
     def _test_connection(self):
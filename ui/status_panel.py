@@ -0,0 +1,154 @@
+# ui/status_panel.py
+from PyQt6.QtWidgets import QFrame, QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt
+from typing import Optional
+
+from data.frame_worker import format_uptime
+
+VALUE_COLOR = "#c9d1d9"
+ON_COLOR = "#48bb78"
+OFF_COLOR = "#8b949e"
+ALERT_COLOR = "#ff4444"
+
+
+class StatusRow(QWidget):
+    """
+    Tek durum satırı: ikon, etiket, değer
+
+    Değer etiketine doğrudan referans tutulur; `set_value` aynı metin / renk
+    tekrar geldiğinde widget'a dokunmaz.
+    """
+
+    def __init__(self, icon: str, label: str, value: str, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("""
+            QWidget {
+                background: rgba(22, 27, 34, 0.5);
+                border-radius: 6px;
+                padding: 6px 10px;
+            }
+        """)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+
+        # İkon
+        icon_label = QLabel(icon)
+        icon_label.setFont(QFont("Segoe UI", 12))
+        icon_label.setStyleSheet("background: transparent;")
+        layout.addWidget(icon_label)
+
+        # Etiket
+        label_widget = QLabel(label)
+        label_widget.setFont(QFont("Segoe UI", 9))
+        label_widget.setStyleSheet("color: #8b949e; background: transparent;")
+        layout.addWidget(label_widget)
+
+        layout.addStretch()
+
+        # Değer
+        self.value_label = QLabel(value)
+        self.value_label.setObjectName("value")
+        self.value_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
+        self.value_label.setStyleSheet(f"color: {VALUE_COLOR}; background: transparent;")
+        layout.addWidget(self.value_label)
+
+        self._text = value
+        self._color: Optional[str] = None
+
+    def set_value(self, text: str, color: Optional[str] = None) -> bool:
+        """
+        Değeri günceller; değişiklik yoksa hiçbir şey yapmaz
+
+        Args:
+            text: Gösterilecek metin
+            color: Vurgu rengi (None: rengi değiştirme)
+
+        Returns:
+            Widget güncellendiyse True
+        """
+        changed = False
+        if text != self._text:
+            self._text = text
+            self.value_label.setText(text)
+            changed = True
+        if color is not None and color != self._color:
+            self._color = color
+            self.value_label.setStyleSheet(
+                f"color: {color}; background: transparent; font-weight: bold;")
+            changed = True
+        return changed
+
+    def value(self) -> str:
+        return self._text
+
+
+class StatusPanel(QFrame):
+    """
+    Sol paneldeki sistem durumu kutusu
+
+    Her satır bir `StatusRow`; çerçeve işleyicisi yalnızca bu sınıfın tipli
+    metotlarını çağırır (findChild yok, aynı değerde widget güncellenmez).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("""
+            QFrame {
+                background-color: #161b22;
+                border: 2px solid #30363d;
+                border-radius: 12px;
+                padding: 12px;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        # Başlık
+        title = QLabel("📊 SİSTEM DURUMU")
+        title.setFont(QFont("Segoe UI", 13, QFont.Weight.Bold))
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        title.setStyleSheet("color: #58a6ff; border: none; padding: 8px;")
+        layout.addWidget(title)
+
+        self.connection_status = StatusRow("🔌", "Bağlantı", "Bekleniyor...")
+        self.avg_temp = StatusRow("🌡️", "Ort. Sıc.", "--°C")
+        self.avg_hum = StatusRow("💧", "Ort. Nem", "--%")
+        self.feed_level = StatusRow("🌾", "Yem", "-- cm")
+        self.pump_status = StatusRow("💦", "Pompa", "Kapalı")
+        self.uptime = StatusRow("⏱️", "Çalışma", "00:00:00")
+        self.total_alarms = StatusRow("⚠️", "Alarm", "0")
+
+        for row in (self.connection_status, self.avg_temp, self.avg_hum, self.feed_level,
+                    self.pump_status, self.uptime, self.total_alarms):
+            layout.addWidget(row)
+
+    # ------------------------------------------------------------------
+    # Tipli güncelleyiciler
+    # ------------------------------------------------------------------
+    def set_connection(self, connected: bool, text: Optional[str] = None):
+        """Bağlantı durumu (metin verilmezse varsayılan)"""
+        text = text or ("Bağlı ✓" if connected else "Bağlı Değil")
+        self.connection_status.set_value(text, ON_COLOR if connected else ALERT_COLOR)
+
+    def set_avg_temp(self, celsius: float):
+        self.avg_temp.set_value(f"{celsius:.1f}°C")
+
+    def set_avg_hum(self, percent: float):
+        self.avg_hum.set_value(f"{percent:.1f}%")
+
+    def set_feed_level(self, cm):
+        self.feed_level.set_value(f"{cm} cm")
+
+    def set_pump(self, on: bool):
+        self.pump_status.set_value("Açık" if on else "Kapalı", ON_COLOR if on else OFF_COLOR)
+
+    def set_uptime(self, uptime):
+        """Saniye (int) ya da FrameWorker'ın biçimlediği metin"""
+        self.uptime.set_value(format_uptime(uptime) if isinstance(uptime, int) else str(uptime))
+
+    def set_alarm_count(self, count: int):
+        self.total_alarms.set_value(str(count), ALERT_COLOR if count > 0 else OFF_COLOR)